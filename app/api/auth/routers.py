@@ -1,7 +1,6 @@
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, status
-from fastapi.responses import ORJSONResponse
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -11,17 +10,17 @@ from app.api.auth.services import (
     login_and_issue_token,
     register_user,
 )
+from app.api.responses import SerializedRoute
 from app.core.settings import APP_CONFIG
 from app.db import get_session_with_commit
 
-router = APIRouter(prefix=f"{APP_CONFIG.api.v1}/auth", tags=["auth"])
+router = APIRouter(prefix=f"{APP_CONFIG.api.v1}/auth", tags=["auth"], route_class=SerializedRoute)
 
 
 @router.post(
     "/register",
     response_model=AuthUserRead,
     status_code=status.HTTP_201_CREATED,
-    response_class=ORJSONResponse,
 )
 async def register(
     data: AuthRegister,
@@ -33,7 +32,6 @@ async def register(
 @router.post(
     "/token",
     response_model=Token,
-    response_class=ORJSONResponse,
 )
 async def login(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
@@ -45,7 +43,6 @@ async def login(
 @router.get(
     "/me",
     response_model=AuthUserRead,
-    response_class=ORJSONResponse,
     status_code=status.HTTP_200_OK,
 )
 async def me(current_user=Depends(get_current_user)):
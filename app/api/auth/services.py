@@ -22,6 +22,7 @@ from app.api.auth.schemas import (
 )
 from app.core.brokers import user_registerer
 from app.core.settings import APP_CONFIG
+from app.dao.loader import DataLoader
 from app.dao.users import UsersDAO
 from app.db import get_session_without_commit
 
@@ -145,7 +146,8 @@ async def get_current_user(
     except JWTError:
         raise CredentialsException
 
-    user = await UsersDAO.find_one_or_none_by_id(int(subject), session)
+    # через DataLoader: повторные поиски этого пользователя в запросе не идут в БД
+    user = await DataLoader.for_session(session).load(UsersDAO, int(subject))
     if not user:
         raise CredentialsException
     return user
@@ -1,5 +1,4 @@
-from fastapi import APIRouter, Depends, Query, status
-from fastapi.responses import ORJSONResponse
+from fastapi import APIRouter, Depends, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.car_photos.schemas import (
@@ -9,18 +8,23 @@ from app.api.car_photos.schemas import (
 )
 from app.api.car_photos.services import (
     car_photo,
+    count_car_photos,
     create_car_photo,
     delete_car_photo,
     get_car_photo_details,
     list_car_photo,
     update_car_photo,
 )
+from app.api.pagination import CountQuery, CursorQuery, set_next_cursor, set_total_count
+from app.api.responses import SerializedRoute
 from app.core.settings import APP_CONFIG
-from app.db import get_session_without_commit
+from app.dao.base import CountMode
+from app.db import get_session_without_commit, release_connection
 
 router = APIRouter(
     prefix=f"{APP_CONFIG.api.v1}/car-photos",
     tags=["car_photos"],
+    route_class=SerializedRoute,
 )
 
 
@@ -28,7 +32,6 @@ router = APIRouter(
     "/",
     response_model=CarPhotoRead,
     status_code=status.HTTP_201_CREATED,
-    response_class=ORJSONResponse,
 )
 async def create(
     data: CarPhotoCreate,
@@ -40,51 +43,63 @@ async def create(
 @router.get(
     "/{photo_id}",
     response_model=CarPhotoRead,
-    response_class=ORJSONResponse,
 )
 async def get_photo_car(
     photo_id: int,
     session: AsyncSession = Depends(get_session_without_commit),
 ):
-    return await car_photo(session, photo_id)
+    photo = await car_photo(session, photo_id)
+    await release_connection(session)
+    return photo
 
 
 @router.get(
     "/",
     response_model=list[CarPhotoRead],
-    response_class=ORJSONResponse,
 )
 async def get_car_photos(
+    response: Response,
     car_id: int | None = None,
     id_car_photo: int | None = None,
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: str | None = CursorQuery,
+    count: CountMode | None = CountQuery,
     session: AsyncSession = Depends(get_session_without_commit),
 ):
-    return await list_car_photo(
+    photos = await list_car_photo(
         session=session,
         car_id=car_id,
         id_car_photo=id_car_photo,
         limit=limit,
         offset=offset,
+        cursor=cursor,
     )
+    if count is not None:
+        set_total_count(
+            response,
+            await count_car_photos(session, count, car_id=car_id, id_car_photo=id_car_photo),
+        )
+    await release_connection(session)
+    set_next_cursor(response, photos, limit)
+    return photos
 
 
 @router.get(
     "/{photo_id}/details",
-    response_class=ORJSONResponse,
 )
 async def details(
     photo_id: int,
     session: AsyncSession = Depends(get_session_without_commit),
 ):
-    return await get_car_photo_details(session, photo_id)
+    details = await get_car_photo_details(session, photo_id)
+    await release_connection(session)
+    return details
 
 
 @router.put(
     "/{photo_id}",
     response_model=CarPhotoRead,
-    response_class=ORJSONResponse,
     status_code=status.HTTP_201_CREATED,
 )
 async def update(
@@ -16,6 +16,7 @@ from app.api.car_photos.schemas import (
     CarPhotoUpdateRequest,
     CarPhotoUpdateValue,
 )
+from app.dao.base import CountMode
 from app.dao.car_photos import CarPhotosDAO
 from app.dao.cars import CarsDAO
 
@@ -52,6 +53,7 @@ async def list_car_photo(
     id_car_photo: int | None = None,
     limit: int = 20,
     offset: int = 0,
+    cursor: str | None = None,
 ) -> list[CarPhotoRead]:
     filter_obj = CarPhotoGetIdFilter(id=id_car_photo, car_id=car_id)
     page = offset // limit + 1 if limit else 1
@@ -60,6 +62,7 @@ async def list_car_photo(
         page=page,
         page_size=limit,
         filters=filter_obj,
+        cursor=cursor,
     )
     if not items:
         raise CarPhotoFilterNotFoundException
@@ -68,6 +71,15 @@ async def list_car_photo(
     return result
 
 
+async def count_car_photos(
+    session: AsyncSession,
+    mode: CountMode,
+    car_id: int | None = None,
+    id_car_photo: int | None = None,
+) -> int:
+    return await CarPhotosDAO.count(session, CarPhotoGetIdFilter(id=id_car_photo, car_id=car_id), mode)
+
+
 async def update_car_photo(
     session: AsyncSession,
     photo_id: int,
@@ -77,8 +89,8 @@ async def update_car_photo(
     filter_obj = CarPhotoUpdateIdFilter(id=photo_id)
     values_obj = CarPhotoUpdateValue(**data_update.model_dump(exclude_unset=True))
 
-    updated = await CarPhotosDAO.update(session, filter_obj, values_obj)
-    if updated == 0:
+    updated = await CarPhotosDAO.update_returning(session, filter_obj, values_obj)
+    if not updated:
         logger.warning(
             "[car_photos] Фото не найдено для обновления id=%s",
             photo_id,
@@ -86,9 +98,8 @@ async def update_car_photo(
         raise CarPhotoNotFoundException
     await session.commit()
 
-    updated_photo = await car_photo(session, photo_id)
     logger.info("[car_photos] Фото обновлено id=%s", photo_id)
-    return updated_photo
+    return CarPhotoRead.model_validate(updated[0])
 
 
 async def delete_car_photo(session: AsyncSession, photo_id: int) -> None:
@@ -1,5 +1,4 @@
-from fastapi import APIRouter, Depends, Query, status
-from fastapi.responses import ORJSONResponse
+from fastapi import APIRouter, Depends, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.car_reports.schemas import (
@@ -8,6 +7,7 @@ from app.api.car_reports.schemas import (
     CarReportUpdate,
 )
 from app.api.car_reports.services import (
+    count_car_reports,
     create_car_report,
     delete_car_report,
     get_car_report,
@@ -15,12 +15,16 @@ from app.api.car_reports.services import (
     list_car_reports,
     update_car_report,
 )
+from app.api.pagination import CountQuery, CursorQuery, set_next_cursor, set_total_count
+from app.api.responses import SerializedRoute
 from app.core.settings import APP_CONFIG
-from app.db import get_session_without_commit
+from app.dao.base import CountMode
+from app.db import get_session_without_commit, release_connection
 
 router = APIRouter(
     prefix=f"{APP_CONFIG.api.v1}/car-reports",
     tags=["car_reports"],
+    route_class=SerializedRoute,
 )
 
 
@@ -28,7 +32,6 @@ router = APIRouter(
     "/",
     response_model=CarReportRead,
     status_code=status.HTTP_201_CREATED,
-    response_class=ORJSONResponse,
 )
 async def create(
     data: CarReportCreate,
@@ -40,38 +43,50 @@ async def create(
 @router.get(
     "/{report_id}",
     response_model=CarReportRead,
-    response_class=ORJSONResponse,
 )
 async def get(
     report_id: int,
     session: AsyncSession = Depends(get_session_without_commit),
 ):
-    return await get_car_report(session, report_id)
+    report = await get_car_report(session, report_id)
+    await release_connection(session)
+    return report
 
 
 @router.get(
     "/",
     response_model=list[CarReportRead],
-    response_class=ORJSONResponse,
 )
 async def list_(
+    response: Response,
     car_id: int | None = None,
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: str | None = CursorQuery,
+    count: CountMode | None = CountQuery,
     session: AsyncSession = Depends(get_session_without_commit),
 ):
-    return await list_car_reports(session, car_id, limit, offset)
+    reports = await list_car_reports(session, car_id, limit, offset, cursor)
+    if count is not None:
+        set_total_count(
+            response,
+            await count_car_reports(session, count, car_id=car_id),
+        )
+    await release_connection(session)
+    set_next_cursor(response, reports, limit)
+    return reports
 
 
 @router.get(
     "/{report_id}/details",
-    response_class=ORJSONResponse,
 )
 async def details(
     report_id: int,
     session: AsyncSession = Depends(get_session_without_commit),
 ):
-    return await get_car_report_details(session, report_id)
+    details = await get_car_report_details(session, report_id)
+    await release_connection(session)
+    return details
 
 
 @router.put(
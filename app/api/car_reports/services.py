@@ -14,6 +14,7 @@ from app.api.car_reports.schemas import (
     CarReportRead,
     CarReportUpdate,
 )
+from app.dao.base import CountMode
 from app.dao.car_reports import CarReportsDAO
 from app.dao.cars import CarsDAO
 
@@ -51,6 +52,7 @@ async def list_car_reports(
     car_id: int | None = None,
     limit: int = 20,
     offset: int = 0,
+    cursor: str | None = None,
 ) -> list[CarReportRead]:
     # Готовим фильтры для DAO
     filters_obj = None
@@ -63,6 +65,7 @@ async def list_car_reports(
         page=page,
         page_size=limit,
         filters=filters_obj,
+        cursor=cursor,
     )
 
     if not items:
@@ -73,6 +76,15 @@ async def list_car_reports(
     return result
 
 
+async def count_car_reports(
+    session: AsyncSession,
+    mode: CountMode,
+    car_id: int | None = None,
+) -> int:
+    filters_obj = CarReportIdFilter(car_id=car_id) if car_id is not None else None
+    return await CarReportsDAO.count(session, filters_obj, mode)
+
+
 async def update_car_report(
     session: AsyncSession,
     report_id: int,
@@ -89,23 +101,21 @@ async def update_car_report(
     values_obj = CarReportUpdate(**data_update.model_dump(exclude_unset=True))
 
     #####
-    updated = await CarReportsDAO.update(
+    updated = await CarReportsDAO.update_returning(
         session,
         filter_obj,
         values_obj,
     )
-    await session.commit()
-
-    if updated == 0:
+    if not updated:
         logger.warning(
             "[car_reports] Отчёт не найден для обновления id=%s",
             report_id,
         )
         raise CarReportNotFoundException
+    await session.commit()
 
-    updated_report = await get_car_report(session, report_id)
     logger.info("[car_reports] Отчёт обновлён id=%s", report_id)
-    return updated_report
+    return CarReportRead.model_validate(updated[0])
 
 
 async def delete_car_report(session: AsyncSession, report_id: int) -> None:
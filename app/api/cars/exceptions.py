@@ -19,3 +19,8 @@ CarDeletedNotFoundException = HTTPException(
     status_code=status.HTTP_404_NOT_FOUND,
     detail="Нельзя удалить авто — есть связанные заказы",
 )
+
+CarImportUnsupportedFormatException = HTTPException(
+    status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+    detail="Импорт поддерживает только text/csv и application/x-ndjson",
+)
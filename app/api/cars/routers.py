@@ -1,23 +1,45 @@
-from fastapi import APIRouter, Depends, Query, status
-from fastapi.responses import ORJSONResponse
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.cars.schemas import CarCreate, CarDetailsRead, CarRead, CarUpdate
+from app.api.cars.schemas import (
+    CarCardRead,
+    CarCreate,
+    CarDetailsRead,
+    CarFacets,
+    CarImportReport,
+    CarRead,
+    CarUpdate,
+)
 from app.api.cars.services import (
+    count_cars,
     create_car,
     delete_car,
+    export_cars,
     get_car,
     get_car_details,
+    get_car_facets,
+    get_car_version,
+    import_cars,
+    list_car_cards,
     list_cars,
+    search_cars,
     update_car,
 )
+from app.api.conditional import is_conditional, not_modified, set_version_headers
+from app.api.export import ExportFormat, export_response
+from app.api.pagination import CountQuery, CursorQuery, set_next_cursor, set_total_count
+from app.api.responses import SerializedRoute
 from app.core.settings import APP_CONFIG
-from app.db import get_session_without_commit
+from app.dao.base import CountMode, record_version
+from app.dao.cars import CarSortField
+from app.db import get_session_without_commit, read_session_maker, release_connection
 from app.models.cars import CarStatus, EngineType
 
 router = APIRouter(
     prefix=f"{APP_CONFIG.api.v1}/cars",
     tags=["cars"],
+    route_class=SerializedRoute,
 )
 
 
@@ -25,7 +47,6 @@ router = APIRouter(
     "/",
     response_model=CarRead,
     status_code=status.HTTP_201_CREATED,
-    response_class=ORJSONResponse,
 )
 async def create(
     data: CarCreate,
@@ -34,22 +55,243 @@ async def create(
     return await create_car(session, data)
 
 
+@router.post(
+    "/import",
+    response_model=CarImportReport,
+    summary="Потоковый импорт авто (CSV / NDJSON)",
+    description=(
+        "Тело запроса читается потоком: text/csv (первая строка — заголовок с полями CarCreate)\n"
+        "или application/x-ndjson (один CarCreate в строке).\n"
+        "Авто с VIN, уже существующим в БД или повторяющимся в файле, пропускаются.\n"
+        "Возвращает отчёт с ошибками по строкам."
+    ),
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "text/csv": {"schema": {"type": "string"}},
+                "application/x-ndjson": {"schema": {"type": "string"}},
+            },
+        },
+    },
+)
+async def import_(
+    request: Request,
+    batch_size: int = Query(1000, ge=1, le=2000),
+    session: AsyncSession = Depends(get_session_without_commit),
+):
+    return await import_cars(
+        session,
+        request.stream(),
+        request.headers.get("content-type"),
+        batch_size,
+    )
+
+
+@router.get(
+    "/export",
+    summary="Потоковая выгрузка авто (NDJSON / CSV)",
+    description="Те же фильтры и сортировка, что у списка авто, без пагинации.",
+    response_class=StreamingResponse,
+)
+async def export(
+    request: Request,
+    fmt: ExportFormat = Query(ExportFormat.ndjson, alias="format"),
+    make: str | None = None,
+    model: str | None = None,
+    status: CarStatus | None = None,
+    engine_type: EngineType | None = None,
+    price_min: float | None = None,
+    price_max: float | None = None,
+    year_min: int | None = None,
+    year_max: int | None = None,
+    sort_by: CarSortField | None = None,
+    sort_dir: str | None = Query("desc", description="asc|desc"),
+):
+    content = export_cars(
+        read_session_maker(request),
+        fmt,
+        make,
+        model,
+        (status.value if status else None),
+        (engine_type.value if engine_type else None),
+        price_min,
+        price_max,
+        year_min,
+        year_max,
+        (sort_by.value if sort_by else None),
+        sort_dir,
+    )
+    return export_response(content, fmt, "cars")
+
+
+@router.get(
+    "/search",
+    response_model=list[CarRead],
+    summary="Поиск по каталогу авто",
+    description=(
+        "Полнотекстовый поиск по make/model/color/description (по префиксам слов)\n"
+        "и по сходству с «марка модель» для опечаток (pg_trgm). Лучшие совпадения первыми.\n"
+        "Фильтры — как у списка авто; пагинация limit/offset."
+    ),
+)
+async def search(
+    q: str = Query(..., min_length=2, max_length=100, description="Строка поиска, например «bmw 3»"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    make: str | None = None,
+    model: str | None = None,
+    status: CarStatus | None = None,
+    engine_type: EngineType | None = None,
+    price_min: float | None = None,
+    price_max: float | None = None,
+    year_min: int | None = None,
+    year_max: int | None = None,
+    session: AsyncSession = Depends(get_session_without_commit),
+):
+    cars = await search_cars(
+        session,
+        q,
+        limit,
+        offset,
+        make,
+        model,
+        (status.value if status else None),
+        (engine_type.value if engine_type else None),
+        price_min,
+        price_max,
+        year_min,
+        year_max,
+    )
+    await release_connection(session)
+    return cars
+
+
+@router.get(
+    "/cards",
+    response_model=list[CarCardRead],
+    summary="Карточки каталога авто",
+    description=(
+        "Авто с главным фото, средней оценкой и количеством отзывов одним запросом\n"
+        "к проекции car_listing. Фильтры, сортировка и пагинация — как у списка авто."
+    ),
+)
+async def cards(
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    cursor: str | None = CursorQuery,
+    count: CountMode | None = CountQuery,
+    make: str | None = None,
+    model: str | None = None,
+    status: CarStatus | None = None,
+    engine_type: EngineType | None = None,
+    price_min: float | None = None,
+    price_max: float | None = None,
+    year_min: int | None = None,
+    year_max: int | None = None,
+    sort_by: CarSortField | None = None,
+    sort_dir: str | None = Query("desc", description="asc|desc"),
+    session: AsyncSession = Depends(get_session_without_commit),
+):
+    result = await list_car_cards(
+        session,
+        limit,
+        offset,
+        make,
+        model,
+        (status.value if status else None),
+        (engine_type.value if engine_type else None),
+        price_min,
+        price_max,
+        year_min,
+        year_max,
+        (sort_by.value if sort_by else None),
+        sort_dir,
+        cursor,
+    )
+    if count is not None:
+        set_total_count(
+            response,
+            await count_cars(
+                session,
+                count,
+                make,
+                model,
+                (status.value if status else None),
+                (engine_type.value if engine_type else None),
+                price_min,
+                price_max,
+                year_min,
+                year_max,
+            ),
+        )
+    await release_connection(session)
+    set_next_cursor(response, result, limit, (sort_by.value if sort_by else None), sort_dir)
+    return result
+
+
+@router.get(
+    "/facets",
+    response_model=CarFacets,
+    summary="Фасеты каталога авто",
+    description=(
+        "Количество авто по make, engine_type, transmission, condition, status\n"
+        "и по корзинам цены и года для тех же фильтров, что у списка авто.\n"
+        "Считается одним запросом (GROUPING SETS), ответ кэшируется на CACHE__FACETS_TTL секунд."
+    ),
+)
+async def facets(
+    make: str | None = None,
+    model: str | None = None,
+    status: CarStatus | None = None,
+    engine_type: EngineType | None = None,
+    price_min: float | None = None,
+    price_max: float | None = None,
+    year_min: int | None = None,
+    year_max: int | None = None,
+    session: AsyncSession = Depends(get_session_without_commit),
+):
+    result = await get_car_facets(
+        session,
+        make,
+        model,
+        (status.value if status else None),
+        (engine_type.value if engine_type else None),
+        price_min,
+        price_max,
+        year_min,
+        year_max,
+    )
+    await release_connection(session)
+    return result
+
+
 @router.get(
     "/{car_id}",
     response_model=CarRead,
-    response_class=ORJSONResponse,
 )
 async def get(
     car_id: int,
+    request: Request,
+    response: Response,
     session: AsyncSession = Depends(get_session_without_commit),
 ):
-    return await get_car(session, car_id)
+    # без условных заголовков версия берётся из загруженного авто — один запрос вместо двух
+    if is_conditional(request):
+        version = await get_car_version(session, car_id)
+        if (cached := not_modified(request, response, version)) is not None:
+            await release_connection(session)
+            return cached
+    car = await get_car(session, car_id, raw=True)
+    await release_connection(session)
+    set_version_headers(response, record_version(car.id, car.updated_at))
+    return car
 
 
 @router.get(
     "/",
     response_model=list[CarRead],
-    response_class=ORJSONResponse,
     summary="Список авто с фильтрами",
     description=(
         "Фильтры: make, model, status {available|reserved|sold},\n"
@@ -59,8 +301,11 @@ async def get(
     ),
 )
 async def list_(
+    response: Response,
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: str | None = CursorQuery,
+    count: CountMode | None = CountQuery,
     make: str | None = None,
     model: str | None = None,
     status: CarStatus | None = None,
@@ -69,14 +314,11 @@ async def list_(
     price_max: float | None = None,
     year_min: int | None = None,
     year_max: int | None = None,
-    sort_by: str | None = Query(
-        None,
-        description="price|year|created_at|updated_at",
-    ),
+    sort_by: CarSortField | None = None,
     sort_dir: str | None = Query("desc", description="asc|desc"),
     session: AsyncSession = Depends(get_session_without_commit),
 ):
-    return await list_cars(
+    cars = await list_cars(
         session,
         limit,
         offset,
@@ -88,9 +330,30 @@ async def list_(
         price_max,
         year_min,
         year_max,
-        sort_by,
+        (sort_by.value if sort_by else None),
         sort_dir,
+        cursor,
+        raw=True,
     )
+    if count is not None:
+        set_total_count(
+            response,
+            await count_cars(
+                session,
+                count,
+                make,
+                model,
+                (status.value if status else None),
+                (engine_type.value if engine_type else None),
+                price_min,
+                price_max,
+                year_min,
+                year_max,
+            ),
+        )
+    await release_connection(session)
+    set_next_cursor(response, cars, limit, (sort_by.value if sort_by else None), sort_dir)
+    return cars
 
 
 @router.put(
@@ -120,10 +383,17 @@ async def delete(
 @router.get(
     "/{car_id}/details",
     response_model=CarDetailsRead,
-    response_class=ORJSONResponse,
 )
 async def details(
     car_id: int,
+    request: Request,
+    response: Response,
     session: AsyncSession = Depends(get_session_without_commit),
 ):
-    return await get_car_details(session, car_id)
+    version = await get_car_version(session, car_id, details=True)
+    if (cached := not_modified(request, response, version)) is not None:
+        await release_connection(session)
+        return cached
+    details = await get_car_details(session, car_id)
+    await release_connection(session)
+    return details
@@ -6,6 +6,7 @@ from pydantic.config import ConfigDict
 from app.api.car_photos.schemas import CarPhotoRead
 from app.api.car_reports.schemas import CarReportRead
 from app.api.reviews.schemas import ReviewRead
+from app.dao.cars import CarSortField
 from app.models.cars import CarCondition, CarStatus, EngineType, Transmission
 
 
@@ -38,6 +39,14 @@ class CarRead(BaseCar):
     updated_at: datetime
 
 
+class CarCardRead(CarRead):
+    """Карточка каталога: авто, главное фото и агрегаты отзывов."""
+
+    main_photo_url: str | None
+    rating_avg: float | None
+    reviews_count: int
+
+
 class CarUpdate(BaseModel):
     make: str | None = None
     model: str | None = None
@@ -65,13 +74,54 @@ class CarListFilters(BaseModel):
     price_max: float | None = Field(default=None, ge=0)
     year_min: int | None = None
     year_max: int | None = None
-    sort_by: str | None = Field(
-        default=None,
-        description="price|year|created_at|updated_at",
-    )
+    sort_by: CarSortField | None = None
     sort_dir: str | None = Field(default="desc", description="asc|desc")
 
 
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+
+class RangeFacetCount(BaseModel):
+    """Корзина числового фасета: [min, max), None — без границы."""
+
+    min: int | None
+    max: int | None
+    count: int
+
+
+class CarFacets(BaseModel):
+    """Количество авто по значениям фасетов для текущих фильтров."""
+
+    total: int
+    make: list[FacetCount]
+    engine_type: list[FacetCount]
+    transmission: list[FacetCount]
+    condition: list[FacetCount]
+    status: list[FacetCount]
+    price: list[RangeFacetCount]
+    year: list[RangeFacetCount]
+
+
+class CarImportRowError(BaseModel):
+    """Ошибка по одной строке импорта."""
+
+    line: int
+    vin: str | None = None
+    errors: list[str]
+
+
+class CarImportReport(BaseModel):
+    """Итог потокового импорта авто."""
+
+    total: int = 0
+    created: int = 0
+    duplicates: int = 0
+    failed: int = 0
+    errors: list[CarImportRowError] = Field(default_factory=list)
+
+
 class CarDetailsRead(BaseModel):
     """Агрегированный ответ по авто со связями."""
 
@@ -1,28 +1,51 @@
+import codecs
+import csv
+import hashlib
+import json
 import logging
+from collections.abc import AsyncIterator, Sequence
+from typing import Any
 
-from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.api.car_photos.schemas import CarPhotoRead
 from app.api.car_reports.schemas import CarReportRead
 from app.api.cars.exceptions import (
     CarAlreadyExistsException,
     CarDeletedNotFoundException,
+    CarImportUnsupportedFormatException,
     CarNotFoundException,
     CarsNotFoundByFiltersException,
 )
 from app.api.cars.schemas import (
+    CarCardRead,
     CarCreate,
     CarDetailsRead,
+    CarFacets,
     CarIdFilter,
+    CarImportReport,
+    CarImportRowError,
     CarOrderRead,
     CarRead,
     CarUpdate,
+    FacetCount,
+    RangeFacetCount,
 )
+from app.api.export import ExportFormat, iter_export
 from app.api.reviews.schemas import ReviewRead
-from app.dao.cars import CarsDAO
+from app.core.cache import COUNT_CACHE
+from app.core.settings import APP_CONFIG
+from app.dao.base import CountMode, RecordVersion
+from app.dao.car_listing import CarListingDAO
+from app.dao.cars import PRICE_FACET_EDGES, YEAR_FACET_EDGES, CarsDAO
 
 logger = logging.getLogger(__name__)
 
+IMPORT_CSV_TYPES = {"text/csv", "application/csv"}
+IMPORT_NDJSON_TYPES = {"application/x-ndjson", "application/ndjson", "application/jsonl"}
+
 
 async def create_car(session: AsyncSession, data: CarCreate) -> CarRead:
     if await CarsDAO.get_by_vin(session, data.vin):
@@ -34,14 +57,31 @@ async def create_car(session: AsyncSession, data: CarCreate) -> CarRead:
     return CarRead.model_validate(car)
 
 
-async def get_car(session: AsyncSession, car_id: int) -> CarRead:
-    car = await CarsDAO.find_one_or_none_by_id(car_id, session)
+async def get_car(session: AsyncSession, car_id: int, raw: bool = False) -> CarRead:
+    # raw=True — Core-выборка колонок CarRead без ORM-объекта. С включённым кэшем сущностей
+    # авто читается через него: попадание в кэш не ходит в БД вовсе
+    if raw and not CarsDAO.uses_entity_cache():
+        car = await CarsDAO.find_row_by_id(session, car_id, CarRead)
+    else:
+        car = await CarsDAO.find_one_or_none_by_id(car_id, session)
     if not car:
         logger.warning("[cars] Авто не найдено id=%s", car_id)
         raise CarNotFoundException
     return CarRead.model_validate(car)
 
 
+async def get_car_version(session: AsyncSession, car_id: int, details: bool = False) -> RecordVersion:
+    """Версия авто для ETag/Last-Modified; details=True — версия агрегата CarDetailsRead."""
+    if details:
+        version = await CarsDAO.get_details_version(session, car_id)
+    else:
+        version = await CarsDAO.get_version(session, car_id)
+    if version is None:
+        logger.warning("[cars] Авто не найдено id=%s", car_id)
+        raise CarNotFoundException
+    return version
+
+
 async def list_cars(
     session: AsyncSession,
     limit: int = 20,
@@ -56,10 +96,12 @@ async def list_cars(
     year_max: int | None = None,
     sort_by: str | None = None,
     sort_dir: str | None = "desc",
+    cursor: str | None = None,
+    raw: bool = False,
 ) -> list[CarRead]:
     # offset/limit используются напрямую в DAO
-    cars = await CarsDAO.find_filtered(
-        session,
+    # raw=True — строки Core сразу в CarRead, без гидрации ORM
+    filters = dict(
         make=make,
         model=model,
         status=status,
@@ -72,7 +114,12 @@ async def list_cars(
         sort_dir=sort_dir,
         limit=limit,
         offset=offset,
+        cursor=cursor,
     )
+    if raw:
+        cars = await CarsDAO.find_filtered_rows(session, CarRead, **filters)
+    else:
+        cars = await CarsDAO.find_filtered(session, **filters)
     if not cars:
         logger.info("[cars] По фильтрам авто не найдены")
         raise CarsNotFoundByFiltersException
@@ -80,6 +127,197 @@ async def list_cars(
     return result
 
 
+async def list_car_cards(
+    session: AsyncSession,
+    limit: int = 20,
+    offset: int = 0,
+    make: str | None = None,
+    model: str | None = None,
+    status: str | None = None,
+    engine_type: str | None = None,
+    price_min: float | None = None,
+    price_max: float | None = None,
+    year_min: int | None = None,
+    year_max: int | None = None,
+    sort_by: str | None = None,
+    sort_dir: str | None = "desc",
+    cursor: str | None = None,
+) -> list[CarCardRead]:
+    """Карточки каталога одним запросом к car_listing; фильтры — как у list_cars."""
+    cards = await CarListingDAO.find_filtered_rows(
+        session,
+        CarCardRead,
+        make=make,
+        model=model,
+        status=status,
+        engine_type=engine_type,
+        price_min=price_min,
+        price_max=price_max,
+        year_min=year_min,
+        year_max=year_max,
+        sort_by=sort_by,
+        sort_dir=sort_dir,
+        limit=limit,
+        offset=offset,
+        cursor=cursor,
+    )
+    if not cards:
+        logger.info("[cars] По фильтрам карточки не найдены")
+        raise CarsNotFoundByFiltersException
+    return [CarCardRead.model_validate(c) for c in cards]
+
+
+async def search_cars(
+    session: AsyncSession,
+    q: str,
+    limit: int = 20,
+    offset: int = 0,
+    make: str | None = None,
+    model: str | None = None,
+    status: str | None = None,
+    engine_type: str | None = None,
+    price_min: float | None = None,
+    price_max: float | None = None,
+    year_min: int | None = None,
+    year_max: int | None = None,
+) -> list[CarRead]:
+    """Поиск по каталогу с ранжированием; фильтры — как у list_cars."""
+    cars = await CarsDAO.search_rows(
+        session,
+        CarRead,
+        q,
+        limit=limit,
+        offset=offset,
+        make=make,
+        model=model,
+        status=status,
+        engine_type=engine_type,
+        price_min=price_min,
+        price_max=price_max,
+        year_min=year_min,
+        year_max=year_max,
+    )
+    if not cars:
+        logger.info("[cars] Поиск '%s': авто не найдены", q)
+        raise CarsNotFoundByFiltersException
+    return [CarRead.model_validate(c) for c in cars]
+
+
+async def count_cars(
+    session: AsyncSession,
+    mode: CountMode,
+    make: str | None = None,
+    model: str | None = None,
+    status: str | None = None,
+    engine_type: str | None = None,
+    price_min: float | None = None,
+    price_max: float | None = None,
+    year_min: int | None = None,
+    year_max: int | None = None,
+) -> int:
+    conditions = CarsDAO.filter_conditions(
+        make=make,
+        model=model,
+        status=status,
+        engine_type=engine_type,
+        price_min=price_min,
+        price_max=price_max,
+        year_min=year_min,
+        year_max=year_max,
+    )
+    return await CarsDAO.count_where(session, conditions, mode)
+
+
+async def get_car_facets(
+    session: AsyncSession,
+    make: str | None = None,
+    model: str | None = None,
+    status: str | None = None,
+    engine_type: str | None = None,
+    price_min: float | None = None,
+    price_max: float | None = None,
+    year_min: int | None = None,
+    year_max: int | None = None,
+) -> CarFacets:
+    """Фасеты каталога для фильтров list_cars; ответ кэшируется на CACHE__FACETS_TTL секунд."""
+    filters = {
+        "make": make,
+        "model": model,
+        "status": status,
+        "engine_type": engine_type,
+        "price_min": price_min,
+        "price_max": price_max,
+        "year_min": year_min,
+        "year_max": year_max,
+    }
+    # ключ не зависит от порядка и от незаданных фильтров
+    normalized = json.dumps({k: v for k, v in filters.items() if v is not None}, sort_keys=True)
+    key = f"facets:cars:{hashlib.sha1(normalized.encode()).hexdigest()}"
+    cached = await COUNT_CACHE.get(key)
+    if cached is not None:
+        return CarFacets.model_validate_json(cached)
+
+    total, counts = await CarsDAO.facet_counts(session, CarsDAO.filter_conditions(**filters))
+    facets = CarFacets(
+        total=total,
+        make=_facet_values(counts["make"]),
+        engine_type=_facet_values(counts["engine_type"]),
+        transmission=_facet_values(counts["transmission"]),
+        condition=_facet_values(counts["condition"]),
+        status=_facet_values(counts["status"]),
+        price=_facet_ranges(counts["price"], PRICE_FACET_EDGES),
+        year=_facet_ranges(counts["year"], YEAR_FACET_EDGES),
+    )
+    await COUNT_CACHE.set(key, facets.model_dump_json(), APP_CONFIG.cache.facets_ttl)
+    return facets
+
+
+def _facet_values(counts: dict[Any, int]) -> list[FacetCount]:
+    # самые частые значения первыми
+    items = sorted(counts.items(), key=lambda item: (-item[1], str(item[0])))
+    return [FacetCount(value=str(value), count=count) for value, count in items]
+
+
+def _facet_ranges(counts: dict[int, int], edges: Sequence[int]) -> list[RangeFacetCount]:
+    bounds = [None, *edges, None]
+    return [RangeFacetCount(min=bounds[index], max=bounds[index + 1], count=counts[index]) for index in sorted(counts)]
+
+
+def export_cars(
+    session_maker: async_sessionmaker[AsyncSession],
+    fmt: ExportFormat,
+    make: str | None = None,
+    model: str | None = None,
+    status: str | None = None,
+    engine_type: str | None = None,
+    price_min: float | None = None,
+    price_max: float | None = None,
+    year_min: int | None = None,
+    year_max: int | None = None,
+    sort_by: str | None = None,
+    sort_dir: str | None = "desc",
+) -> AsyncIterator[str]:
+    logger.info("[cars] Экспорт авто формат=%s", fmt)
+    return iter_export(
+        session_maker,
+        lambda session: CarsDAO.stream_filtered(
+            session,
+            make=make,
+            model=model,
+            status=status,
+            engine_type=engine_type,
+            price_min=price_min,
+            price_max=price_max,
+            year_min=year_min,
+            year_max=year_max,
+            sort_by=sort_by,
+            sort_dir=sort_dir,
+        ),
+        CarRead,
+        fmt,
+    )
+
+
 async def update_car(
     session: AsyncSession,
     car_id: int,
@@ -90,18 +328,17 @@ async def update_car(
     if not values:
         logger.info("[cars] Обновление без изменений id=%s", car_id)
         return await get_car(session, car_id)
-    updated = await CarsDAO.update(
+    updated = await CarsDAO.update_returning(
         session,
         CarIdFilter(id=car_id),
         data,
     )
-    await session.commit()
-    if updated == 0:
+    if not updated:
         logger.warning("[cars] Авто не найдено для обновления id=%s", car_id)
         raise CarNotFoundException
-    car = await CarsDAO.find_one_or_none_by_id(car_id, session)
+    await session.commit()
     logger.info("[cars] Авто обновлено id=%s", car_id)
-    return CarRead.model_validate(car)
+    return CarRead.model_validate(updated[0])
 
 
 async def delete_car(session: AsyncSession, car_id: int) -> None:
@@ -139,3 +376,161 @@ async def get_car_details(
         orders=[CarOrderRead.model_validate(o) for o in car.orders],
     )
     return details
+
+
+async def _iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Разбить поток байтов на строки, не читая тело целиком."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer.rstrip("\r")
+
+
+async def _iter_csv_records(
+    lines: AsyncIterator[str],
+) -> AsyncIterator[tuple[int, dict | None, str | None]]:
+    """CSV с заголовком -> (номер строки, поля записи, ошибка)."""
+    header: list[str] | None = None
+    pending = ""
+    start = line_no = 0
+    async for line in lines:
+        line_no += 1
+        if not pending:
+            start = line_no
+        pending = f"{pending}\n{line}" if pending else line
+        # нечётное число кавычек — поле в кавычках продолжается на следующей строке
+        if pending.count('"') % 2:
+            continue
+        record, pending = pending, ""
+        if not record.strip():
+            continue
+        fields = next(csv.reader([record]))
+        if header is None:
+            header = [name.strip() for name in fields]
+            continue
+        if len(fields) != len(header):
+            yield start, None, f"Ожидалось полей: {len(header)}, получено: {len(fields)}"
+            continue
+        # пустые ячейки не передаём, чтобы сработали значения по умолчанию
+        yield start, {name: value for name, value in zip(header, fields) if value != ""}, None
+    if pending:
+        yield start, None, "Незакрытая кавычка в конце файла"
+
+
+async def _iter_ndjson_records(
+    lines: AsyncIterator[str],
+) -> AsyncIterator[tuple[int, str | None, str | None]]:
+    """NDJSON -> (номер строки, JSON-объект строкой, ошибка)."""
+    line_no = 0
+    async for line in lines:
+        line_no += 1
+        if line.strip():
+            yield line_no, line, None
+
+
+def _format_validation_errors(error: ValidationError) -> list[str]:
+    return [f"{'.'.join(map(str, err['loc'])) or 'row'}: {err['msg']}" for err in error.errors()]
+
+
+async def _flush_import_batch(
+    session: AsyncSession,
+    batch: list[tuple[int, CarCreate]],
+    report: CarImportReport,
+) -> None:
+    try:
+        inserted = await CarsDAO.insert_skip_existing_vin(
+            session,
+            [car.model_dump() for _, car in batch],
+        )
+        await session.commit()
+    except SQLAlchemyError:
+        # после неудачного коммита сессия не примет следующую пачку без отката
+        await session.rollback()
+        logger.exception("[cars] Ошибка записи пачки импорта (%s строк)", len(batch))
+        report.failed += len(batch)
+        report.errors.extend(
+            CarImportRowError(line=line, vin=car.vin, errors=["Ошибка записи в БД"]) for line, car in batch
+        )
+        return
+
+    report.created += len(inserted)
+    for line, car in batch:
+        if car.vin not in inserted:
+            report.duplicates += 1
+            report.errors.append(
+                CarImportRowError(line=line, vin=car.vin, errors=["Авто с таким VIN уже существует"]),
+            )
+
+
+async def import_cars(
+    session: AsyncSession,
+    chunks: AsyncIterator[bytes],
+    content_type: str | None,
+    batch_size: int = 1000,
+) -> CarImportReport:
+    """Потоковый импорт авто из CSV или NDJSON.
+
+    Строки валидируются по `CarCreate` по мере чтения тела запроса и пишутся
+    пачками по `batch_size`; каждая пачка — отдельная транзакция. VIN, уже
+    существующие в БД или повторяющиеся в файле, пропускаются.
+    """
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type in IMPORT_CSV_TYPES:
+        records = _iter_csv_records(_iter_lines(chunks))
+    elif media_type in IMPORT_NDJSON_TYPES:
+        records = _iter_ndjson_records(_iter_lines(chunks))
+    else:
+        logger.warning("[cars] Неподдерживаемый формат импорта: %s", content_type)
+        raise CarImportUnsupportedFormatException
+
+    logger.info("[cars] Импорт авто: формат=%s, пачка=%s", media_type, batch_size)
+    report = CarImportReport()
+    seen_vins: set[str] = set()
+    batch: list[tuple[int, CarCreate]] = []
+    async for line, payload, error in records:
+        report.total += 1
+        if error is not None:
+            report.failed += 1
+            report.errors.append(CarImportRowError(line=line, errors=[error]))
+            continue
+        try:
+            if isinstance(payload, str):
+                car = CarCreate.model_validate_json(payload)
+            else:
+                car = CarCreate.model_validate(payload)
+        except ValidationError as e:
+            report.failed += 1
+            vin = payload.get("vin") if isinstance(payload, dict) else None
+            report.errors.append(
+                CarImportRowError(line=line, vin=vin, errors=_format_validation_errors(e)),
+            )
+            continue
+        if car.vin in seen_vins:
+            report.duplicates += 1
+            report.errors.append(
+                CarImportRowError(line=line, vin=car.vin, errors=["VIN повторяется в файле"]),
+            )
+            continue
+        seen_vins.add(car.vin)
+        batch.append((line, car))
+        if len(batch) >= batch_size:
+            await _flush_import_batch(session, batch, report)
+            batch = []
+    if batch:
+        await _flush_import_batch(session, batch, report)
+    report.errors.sort(key=lambda row_error: row_error.line)
+
+    logger.info(
+        "[cars] Импорт завершён: всего=%s, создано=%s, дубликатов=%s, ошибок=%s",
+        report.total,
+        report.created,
+        report.duplicates,
+        report.failed,
+    )
+    return report
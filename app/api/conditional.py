@@ -0,0 +1,67 @@
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response, status
+
+from app.dao.base import RecordVersion
+
+ETAG_HEADER = "ETag"
+LAST_MODIFIED_HEADER = "Last-Modified"
+
+
+def make_etag(version: RecordVersion) -> str:
+    # слабый тег: одинаковые данные, но байты ответа могут отличаться (сжатие, порядок ключей)
+    return f'W/"{version.tag}"'
+
+
+def _last_modified(version: RecordVersion) -> datetime | None:
+    if version.updated_at is None:
+        return None
+    # TIMESTAMP без зоны пишется now() сервера БД, который работает в UTC
+    updated_at = version.updated_at
+    if updated_at.tzinfo is None:
+        updated_at = updated_at.replace(tzinfo=UTC)
+    return updated_at.astimezone(UTC).replace(microsecond=0)
+
+
+def is_conditional(request: Request) -> bool:
+    """Есть ли у запроса If-None-Match/If-Modified-Since; без них версию заранее читать незачем."""
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def is_not_modified(request: Request, version: RecordVersion) -> bool:
+    """Актуальна ли копия клиента: If-None-Match, а если его нет — If-Modified-Since."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # слабое сравнение (RFC 9110, 13.1.2): префикс W/ не учитывается
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or f'"{version.tag}"' in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    last_modified = _last_modified(version)
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=UTC)
+    return last_modified <= since
+
+
+def set_version_headers(response: Response, version: RecordVersion) -> None:
+    response.headers[ETAG_HEADER] = make_etag(version)
+    last_modified = _last_modified(version)
+    if last_modified is not None:
+        response.headers[LAST_MODIFIED_HEADER] = format_datetime(last_modified, usegmt=True)
+
+
+def not_modified(request: Request, response: Response, version: RecordVersion) -> Response | None:
+    """Ответ 304 без тела, если у клиента актуальная версия; иначе проставить ETag/Last-Modified в `response`."""
+    if is_not_modified(request, version):
+        cached = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+        set_version_headers(cached, version)
+        return cached
+    set_version_headers(response, version)
+    return None
@@ -2,17 +2,18 @@ import logging
 from typing import Any
 
 from fastapi import APIRouter, Depends, status
-from fastapi.responses import ORJSONResponse
 from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.default.exceptions import DatabaseNotReadyException
 from app.api.default.schemas import DBResponse, ExcResponse, PingResponse
-from app.db import get_session_without_commit
+from app.api.responses import SerializedRoute
+from app.db import get_session
 
 router = APIRouter(
     tags=["default"],
+    route_class=SerializedRoute,
 )
 
 logger = logging.getLogger(__name__)
@@ -22,7 +23,6 @@ logger = logging.getLogger(__name__)
     "/ping",
     include_in_schema=True,
     response_model=PingResponse,
-    response_class=ORJSONResponse,
     summary="Проверка работоспособности сервера",
     status_code=status.HTTP_200_OK,
 )
@@ -35,11 +35,10 @@ async def _ping():
     "/check_database",
     include_in_schema=True,
     response_model=DBResponse,
-    response_class=ORJSONResponse,
     summary="Проверка доступности базы данных",
     status_code=status.HTTP_200_OK,
 )
-async def _ready(session: AsyncSession = Depends(get_session_without_commit)):
+async def _ready(session: AsyncSession = Depends(get_session)):  # всегда primary
     try:
         await session.execute(text("SELECT 1"))
     except SQLAlchemyError:
@@ -52,7 +51,6 @@ async def _ready(session: AsyncSession = Depends(get_session_without_commit)):
     "/exception",
     include_in_schema=True,
     response_model=ExcResponse,
-    response_class=ORJSONResponse,
     summary="Отправка ecx в sentry и ТГ",
     status_code=status.HTTP_200_OK,
 )
@@ -1,5 +1,4 @@
-from fastapi import APIRouter, Depends, Query, status
-from fastapi.responses import ORJSONResponse
+from fastapi import APIRouter, Depends, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deliveries.schemas import (
@@ -8,6 +7,7 @@ from app.api.deliveries.schemas import (
     DeliveryUpdate,
 )
 from app.api.deliveries.services import (
+    count_deliveries,
     create_delivery,
     delete_delivery,
     get_delivery,
@@ -15,13 +15,17 @@ from app.api.deliveries.services import (
     list_deliveries,
     update_delivery,
 )
+from app.api.pagination import CountQuery, CursorQuery, set_next_cursor, set_total_count
+from app.api.responses import SerializedRoute
 from app.core.settings import APP_CONFIG
-from app.db import get_session_without_commit
+from app.dao.base import CountMode
+from app.db import get_session_without_commit, release_connection
 from app.models.deliveries import DeliveryStatus
 
 router = APIRouter(
     prefix=f"{APP_CONFIG.api.v1}/deliveries",
     tags=["deliveries"],
+    route_class=SerializedRoute,
 )
 
 
@@ -29,7 +33,6 @@ router = APIRouter(
     "/",
     response_model=DeliveryRead,
     status_code=status.HTTP_201_CREATED,
-    response_class=ORJSONResponse,
 )
 async def create(
     data: DeliveryCreate,
@@ -41,49 +44,68 @@ async def create(
 @router.get(
     "/{delivery_id}",
     response_model=DeliveryRead,
-    response_class=ORJSONResponse,
 )
 async def get(
     delivery_id: int,
     session: AsyncSession = Depends(get_session_without_commit),
 ):
-    return await get_delivery(session, delivery_id)
+    delivery = await get_delivery(session, delivery_id)
+    await release_connection(session)
+    return delivery
 
 
 @router.get(
     "/",
     response_model=list[DeliveryRead],
-    response_class=ORJSONResponse,
     summary="Список доставок с фильтрами",
     description=("Фильтры: order_id,\n" "status {pending|in_progress|delivered|failed},\n" "q (по tracking_number)"),
 )
 async def list_(
+    response: Response,
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: str | None = CursorQuery,
+    count: CountMode | None = CountQuery,
     order_id: int | None = None,
     status: DeliveryStatus | None = None,
     q: str | None = Query(default=None, min_length=1, max_length=128),
     session: AsyncSession = Depends(get_session_without_commit),
 ):
-    return await list_deliveries(
+    deliveries = await list_deliveries(
         session=session,
         limit=limit,
         offset=offset,
         order_id=order_id,
         status=(status.value if status else None),
         q=q,
+        cursor=cursor,
     )
+    if count is not None:
+        set_total_count(
+            response,
+            await count_deliveries(
+                session,
+                count,
+                order_id=order_id,
+                status=(status.value if status else None),
+                q=q,
+            ),
+        )
+    await release_connection(session)
+    set_next_cursor(response, deliveries, limit)
+    return deliveries
 
 
 @router.get(
     "/{delivery_id}/details",
-    response_class=ORJSONResponse,
 )
 async def details(
     delivery_id: int,
     session: AsyncSession = Depends(get_session_without_commit),
 ):
-    return await get_delivery_details(session, delivery_id)
+    details = await get_delivery_details(session, delivery_id)
+    await release_connection(session)
+    return details
 
 
 @router.put(
@@ -18,6 +18,7 @@ from app.api.deliveries.schemas import (
     DeliveryRead,
     DeliveryUpdate,
 )
+from app.dao.base import CountMode
 from app.dao.deliveries import DeliveriesDAO
 from app.dao.orders import OrdersDAO
 from app.models.users import User
@@ -60,6 +61,7 @@ async def list_deliveries(
     order_id: int | None = None,
     status: str | None = None,
     q: str | None = None,
+    cursor: str | None = None,
 ) -> list[DeliveryRead]:
     items = await DeliveriesDAO.find_filtered(
         session,
@@ -68,6 +70,7 @@ async def list_deliveries(
         q=q,
         limit=limit,
         offset=offset,
+        cursor=cursor,
     )
     if not items:
         logger.info("[deliveries] По фильтрам доставки не найдены")
@@ -76,6 +79,17 @@ async def list_deliveries(
     return result
 
 
+async def count_deliveries(
+    session: AsyncSession,
+    mode: CountMode,
+    order_id: int | None = None,
+    status: str | None = None,
+    q: str | None = None,
+) -> int:
+    conditions = DeliveriesDAO.filter_conditions(order_id=order_id, status=status, q=q)
+    return await DeliveriesDAO.count_where(session, conditions, mode)
+
+
 async def update_delivery(
     session: AsyncSession,
     delivery_id: int,
@@ -87,20 +101,20 @@ async def update_delivery(
     if not values:
         logger.info("[deliveries] Обновление без изменений id=%s", delivery_id)
         return await get_delivery(session, delivery_id)
-    updated = await DeliveriesDAO.update(
+    updated = await DeliveriesDAO.update_returning(
         session,
         DeliveryIdFilter(id=delivery_id),
         data,
     )
-    if updated == 0:
+    if not updated:
         logger.warning(
             "[deliveries] Доставка не найдена для обновления id=%s",
             delivery_id,
         )
         raise DeliveryNotFoundException
-    delivery = await DeliveriesDAO.find_one_or_none_by_id(delivery_id, session)
+    await session.commit()
     logger.info("[deliveries] Доставка обновлена id=%s", delivery_id)
-    return DeliveryRead.model_validate(delivery)
+    return DeliveryRead.model_validate(updated[0])
 
 
 async def delete_delivery(session: AsyncSession, delivery_id: int) -> None:
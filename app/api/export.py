@@ -0,0 +1,70 @@
+import csv
+import io
+from collections.abc import AsyncIterator, Callable
+from enum import StrEnum, unique
+from typing import Any
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+
+@unique
+class ExportFormat(StrEnum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv",
+}
+
+
+async def iter_export(
+    session_maker: async_sessionmaker[AsyncSession],
+    open_stream: Callable[[AsyncSession], AsyncIterator[Any]],
+    schema: type[BaseModel],
+    fmt: ExportFormat,
+    batch_size: int = 1000,
+) -> AsyncIterator[str]:
+    """Сериализовать поток записей в NDJSON или CSV пачками по `batch_size`.
+
+    Сессия открывается здесь, а не через Depends: генератор дочитывается
+    уже после выхода из обработчика, когда зависимости могут быть закрыты.
+    """
+    fields = list(schema.model_fields)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if fmt is ExportFormat.csv:
+        writer.writerow(fields)
+
+    rows = 0
+    async with session_maker() as session:
+        async for record in open_stream(session):
+            item = schema.model_validate(record)
+            if fmt is ExportFormat.csv:
+                data = item.model_dump(mode="json")
+                writer.writerow([data[name] for name in fields])
+            else:
+                buffer.write(item.model_dump_json())
+                buffer.write("\n")
+            rows += 1
+            if rows % batch_size == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def export_response(
+    content: AsyncIterator[str],
+    fmt: ExportFormat,
+    filename: str,
+) -> StreamingResponse:
+    return StreamingResponse(
+        content,
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt.value}"'},
+    )
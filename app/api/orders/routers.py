@@ -1,7 +1,9 @@
-from fastapi import APIRouter, Depends, Query, status
-from fastapi.responses import ORJSONResponse
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.conditional import is_conditional, not_modified, set_version_headers
+from app.api.export import ExportFormat, export_response
 from app.api.orders.schemas import (
     OrderCreate,
     OrderDetailsRead,
@@ -9,20 +11,27 @@ from app.api.orders.schemas import (
     OrderUpdate,
 )
 from app.api.orders.services import (
+    count_orders,
     create_order,
     delete_order,
+    export_orders,
     get_order,
     get_order_details,
+    get_order_version,
     list_orders,
     update_order,
 )
+from app.api.pagination import CountQuery, CursorQuery, set_next_cursor, set_total_count
+from app.api.responses import SerializedRoute
 from app.core.settings import APP_CONFIG
-from app.db import get_session_without_commit
+from app.dao.base import CountMode, record_version
+from app.db import get_session_without_commit, read_session_maker, release_connection
 from app.models.orders import OrderStatus, PaymentMethod
 
 router = APIRouter(
     prefix=f"{APP_CONFIG.api.v1}/orders",
     tags=["orders"],
+    route_class=SerializedRoute,
 )
 
 
@@ -30,7 +39,6 @@ router = APIRouter(
     "/",
     response_model=OrderRead,
     status_code=status.HTTP_201_CREATED,
-    response_class=ORJSONResponse,
 )
 async def create(
     data: OrderCreate,
@@ -39,22 +47,58 @@ async def create(
     return await create_order(session, data)
 
 
+@router.get(
+    "/export",
+    summary="Потоковая выгрузка заказов (NDJSON / CSV)",
+    description="Те же фильтры, что у списка заказов, без пагинации.",
+    response_class=StreamingResponse,
+)
+async def export(
+    request: Request,
+    fmt: ExportFormat = Query(ExportFormat.ndjson, alias="format"),
+    user_id: int | None = None,
+    car_id: int | None = None,
+    status: OrderStatus | None = None,
+    payment_method: PaymentMethod | None = None,
+    q: str | None = Query(default=None, min_length=1, max_length=128),
+):
+    content = export_orders(
+        read_session_maker(request),
+        fmt,
+        user_id=user_id,
+        car_id=car_id,
+        status=(status.value if status else None),
+        payment_method=(payment_method.value if payment_method else None),
+        q=q,
+    )
+    return export_response(content, fmt, "orders")
+
+
 @router.get(
     "/{order_id}",
     response_model=OrderRead,
-    response_class=ORJSONResponse,
 )
 async def get(
     order_id: int,
+    request: Request,
+    response: Response,
     session: AsyncSession = Depends(get_session_without_commit),
 ):
-    return await get_order(session, order_id)
+    # без условных заголовков версия берётся из загруженного заказа — один запрос вместо двух
+    if is_conditional(request):
+        version = await get_order_version(session, order_id)
+        if (cached := not_modified(request, response, version)) is not None:
+            await release_connection(session)
+            return cached
+    order = await get_order(session, order_id)
+    await release_connection(session)
+    set_version_headers(response, record_version(order.id, order.updated_at))
+    return order
 
 
 @router.get(
     "/",
     response_model=list[OrderRead],
-    response_class=ORJSONResponse,
     summary="Список заказов с фильтрами",
     description=(
         "Фильтры: user_id, car_id,\n"
@@ -63,8 +107,11 @@ async def get(
     ),
 )
 async def list_(
+    response: Response,
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: str | None = CursorQuery,
+    count: CountMode | None = CountQuery,
     user_id: int | None = None,
     car_id: int | None = None,
     status: OrderStatus | None = None,
@@ -72,7 +119,7 @@ async def list_(
     q: str | None = Query(default=None, min_length=1, max_length=128),
     session: AsyncSession = Depends(get_session_without_commit),
 ):
-    return await list_orders(
+    orders = await list_orders(
         session=session,
         limit=limit,
         offset=offset,
@@ -81,7 +128,25 @@ async def list_(
         status=(status.value if status else None),
         payment_method=(payment_method.value if payment_method else None),
         q=q,
+        cursor=cursor,
+        raw=True,
     )
+    if count is not None:
+        set_total_count(
+            response,
+            await count_orders(
+                session,
+                count,
+                user_id=user_id,
+                car_id=car_id,
+                status=(status.value if status else None),
+                payment_method=(payment_method.value if payment_method else None),
+                q=q,
+            ),
+        )
+    await release_connection(session)
+    set_next_cursor(response, orders, limit)
+    return orders
 
 
 @router.put(
@@ -111,10 +176,17 @@ async def delete(
 @router.get(
     "/{order_id}/details",
     response_model=OrderDetailsRead,
-    response_class=ORJSONResponse,
 )
 async def details(
     order_id: int,
+    request: Request,
+    response: Response,
     session: AsyncSession = Depends(get_session_without_commit),
 ):
-    return await get_order_details(session, order_id)
+    version = await get_order_version(session, order_id, details=True)
+    if (cached := not_modified(request, response, version)) is not None:
+        await release_connection(session)
+        return cached
+    details = await get_order_details(session, order_id)
+    await release_connection(session)
+    return details
@@ -1,9 +1,11 @@
 import logging
+from collections.abc import AsyncIterator
 
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.api.cars.schemas import CarRead
 from app.api.deliveries.schemas import DeliveryRead
+from app.api.export import ExportFormat, iter_export
 from app.api.orders.exceptions import (
     CarsNotFoundByException,
     OrderCarNotFoundException,
@@ -20,6 +22,7 @@ from app.api.orders.schemas import (
     OrderUserRead,
 )
 from app.api.payments.schemas import PaymentRead
+from app.dao.base import CountMode, RecordVersion
 from app.dao.cars import CarsDAO
 from app.dao.orders import OrdersDAO
 from app.dao.users import UsersDAO
@@ -52,6 +55,18 @@ async def get_order(session: AsyncSession, order_id: int) -> OrderRead:
     return OrderRead.model_validate(order)
 
 
+async def get_order_version(session: AsyncSession, order_id: int, details: bool = False) -> RecordVersion:
+    """Версия заказа для ETag/Last-Modified; details=True — версия агрегата OrderDetailsRead."""
+    if details:
+        version = await OrdersDAO.get_details_version(session, order_id)
+    else:
+        version = await OrdersDAO.get_version(session, order_id)
+    if version is None:
+        logger.warning("[orders] Заказ не найден id=%s", order_id)
+        raise OrderNotFoundException
+    return version
+
+
 async def list_orders(
     session: AsyncSession,
     limit: int = 20,
@@ -61,9 +76,11 @@ async def list_orders(
     status: str | None = None,
     payment_method: str | None = None,
     q: str | None = None,
+    cursor: str | None = None,
+    raw: bool = False,
 ) -> list[OrderRead]:
-    orders = await OrdersDAO.find_filtered(
-        session,
+    # raw=True — строки Core сразу в OrderRead, без гидрации ORM
+    filters = dict(
         user_id=user_id,
         car_id=car_id,
         status=status,
@@ -71,7 +88,12 @@ async def list_orders(
         q=q,
         limit=limit,
         offset=offset,
+        cursor=cursor,
     )
+    if raw:
+        orders = await OrdersDAO.find_filtered_rows(session, OrderRead, **filters)
+    else:
+        orders = await OrdersDAO.find_filtered(session, **filters)
     if not orders:
         logger.info("[orders] По фильтрам заказы не найдены")
         raise OrdersNotFoundByFiltersException
@@ -79,6 +101,50 @@ async def list_orders(
     return result
 
 
+async def count_orders(
+    session: AsyncSession,
+    mode: CountMode,
+    user_id: int | None = None,
+    car_id: int | None = None,
+    status: str | None = None,
+    payment_method: str | None = None,
+    q: str | None = None,
+) -> int:
+    conditions = OrdersDAO.filter_conditions(
+        user_id=user_id,
+        car_id=car_id,
+        status=status,
+        payment_method=payment_method,
+        q=q,
+    )
+    return await OrdersDAO.count_where(session, conditions, mode)
+
+
+def export_orders(
+    session_maker: async_sessionmaker[AsyncSession],
+    fmt: ExportFormat,
+    user_id: int | None = None,
+    car_id: int | None = None,
+    status: str | None = None,
+    payment_method: str | None = None,
+    q: str | None = None,
+) -> AsyncIterator[str]:
+    logger.info("[orders] Экспорт заказов формат=%s", fmt)
+    return iter_export(
+        session_maker,
+        lambda session: OrdersDAO.stream_filtered(
+            session,
+            user_id=user_id,
+            car_id=car_id,
+            status=status,
+            payment_method=payment_method,
+            q=q,
+        ),
+        OrderRead,
+        fmt,
+    )
+
+
 async def update_order(
     session: AsyncSession,
     order_id: int,
@@ -100,21 +166,20 @@ async def update_order(
     values_obj = OrderUpdate(**data_update.model_dump(exclude_unset=True))
 
     ####
-    updated = await OrdersDAO.update(
+    updated = await OrdersDAO.update_returning(
         session,
         filter_obj,
         values_obj,
     )
-    if updated == 0:
+    if not updated:
         logger.warning(
             "[orders] Заказ не найден для обновления id=%s",
             order_id,
         )
         raise OrderNotFoundException
     await session.commit()
-    order = await OrdersDAO.find_one_or_none_by_id(order_id, session)
     logger.info("[orders] Заказ обновлён id=%s", order_id)
-    return OrderRead.model_validate(order)
+    return OrderRead.model_validate(updated[0])
 
 
 async def delete_order(session: AsyncSession, order_id: int) -> None:
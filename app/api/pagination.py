@@ -0,0 +1,40 @@
+from collections.abc import Sequence
+from typing import Any
+
+from fastapi import Query, Response
+
+from app.dao.base import encode_cursor
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+CursorQuery = Query(
+    None,
+    description=(
+        "Курсор keyset-пагинации из заголовка X-Next-Cursor предыдущей страницы. Если передан, offset игнорируется."
+    ),
+)
+
+CountQuery = Query(
+    None,
+    description=(
+        "Вернуть общее количество в заголовке X-Total-Count: exact — точно, "
+        "estimated — оценка планировщика, cached — точно с кэшем на несколько секунд."
+    ),
+)
+
+
+def set_total_count(response: Response, total: int) -> None:
+    response.headers[TOTAL_COUNT_HEADER] = str(total)
+
+
+def set_next_cursor(
+    response: Response,
+    items: Sequence[Any],
+    limit: int,
+    sort_by: str | None = None,
+    sort_dir: str | None = "desc",
+) -> None:
+    """Проставить курсор следующей страницы, если страница заполнена целиком."""
+    if items and len(items) >= limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(items[-1], sort_by, sort_dir)
@@ -1,7 +1,9 @@
-from fastapi import APIRouter, Depends, Query, status
-from fastapi.responses import ORJSONResponse
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.export import ExportFormat, export_response
+from app.api.pagination import CountQuery, CursorQuery, set_next_cursor, set_total_count
 from app.api.payments.schemas import (
     PaymentCreate,
     PaymentDetailsRead,
@@ -9,20 +11,25 @@ from app.api.payments.schemas import (
     PaymentUpdate,
 )
 from app.api.payments.services import (
+    count_payments,
     create_payment,
     delete_payment,
+    export_payments,
     get_payment,
     get_payment_details,
     list_payments,
     update_payment,
 )
+from app.api.responses import SerializedRoute
 from app.core.settings import APP_CONFIG
-from app.db import get_session_without_commit
+from app.dao.base import CountMode
+from app.db import get_session_without_commit, read_session_maker, release_connection
 from app.models.payments import PaymentStatus, PaymentType
 
 router = APIRouter(
     prefix=f"{APP_CONFIG.api.v1}/payments",
     tags=["payments"],
+    route_class=SerializedRoute,
 )
 
 
@@ -30,7 +37,6 @@ router = APIRouter(
     "/",
     response_model=PaymentRead,
     status_code=status.HTTP_201_CREATED,
-    response_class=ORJSONResponse,
 )
 async def create(
     data: PaymentCreate,
@@ -39,41 +45,82 @@ async def create(
     return await create_payment(session, data)
 
 
+@router.get(
+    "/export",
+    summary="Потоковая выгрузка платежей (NDJSON / CSV)",
+    description="Те же фильтры, что у списка платежей, без пагинации.",
+    response_class=StreamingResponse,
+)
+async def export(
+    request: Request,
+    fmt: ExportFormat = Query(ExportFormat.ndjson, alias="format"),
+    order_id: int | None = None,
+    status: PaymentStatus | None = None,
+    payment_type: PaymentType | None = None,
+):
+    content = export_payments(
+        read_session_maker(request),
+        fmt,
+        order_id=order_id,
+        status=(status.value if status else None),
+        payment_type=(payment_type.value if payment_type else None),
+    )
+    return export_response(content, fmt, "payments")
+
+
 @router.get(
     "/{payment_id}",
     response_model=PaymentRead,
-    response_class=ORJSONResponse,
 )
 async def get(
     payment_id: int,
     session: AsyncSession = Depends(get_session_without_commit),
 ):
-    return await get_payment(session, payment_id)
+    payment = await get_payment(session, payment_id)
+    await release_connection(session)
+    return payment
 
 
 @router.get(
     "/",
     response_model=list[PaymentRead],
-    response_class=ORJSONResponse,
     summary="Список платежей с фильтрами",
     description=("Фильтры: order_id,\n" "status {pending|paid|failed},\n" "payment_type {full|installment|deposit}"),
 )
 async def list_(
+    response: Response,
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: str | None = CursorQuery,
+    count: CountMode | None = CountQuery,
     order_id: int | None = None,
     status: PaymentStatus | None = None,
     payment_type: PaymentType | None = None,
     session: AsyncSession = Depends(get_session_without_commit),
 ):
-    return await list_payments(
+    payments = await list_payments(
         session=session,
         limit=limit,
         offset=offset,
         order_id=order_id,
         status=(status.value if status else None),
         payment_type=(payment_type.value if payment_type else None),
+        cursor=cursor,
     )
+    if count is not None:
+        set_total_count(
+            response,
+            await count_payments(
+                session,
+                count,
+                order_id=order_id,
+                status=(status.value if status else None),
+                payment_type=(payment_type.value if payment_type else None),
+            ),
+        )
+    await release_connection(session)
+    set_next_cursor(response, payments, limit)
+    return payments
 
 
 @router.put(
@@ -103,10 +150,11 @@ async def delete(
 @router.get(
     "/{payment_id}/details",
     response_model=PaymentDetailsRead,
-    response_class=ORJSONResponse,
 )
 async def details(
     payment_id: int,
     session: AsyncSession = Depends(get_session_without_commit),
 ):
-    return await get_payment_details(session, payment_id)
+    details = await get_payment_details(session, payment_id)
+    await release_connection(session)
+    return details
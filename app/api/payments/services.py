@@ -1,7 +1,9 @@
 import logging
+from collections.abc import AsyncIterator
 
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from app.api.export import ExportFormat, iter_export
 from app.api.payments.exceptions import (
     OrderNotFoundForPaymentException,
     PaymentNotFoundException,
@@ -18,6 +20,7 @@ from app.api.payments.schemas import (
     PaymentRead,
     PaymentUpdate,
 )
+from app.dao.base import CountMode
 from app.dao.orders import OrdersDAO
 from app.dao.payments import PaymentsDAO
 
@@ -58,6 +61,7 @@ async def list_payments(
     order_id: int | None = None,
     status: str | None = None,
     payment_type: str | None = None,
+    cursor: str | None = None,
 ) -> list[PaymentRead]:
     items = await PaymentsDAO.find_filtered(
         session,
@@ -66,6 +70,7 @@ async def list_payments(
         payment_type=payment_type,
         limit=limit,
         offset=offset,
+        cursor=cursor,
     )
     if not items:
         logger.info("[payments] По фильтрам платежи не найдены")
@@ -74,6 +79,42 @@ async def list_payments(
     return result
 
 
+async def count_payments(
+    session: AsyncSession,
+    mode: CountMode,
+    order_id: int | None = None,
+    status: str | None = None,
+    payment_type: str | None = None,
+) -> int:
+    conditions = PaymentsDAO.filter_conditions(
+        order_id=order_id,
+        status=status,
+        payment_type=payment_type,
+    )
+    return await PaymentsDAO.count_where(session, conditions, mode)
+
+
+def export_payments(
+    session_maker: async_sessionmaker[AsyncSession],
+    fmt: ExportFormat,
+    order_id: int | None = None,
+    status: str | None = None,
+    payment_type: str | None = None,
+) -> AsyncIterator[str]:
+    logger.info("[payments] Экспорт платежей формат=%s", fmt)
+    return iter_export(
+        session_maker,
+        lambda session: PaymentsDAO.stream_filtered(
+            session,
+            order_id=order_id,
+            status=status,
+            payment_type=payment_type,
+        ),
+        PaymentRead,
+        fmt,
+    )
+
+
 async def update_payment(
     session: AsyncSession,
     payment_id: int,
@@ -84,20 +125,20 @@ async def update_payment(
     if not values:
         logger.info("[payments] Обновление без изменений id=%s", payment_id)
         return await get_payment(session, payment_id)
-    updated = await PaymentsDAO.update(
+    updated = await PaymentsDAO.update_returning(
         session,
         PaymentIdFilter(id=payment_id),
         data,
     )
-    if updated == 0:
+    if not updated:
         logger.warning(
             "[payments] Платёж не найден для обновления id=%s",
             payment_id,
         )
         raise PaymentNotFoundException
-    payment = await PaymentsDAO.find_one_or_none_by_id(payment_id, session)
+    await session.commit()
     logger.info("[payments] Платёж обновлён id=%s", payment_id)
-    return PaymentRead.model_validate(payment)
+    return PaymentRead.model_validate(updated[0])
 
 
 async def delete_payment(session: AsyncSession, payment_id: int) -> None:
@@ -0,0 +1,119 @@
+import inspect
+from collections.abc import Callable
+from functools import lru_cache, wraps
+from typing import Any
+
+from fastapi import Response
+from fastapi.datastructures import Default, DefaultPlaceholder
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from fastapi.utils import is_body_allowed_for_status_code
+from pydantic import TypeAdapter
+from starlette.concurrency import run_in_threadpool
+
+# имя параметра, под которым обёртка получает временный Response, если эндпоинт его не объявляет
+_RESPONSE_PARAM = "_serialized_response"
+
+_DUMP_OPTIONS = {
+    "response_model_include": "include",
+    "response_model_exclude": "exclude",
+    "response_model_by_alias": "by_alias",
+    "response_model_exclude_unset": "exclude_unset",
+    "response_model_exclude_defaults": "exclude_defaults",
+    "response_model_exclude_none": "exclude_none",
+}
+
+
+@lru_cache(maxsize=None)
+def _adapter(tp: Any) -> TypeAdapter:
+    return TypeAdapter(tp)
+
+
+class SerializedJSONResponse(JSONResponse):
+    """JSON-ответ, сериализуемый pydantic-core за один проход.
+
+    Модели и списки моделей пишутся сразу в байты через `TypeAdapter.dump_json`,
+    без промежуточного dict; готовые байты отдаются как есть.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        tp: Any = Any
+        if isinstance(content, list) and content:
+            tp = list[type(content[0])]
+        elif content is not None:
+            tp = type(content)
+        return _adapter(tp).dump_json(content)
+
+
+class SerializedRoute(APIRoute):
+    """Маршрут, который сериализует результат эндпоинта по `response_model` один раз.
+
+    Стандартный путь FastAPI выгружает уже проверенные Read-модели в dict, валидирует
+    их заново и ещё раз кодирует. Здесь результат проходит через `TypeAdapter(response_model)`:
+    готовые экземпляры схем принимаются без повторной валидации (ORM-объекты и строки
+    валидируются как раньше), после чего сразу пишутся в JSON. Заголовки и cookie,
+    выставленные эндпоинтом или зависимостями через `Response`, сохраняются.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        endpoint: Callable[..., Any],
+        *,
+        response_model: Any = Default(None),
+        **kwargs: Any,
+    ) -> None:
+        if response_model is not None and not isinstance(response_model, DefaultPlaceholder):
+            endpoint = _serialize_once(
+                endpoint,
+                _adapter(response_model),
+                status_code=kwargs.get("status_code"),
+                dump_options={option: kwargs[name] for name, option in _DUMP_OPTIONS.items() if name in kwargs},
+            )
+        super().__init__(path, endpoint, response_model=response_model, **kwargs)
+
+
+def _serialize_once(
+    endpoint: Callable[..., Any],
+    adapter: TypeAdapter,
+    status_code: int | None,
+    dump_options: dict[str, Any],
+) -> Callable[..., Any]:
+    signature = inspect.signature(endpoint)
+    response_param = next(
+        (name for name, param in signature.parameters.items() if param.annotation is Response),
+        None,
+    )
+    injected = response_param is None
+    if injected:
+        response_param = _RESPONSE_PARAM
+        signature = signature.replace(
+            parameters=[
+                *signature.parameters.values(),
+                inspect.Parameter(_RESPONSE_PARAM, inspect.Parameter.KEYWORD_ONLY, annotation=Response),
+            ],
+        )
+
+    @wraps(endpoint)
+    async def wrapper(**kwargs: Any) -> Any:
+        temporal: Response = kwargs.pop(response_param) if injected else kwargs[response_param]
+        if inspect.iscoroutinefunction(endpoint):
+            result = await endpoint(**kwargs)
+        else:
+            result = await run_in_threadpool(endpoint, **kwargs)
+        if isinstance(result, Response):
+            return result
+
+        response_status = temporal.status_code or status_code or 200
+        body = adapter.dump_json(adapter.validate_python(result, from_attributes=True), **dump_options)
+        response = SerializedJSONResponse(body, status_code=response_status)
+        if not is_body_allowed_for_status_code(response_status):
+            # как у FastAPI: статус без тела (204/304), выставленный через Response, отбрасывает тело
+            response.body = b""
+        response.headers.raw.extend(temporal.headers.raw)
+        return response
+
+    wrapper.__signature__ = signature
+    return wrapper
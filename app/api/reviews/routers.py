@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, Query, status
-from fastapi.responses import ORJSONResponse
+from fastapi import APIRouter, Depends, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.pagination import CountQuery, CursorQuery, set_next_cursor, set_total_count
+from app.api.responses import SerializedRoute
 from app.api.reviews.schemas import ReviewCreate, ReviewRead, ReviewUpdate
 from app.api.reviews.services import (
+    count_reviews,
     create_review,
     delete_review,
     get_review,
@@ -12,11 +14,13 @@ from app.api.reviews.services import (
     update_review,
 )
 from app.core.settings import APP_CONFIG
-from app.db import get_session_without_commit
+from app.dao.base import CountMode
+from app.db import get_session_without_commit, release_connection
 
 router = APIRouter(
     prefix=f"{APP_CONFIG.api.v1}/reviews",
     tags=["reviews"],
+    route_class=SerializedRoute,
 )
 
 
@@ -24,7 +28,6 @@ router = APIRouter(
     "/",
     response_model=ReviewRead,
     status_code=status.HTTP_201_CREATED,
-    response_class=ORJSONResponse,
 )
 async def create(
     data: ReviewCreate,
@@ -36,25 +39,28 @@ async def create(
 @router.get(
     "/{review_id}",
     response_model=ReviewRead,
-    response_class=ORJSONResponse,
 )
 async def get(
     review_id: int,
     session: AsyncSession = Depends(get_session_without_commit),
 ):
-    return await get_review(session, review_id)
+    review = await get_review(session, review_id)
+    await release_connection(session)
+    return review
 
 
 @router.get(
     "/",
     response_model=list[ReviewRead],
-    response_class=ORJSONResponse,
     summary="Список отзывов с фильтрами",
     description=("Фильтры: user_id, car_id,\n" "rating_min/rating_max (1-5),\n" "q (по имени/комменту)"),
 )
 async def list_(
+    response: Response,
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: str | None = CursorQuery,
+    count: CountMode | None = CountQuery,
     user_id: int | None = None,
     car_id: int | None = None,
     rating_min: int | None = Query(default=None, ge=1, le=5),
@@ -62,7 +68,7 @@ async def list_(
     q: str | None = Query(default=None, min_length=1, max_length=64),
     session: AsyncSession = Depends(get_session_without_commit),
 ):
-    return await list_reviews(
+    reviews = await list_reviews(
         session=session,
         limit=limit,
         offset=offset,
@@ -71,18 +77,36 @@ async def list_(
         rating_min=rating_min,
         rating_max=rating_max,
         q=q,
+        cursor=cursor,
     )
+    if count is not None:
+        set_total_count(
+            response,
+            await count_reviews(
+                session,
+                count,
+                user_id=user_id,
+                car_id=car_id,
+                rating_min=rating_min,
+                rating_max=rating_max,
+                q=q,
+            ),
+        )
+    await release_connection(session)
+    set_next_cursor(response, reviews, limit)
+    return reviews
 
 
 @router.get(
     "/{review_id}/details",
-    response_class=ORJSONResponse,
 )
 async def details(
     review_id: int,
     session: AsyncSession = Depends(get_session_without_commit),
 ):
-    return await get_review_details(session, review_id)
+    details = await get_review_details(session, review_id)
+    await release_connection(session)
+    return details
 
 
 @router.put(
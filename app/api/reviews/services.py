@@ -17,6 +17,7 @@ from app.api.reviews.schemas import (
     ReviewUpdate,
     ReviewUserRead,
 )
+from app.dao.base import CountMode
 from app.dao.cars import CarsDAO
 from app.dao.reviews import ReviewsDAO
 from app.dao.users import UsersDAO
@@ -68,6 +69,7 @@ async def list_reviews(
     rating_min: int | None = None,
     rating_max: int | None = None,
     q: str | None = None,
+    cursor: str | None = None,
 ) -> list[ReviewRead]:
     items = await ReviewsDAO.find_filtered(
         session,
@@ -78,6 +80,7 @@ async def list_reviews(
         q=q,
         limit=limit,
         offset=offset,
+        cursor=cursor,
     )
     if not items:
         logger.info("[reviews] По фильтрам отзывы не найдены")
@@ -86,6 +89,25 @@ async def list_reviews(
     return result
 
 
+async def count_reviews(
+    session: AsyncSession,
+    mode: CountMode,
+    user_id: int | None = None,
+    car_id: int | None = None,
+    rating_min: int | None = None,
+    rating_max: int | None = None,
+    q: str | None = None,
+) -> int:
+    conditions = ReviewsDAO.filter_conditions(
+        user_id=user_id,
+        car_id=car_id,
+        rating_min=rating_min,
+        rating_max=rating_max,
+        q=q,
+    )
+    return await ReviewsDAO.count_where(session, conditions, mode)
+
+
 async def update_review(
     session: AsyncSession,
     review_id: int,
@@ -96,20 +118,20 @@ async def update_review(
     if not values:
         logger.info("[reviews] Обновление без изменений id=%s", review_id)
         return await get_review(session, review_id)
-    updated = await ReviewsDAO.update(
+    updated = await ReviewsDAO.update_returning(
         session,
         ReviewIdFilter(id=review_id),
         data,
     )
-    if updated == 0:
+    if not updated:
         logger.warning(
             "[reviews] Отзыв не найден для обновления id=%s",
             review_id,
         )
         raise ReviewNotFoundException
-    review = await ReviewsDAO.find_one_or_none_by_id(review_id, session)
+    await session.commit()
     logger.info("[reviews] Отзыв обновлён id=%s", review_id)
-    return ReviewRead.model_validate(review)
+    return ReviewRead.model_validate(updated[0])
 
 
 async def delete_review(session: AsyncSession, review_id: int) -> None:
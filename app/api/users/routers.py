@@ -1,27 +1,33 @@
-from fastapi import APIRouter, Depends, Query, status
-from fastapi.responses import ORJSONResponse
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.auth.services import get_current_user
+from app.api.conditional import is_conditional, not_modified, set_version_headers
+from app.api.pagination import CountQuery, CursorQuery, set_next_cursor, set_total_count
+from app.api.responses import SerializedRoute
 from app.api.users.schemas import (
     UserProfileRead,
     UserRead,
     UserUpdateDb,
 )
 from app.api.users.services import (
+    example_count_users,
     example_delete_user,
-    example_get_user,
+    example_get_user_with_version,
     example_get_users,
     example_update_user,
     get_user_profile,
+    get_user_version,
 )
 from app.core.settings import APP_CONFIG
-from app.db import get_session_without_commit
+from app.dao.base import CountMode
+from app.db import get_session_without_commit, release_connection
 
 # Публичный роутер
 router = APIRouter(
     prefix=f"{APP_CONFIG.api.v1}/users",
     tags=["users"],
+    route_class=SerializedRoute,
 )
 
 #
@@ -45,16 +51,26 @@ router = APIRouter(
     summary="Получить пользователя по ID",
     description=("Возвращает данные пользователя по его уникальному идентификатору."),
     response_model=UserRead,
-    response_class=ORJSONResponse,
     status_code=status.HTTP_200_OK,
     dependencies=[Depends(get_current_user)],
 )
 async def get_user(
     user_id: int,
+    request: Request,
+    response: Response,
     session: AsyncSession = Depends(get_session_without_commit),
     # current_user=Depends(get_current_user),
 ):
-    return await example_get_user(session, user_id)
+    # без условных заголовков версия берётся из загруженного пользователя — один запрос вместо двух
+    if is_conditional(request):
+        version = await get_user_version(session, user_id)
+        if (cached := not_modified(request, response, version)) is not None:
+            await release_connection(session)
+            return cached
+    user, version = await example_get_user_with_version(session, user_id)
+    await release_connection(session)
+    set_version_headers(response, version)
+    return user
 
 
 @router.get(
@@ -64,11 +80,11 @@ async def get_user(
         "Возвращает список пользователей с возможностью фильтрации по " "статусу активности, а также с пагинацией."
     ),
     response_model=list[UserRead],
-    response_class=ORJSONResponse,
     status_code=status.HTTP_200_OK,
     dependencies=[Depends(get_current_user)],
 )
 async def get_users(
+    response: Response,
     is_active: bool | None = None,
     limit: int = Query(
         20,
@@ -77,15 +93,26 @@ async def get_users(
         description="Максимум пользователей на страницу (1-100)",
     ),
     offset: int = Query(0, ge=0, description="Смещение для пагинации"),
+    cursor: str | None = CursorQuery,
+    count: CountMode | None = CountQuery,
     session: AsyncSession = Depends(get_session_without_commit),
     # current_user=Depends(get_current_user),
 ):
-    return await example_get_users(
+    users = await example_get_users(
         session=session,
         is_active=is_active,
         limit=limit,
         offset=offset,
+        cursor=cursor,
     )
+    if count is not None:
+        set_total_count(
+            response,
+            await example_count_users(session, count, is_active=is_active),
+        )
+    await release_connection(session)
+    set_next_cursor(response, users, limit)
+    return users
 
 
 @router.put(
@@ -127,7 +154,6 @@ async def delete_user(
     summary="Профиль пользователя (агрегировано)",
     description=("Возвращает пользователя, его заказы,отзывы, авто."),
     response_model=UserProfileRead,
-    response_class=ORJSONResponse,
     status_code=status.HTTP_200_OK,
     dependencies=[Depends(get_current_user)],
 )
@@ -136,4 +162,6 @@ async def get_user_aggregate_profile(
     session: AsyncSession = Depends(get_session_without_commit),
     # current_user=Depends(get_current_user),
 ):
-    return await get_user_profile(session, user_id)
+    profile = await get_user_profile(session, user_id)
+    await release_connection(session)
+    return profile
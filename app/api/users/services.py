@@ -18,18 +18,29 @@ from app.api.users.schemas import (
     UserRead,
     UserUpdateDb,
 )
+from app.dao.base import CountMode, RecordVersion, record_version
 from app.dao.orders import OrdersDAO
 from app.dao.users import UsersDAO
 
 logger = logging.getLogger(__name__)
 
 
-async def example_get_user(session: AsyncSession, user_id: int) -> UserRead:
+async def example_get_user_with_version(session: AsyncSession, user_id: int) -> tuple[UserRead, RecordVersion]:
+    """Пользователь и его версия для ETag/Last-Modified (из загруженной записи, без отдельного запроса)."""
     user = await UsersDAO.find_one_or_none_by_id(data_id=user_id, session=session)
     if not user:
         logger.warning("[users] Пользователь не найден id=%s", user_id)
         raise UserNotFoundException
-    return UserRead.model_validate(user)
+    return UserRead.model_validate(user), record_version(user.id, user.updated_at)
+
+
+async def get_user_version(session: AsyncSession, user_id: int) -> RecordVersion:
+    """Версия пользователя для ETag/Last-Modified."""
+    version = await UsersDAO.get_version(session, user_id)
+    if version is None:
+        logger.warning("[users] Пользователь не найден id=%s", user_id)
+        raise UserNotFoundException
+    return version
 
 
 async def example_update_user(
@@ -44,8 +55,8 @@ async def example_update_user(
     )
     filter_obj = UserIdFilter(id=user_id)
     values_obj = UserUpdateDb(**user_update.model_dump(exclude_unset=True))
-    updated = await UsersDAO.update(session, filter_obj, values_obj)
-    if updated == 0:
+    updated = await UsersDAO.update_returning(session, filter_obj, values_obj)
+    if not updated:
         logger.warning(
             "[users] Пользователь не найден для обновления id=%s",
             user_id,
@@ -54,12 +65,8 @@ async def example_update_user(
 
     await session.commit()
 
-    user = await UsersDAO.find_one_or_none_by_id(user_id, session)
-    logger.info(
-        "[users] Пользователь обновлён id=%s",
-        user.id if user is not None else "unknown",
-    )
-    return UserRead.model_validate(user)
+    logger.info("[users] Пользователь обновлён id=%s", user_id)
+    return UserRead.model_validate(updated[0])
 
 
 async def example_delete_user(session: AsyncSession, user_id: int) -> None:
@@ -87,6 +94,7 @@ async def example_get_users(
     is_active: bool | None = None,
     limit: int = 20,
     offset: int = 0,
+    cursor: str | None = None,
 ) -> list[UserRead]:
     page = offset // limit + 1 if limit else 1
     filters = UserListFilter(is_active=is_active)
@@ -95,10 +103,19 @@ async def example_get_users(
         page=page,
         page_size=limit,
         filters=filters,
+        cursor=cursor,
     )
     return [UserRead.model_validate(user) for user in users]
 
 
+async def example_count_users(
+    session: AsyncSession,
+    mode: CountMode,
+    is_active: bool | None = None,
+) -> int:
+    return await UsersDAO.count(session, UserListFilter(is_active=is_active), mode)
+
+
 async def get_user_profile(
     session: AsyncSession,
     user_id: int,
@@ -1,11 +1,11 @@
+import asyncio
 import logging
 from collections.abc import AsyncGenerator
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from prometheus_fastapi_instrumentator import Instrumentator
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
@@ -16,16 +16,29 @@ from app.api.auth.routers import router as auth_router
 from app.api.car_photos.routers import router as car_photos_router
 from app.api.car_reports.routers import router as car_reports_router
 from app.api.cars.routers import router as cars_router
+from app.api.conditional import ETAG_HEADER
 from app.api.default.routers import router as default_router
 from app.api.deliveries.routers import router as deliveries_router
 from app.api.orders.routers import router as orders_router
+from app.api.pagination import NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER
 from app.api.payments.routers import router as payments_router
+from app.api.responses import SerializedJSONResponse
 from app.api.reviews.routers import router as reviews_router
 from app.api.users.routers import router as users_router
 from app.core.brokers import broker
 from app.core.logger_config import configure_logging
 from app.core.settings import APP_CONFIG, AppConfig
-from app.metrics import setup_fastapi_metrics
+from app.dao.base import InvalidCursorError
+from app.db import ReplicaMonitor
+from app.metrics import (
+    DB_QUERIES_HEADER,
+    PRIMARY_POOL,
+    REPLICA_POOL,
+    MeteredQueuePool,
+    setup_db_pool_metrics,
+    setup_db_query_metrics,
+    setup_fastapi_metrics,
+)
 
 # Настройка логирования
 # JSON логи включены для Grafana, но без дублирования
@@ -58,17 +71,57 @@ def _init_routes(app: FastAPI) -> None:
         app.include_router(router)
 
 
+def _engine_options(pool: str) -> dict:
+    """Параметры движка: MeteredQueuePool с меткой `pool` для db_pool_*, если пул не задан настройками (PgBouncer)."""
+    options = APP_CONFIG.db.engine_options()
+    if "poolclass" not in options:
+        options.update(poolclass=MeteredQueuePool, metrics_label=pool)
+    return options
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[dict, None]:
     """Управление жизненным циклом приложения."""
     logger.info("🚀 Запуск FastAPI приложения...")
 
     # Initialize database connection pool
+    replica_task: asyncio.Task | None = None
     try:
         app.state.database_pool = create_async_engine(
             str(APP_CONFIG.db.sqlalchemy_db_uri),
-            echo=APP_CONFIG.db.echo,
+            **_engine_options(PRIMARY_POOL),
+        )
+        setup_db_pool_metrics(app.state.database_pool)
+        setup_db_query_metrics(
+            app.state.database_pool,
+            slow_query_ms=APP_CONFIG.db.slow_query_ms,
+            explain=APP_CONFIG.db.slow_query_explain,
+            n_plus_one_threshold=APP_CONFIG.db.n_plus_one_threshold,
         )
+
+        replica_uri = APP_CONFIG.db.replica_db_uri
+        if replica_uri is not None:
+            app.state.replica_pool = create_async_engine(str(replica_uri), **_engine_options(REPLICA_POOL))
+            setup_db_pool_metrics(app.state.replica_pool)
+            setup_db_query_metrics(
+                app.state.replica_pool,
+                slow_query_ms=APP_CONFIG.db.slow_query_ms,
+                explain=APP_CONFIG.db.slow_query_explain,
+                n_plus_one_threshold=APP_CONFIG.db.n_plus_one_threshold,
+            )
+            app.state.replica_session_maker = async_sessionmaker(
+                app.state.replica_pool,
+                class_=AsyncSession,
+                expire_on_commit=False,
+            )
+            app.state.replica_monitor = ReplicaMonitor(
+                app.state.replica_pool,
+                max_lag=APP_CONFIG.db.replica_max_lag,
+                interval=APP_CONFIG.db.replica_check_interval,
+            )
+            await app.state.replica_monitor.check()
+            replica_task = asyncio.create_task(app.state.replica_monitor.run())
+            logger.info("✅ Read replica engine initialized")
         app.state.session_maker = async_sessionmaker(
             app.state.database_pool,
             class_=AsyncSession,
@@ -97,6 +150,11 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[dict, None]:
         logger.info("🛑 Завершение работы приложения...")
 
         # Close database connection pool
+        if replica_task is not None:
+            replica_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await replica_task
+            await app.state.replica_pool.dispose()
         try:
             await app.state.database_pool.dispose()
             logger.info("✅ Database connection pool closed successfully")
@@ -127,6 +185,7 @@ def create_app(config: AppConfig) -> FastAPI:
         openapi_url=config.api.openapi_url,
         debug=config.api.echo,
         lifespan=lifespan,
+        default_response_class=SerializedJSONResponse,
     )
 
     app_.add_middleware(
@@ -135,23 +194,31 @@ def create_app(config: AppConfig) -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER, DB_QUERIES_HEADER, ETAG_HEADER],
     )
 
-    # эндпоинт для отображения метрик для их дальнейшего сбора Прометеусом
-    instrumentator = Instrumentator(
-        should_group_status_codes=False,
-        excluded_handlers=[".*admin.*", "/metrics"],
-    )
-    instrumentator.instrument(app_).expose(
+    # Метрики fastapi_* для дашборда 16110 и эндпоинт /metrics для Прометеуса
+    setup_fastapi_metrics(
         app_,
-        include_in_schema=True,
-    )  # можно выкл
-
-    # Кастомные метрики fastapi_* для дашборда 16110 # todo: опционально
-    setup_fastapi_metrics(app_, app_name=config.api.project_name)
+        app_name=config.api.project_name,
+        max_paths=config.metrics_max_paths,
+        query_budget=config.query_budget,
+        debug=config.api.echo,
+    )
 
     _init_routes(app_)
 
+    @app_.exception_handler(InvalidCursorError)
+    async def invalid_cursor_handler(
+        request: Request,
+        exc: InvalidCursorError,
+    ) -> JSONResponse:
+        logger.warning(f"[pagination] {exc}")
+        return JSONResponse(
+            status_code=400,
+            content={"detail": str(exc)},
+        )
+
     @app_.exception_handler(Exception)
     async def http_exception_handler(
         request: Request,
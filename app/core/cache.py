@@ -0,0 +1,299 @@
+__all__ = (
+    "ENTITY_CACHE",
+    "COUNT_CACHE",
+    "CacheBackend",
+    "EntityCache",
+    "InMemoryCache",
+    "RedisCache",
+)
+
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Protocol
+
+from prometheus_client import Counter
+from sqlalchemy import event, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.core.settings import APP_CONFIG, CacheBackendType
+
+logger = logging.getLogger(__name__)
+
+ENTITY_CACHE_HITS = Counter(
+    "dao_entity_cache_hits_total",
+    "Попадания в кэш сущностей по id",
+    ["model"],
+)
+ENTITY_CACHE_MISSES = Counter(
+    "dao_entity_cache_misses_total",
+    "Промахи кэша сущностей по id",
+    ["model"],
+)
+
+# ключи session.info
+_DIRTY_KEY = "entity_cache_dirty"
+_PENDING_KEY = "entity_cache_pending"
+
+
+class CacheBackend(Protocol):
+    async def get(self, key: str) -> str | None: ...
+
+    async def get_many(self, *keys: str) -> list[str | None]: ...
+
+    async def set(self, key: str, value: str, ttl: int) -> None: ...
+
+    async def incr(self, key: str, ttl: int, amount: int = 1) -> int:
+        """Увеличить счётчик (отсутствующий считается 0) и продлить его TTL; вернуть новое значение."""
+        ...
+
+    async def delete(self, *keys: str) -> None: ...
+
+
+class InMemoryCache:
+    """LRU-кэш процесса с TTL. Не разделяется между воркерами."""
+
+    def __init__(self, max_size: int = 10_000) -> None:
+        self.max_size = max_size
+        self._data: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+    async def get(self, key: str) -> str | None:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    async def get_many(self, *keys: str) -> list[str | None]:
+        return [await self.get(key) for key in keys]
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    async def incr(self, key: str, ttl: int, amount: int = 1) -> int:
+        value = int(await self.get(key) or 0) + amount
+        await self.set(key, str(value), ttl)
+        return value
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._data.pop(key, None)
+
+
+class RedisCache:
+    """Общий кэш в Redis (нужен пакет `redis`)."""
+
+    def __init__(self, url: str) -> None:
+        try:
+            from redis.asyncio import Redis
+        except ImportError as e:
+            raise RuntimeError("Для CACHE__BACKEND=redis установите пакет redis") from e
+        self._client = Redis.from_url(url, decode_responses=True)
+
+    async def get(self, key: str) -> str | None:
+        return await self._client.get(key)
+
+    async def get_many(self, *keys: str) -> list[str | None]:
+        return await self._client.mget(keys)
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        await self._client.set(key, value, ex=ttl)
+
+    async def incr(self, key: str, ttl: int, amount: int = 1) -> int:
+        async with self._client.pipeline(transaction=True) as pipe:
+            value, _ = await pipe.incrby(key, amount).expire(key, ttl).execute()
+        return value
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self._client.delete(*keys)
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def _python_type(attr) -> type | None:
+    try:
+        return attr.columns[0].type.python_type
+    except NotImplementedError:
+        return None
+
+
+def _decode(value: Any, python_type: type | None) -> Any:
+    if value is None or python_type is None:
+        return value
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    if python_type is Decimal:
+        return Decimal(value)
+    if issubclass(python_type, Enum):
+        return python_type(value)
+    return value
+
+
+class EntityCache:
+    """Read-through кэш ORM-сущностей по id поверх `CacheBackend`.
+
+    Хранит только колонки (без связей) в JSON под ключом `<таблица>:<id>` вместе
+    с поколением записи — счётчиком под ключом `<таблица>:<id>:gen`. Изменение
+    увеличивает поколение сразу и ещё раз после коммита или отката. Читатель
+    запоминает поколение до запроса в БД и пишет им загруженную строку, поэтому
+    версия, прочитанная до чужого коммита и записанная после него, уже не
+    совпадает с текущим поколением и не отдаётся. Сессия с незакоммиченными
+    изменениями в кэш не пишет и из него не читает.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: int = 60) -> None:
+        self.backend = backend
+        self.ttl = ttl
+        self._tasks: set[asyncio.Task] = set()
+        event.listen(Session, "after_flush", self._after_flush)
+        event.listen(Session, "after_commit", self._after_commit)
+        event.listen(Session, "after_rollback", self._after_rollback)
+
+    @staticmethod
+    def key(model: type, record_id: Any) -> str:
+        return f"{model.__tablename__}:{record_id}"
+
+    @staticmethod
+    def generation_key(key: str) -> str:
+        return f"{key}:gen"
+
+    @property
+    def generation_ttl(self) -> int:
+        # поколение продлевается при каждой записи и живёт дольше любого значения, записанного с ним
+        return 2 * self.ttl
+
+    async def get(self, session: AsyncSession, model: type, record_id: Any) -> tuple[Any | None, int | None]:
+        """Достать сущность из кэша и привязать её к сессии без запроса в БД.
+
+        Возвращает (сущность или None, текущее поколение). Поколение передаётся в `set`
+        вместе со строкой, прочитанной из БД после промаха; None — писать в кэш нельзя.
+        """
+        if session.info.get(_DIRTY_KEY):
+            # сессия уже что-то меняла — читаем из БД, чтобы видеть свои изменения
+            return None, None
+        key = self.key(model, record_id)
+        try:
+            raw, generation = await self.backend.get_many(key, self.generation_key(key))
+        except Exception as e:
+            logger.warning(f"Кэш недоступен: {e}")
+            return None, None
+        current = int(generation or 0)
+        cached = json.loads(raw) if raw is not None and generation is not None else None
+        if cached is None or cached["gen"] != current:
+            # нет записи, она от поколения до последнего изменения или поколение вытеснено раньше неё
+            ENTITY_CACHE_MISSES.labels(model=model.__name__).inc()
+            return None, current
+        ENTITY_CACHE_HITS.labels(model=model.__name__).inc()
+
+        data = cached["data"]
+        attrs = inspect(model).column_attrs
+        record = model(**{attr.key: _decode(data[attr.key], _python_type(attr)) for attr in attrs if attr.key in data})
+        make_transient_to_detached(record)
+        return await session.merge(record, load=False), current
+
+    async def set(self, session: AsyncSession, record: Any, generation: int | None) -> None:
+        """Положить сущность в кэш с поколением, полученным от `get` до запроса в БД.
+
+        Не пишет, если сессия меняла данные в текущей транзакции или запись успели изменить.
+        """
+        if generation is None or session.info.get(_DIRTY_KEY) or session.new or session.dirty or session.deleted:
+            # запись может содержать незакоммиченные изменения — в общий кэш её нельзя
+            return
+        key = self.key(type(record), record.id)
+        state = inspect(record)
+        data = {attr.key: _encode(state.dict[attr.key]) for attr in state.mapper.column_attrs if attr.key in state.dict}
+        try:
+            # +0: продлить поколение (или завести его) и заодно проверить, что изменений не было
+            if await self.backend.incr(self.generation_key(key), self.generation_ttl, amount=0) != generation:
+                return
+            await self.backend.set(key, json.dumps({"gen": generation, "data": data}), self.ttl)
+        except Exception as e:
+            logger.warning(f"Не удалось записать в кэш: {e}")
+
+    async def invalidate(self, session: AsyncSession, model: type, ids) -> None:
+        """Сменить поколение записей по id и пометить сессию как изменившую данные."""
+        keys = [self.key(model, record_id) for record_id in ids]
+        session.info[_DIRTY_KEY] = True
+        if not keys:
+            return
+        session.info.setdefault(_PENDING_KEY, set()).update(keys)
+        await self._bump(keys)
+
+    async def _bump(self, keys) -> None:
+        try:
+            for key in keys:
+                await self.backend.incr(self.generation_key(key), self.generation_ttl)
+        except Exception as e:
+            logger.warning(f"Не удалось инвалидировать кэш: {e}")
+
+    def _after_flush(self, session: Session, flush_context: Any) -> None:
+        # изменения через ORM в обход DAO тоже помечают сессию и сбрасываются после транзакции
+        changed = [*session.new, *session.dirty, *session.deleted]
+        if not changed:
+            return
+        session.info[_DIRTY_KEY] = True
+        session.info.setdefault(_PENDING_KEY, set()).update(
+            self.key(type(obj), obj.id) for obj in changed if getattr(obj, "id", None) is not None
+        )
+
+    def _after_commit(self, session: Session) -> None:
+        self._finish_transaction(session)
+
+    def _after_rollback(self, session: Session) -> None:
+        # после отката тоже удаляем: в кэш могла попасть версия, видимая только этой транзакции
+        self._finish_transaction(session)
+
+    def _finish_transaction(self, session: Session) -> None:
+        keys = session.info.pop(_PENDING_KEY, None)
+        session.info.pop(_DIRTY_KEY, None)
+        if not keys:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(self._bump(list(keys)))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+
+def _build_entity_cache() -> EntityCache | None:
+    config = APP_CONFIG.cache
+    if not config.enabled:
+        return None
+    if config.backend is CacheBackendType.redis:
+        backend: CacheBackend = RedisCache(config.redis_url)
+    else:
+        backend = InMemoryCache(config.max_size)
+    logger.info(f"Кэш сущностей включён: backend={config.backend}, ttl={config.ttl}s")
+    return EntityCache(backend, ttl=config.ttl)
+
+
+ENTITY_CACHE = _build_entity_cache()
+
+# кэш точных COUNT для CountMode.cached: общий backend кэша сущностей, если он включён
+COUNT_CACHE: CacheBackend = ENTITY_CACHE.backend if ENTITY_CACHE is not None else InMemoryCache(1_000)
@@ -1,9 +1,11 @@
 from enum import StrEnum, unique
+from uuid import uuid4
 
 from dotenv import find_dotenv
 from pydantic import BaseModel, HttpUrl, PostgresDsn, computed_field
 from pydantic_core import MultiHostUrl
 from pydantic_settings import BaseSettings, SettingsConfigDict
+from sqlalchemy.pool import NullPool
 
 
 class Config(BaseSettings):
@@ -15,6 +17,10 @@ class Config(BaseSettings):
     )
 
 
+def _unique_statement_name() -> str:
+    return f"__asyncpg_{uuid4()}__"
+
+
 @unique
 class Environments(StrEnum):
     local = "local"
@@ -32,8 +38,71 @@ class DbConfig(Config):
     port: int  # = 5432
     name: str  # = ""
 
-    max_size: int = 1
-    echo: bool = True
+    echo: bool = False
+    # SQL дольше N мс логируются с параметрами (0 — не логировать)
+    slow_query_ms: float = 500
+    # для медленных SELECT в фоне снимать и логировать EXPLAIN (ANALYZE, BUFFERS)
+    slow_query_explain: bool = False
+    # один и тот же SQL N раз за HTTP-запрос — предупреждение о возможном N+1
+    n_plus_one_threshold: int = 5
+
+    # Пул соединений на процесс: всего до pool_size + max_overflow соединений.
+    # Суммарно на БД: (pool_size + max_overflow) * WORKERS * число реплик (HPA maxReplicas)
+    pool_size: int = 5
+    max_overflow: int = 10
+    # сколько секунд ждать свободное соединение, потом TimeoutError
+    pool_timeout: float = 30
+    # пересоздавать соединения старше N секунд (-1 — никогда)
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+
+    # asyncpg: кэш подготовленных выражений на соединение и таймаут команды (сек)
+    statement_cache_size: int = 100
+    command_timeout: float | None = 60
+
+    # Подключение через PgBouncer в режиме pool_mode=transaction:
+    # без кэша prepared statements, уникальные имена выражений, NullPool
+    pgbouncer: bool = False
+
+    # Реплика для чтения (GET). Не задан host — всё идёт в primary
+    replica_host: str | None = None
+    replica_port: int | None = None
+    # реплика с отставанием больше N секунд или недоступная не используется
+    replica_max_lag: float = 5
+    replica_check_interval: float = 2
+    # после записи клиент читает из primary ещё N секунд (read-your-writes)
+    replica_sticky_seconds: int = 5
+
+    def connect_args(self) -> dict:
+        """Аргументы подключения asyncpg (общие для приложения и Alembic)."""
+        if self.pgbouncer:
+            # соединение с сервером меняется от транзакции к транзакции,
+            # поэтому именованные prepared statements переиспользовать нельзя
+            return {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": _unique_statement_name,
+                "command_timeout": self.command_timeout,
+            }
+        return {
+            "statement_cache_size": self.statement_cache_size,
+            "command_timeout": self.command_timeout,
+        }
+
+    def engine_options(self) -> dict:
+        """Параметры `create_async_engine` для пула и драйвера asyncpg."""
+        if self.pgbouncer:
+            # пулом управляет PgBouncer
+            return {"echo": self.echo, "poolclass": NullPool, "connect_args": self.connect_args()}
+        return {
+            "echo": self.echo,
+            "pool_size": self.pool_size,
+            "max_overflow": self.max_overflow,
+            "pool_timeout": self.pool_timeout,
+            "pool_recycle": self.pool_recycle,
+            "pool_pre_ping": self.pool_pre_ping,
+            "connect_args": self.connect_args(),
+        }
 
     @computed_field  # type: ignore[prop-decorator]
     @property
@@ -49,6 +118,20 @@ class DbConfig(Config):
 
         return PostgresDsn(str(multi_host_url))
 
+    @property
+    def replica_db_uri(self) -> PostgresDsn | None:
+        if not self.replica_host:
+            return None
+        multi_host_url = MultiHostUrl.build(
+            scheme="postgresql+asyncpg",
+            username=self.user,
+            password=self.password,
+            host=self.replica_host,
+            port=self.replica_port or self.port,
+            path=self.name,
+        )
+        return PostgresDsn(str(multi_host_url))
+
 
 class Api(BaseModel):
     project_name: str = "Rental_Car"
@@ -66,6 +149,28 @@ class FaststreamConfig(Config):
     model_config = SettingsConfigDict(env_prefix="FS__")
 
 
+@unique
+class CacheBackendType(StrEnum):
+    memory = "memory"
+    redis = "redis"
+
+
+class CacheConfig(Config):
+    model_config = SettingsConfigDict(env_prefix="CACHE__")
+
+    # кэш сущностей по id для DAO с cacheable = True
+    enabled: bool = False
+    backend: CacheBackendType = CacheBackendType.memory
+    ttl: int = 60
+    # размер LRU для backend=memory
+    max_size: int = 10_000
+    redis_url: str = "redis://localhost:6379/0"
+    # TTL для count_mode=cached (X-Total-Count)
+    count_ttl: int = 30
+    # TTL ответа GET /v1/cars/facets
+    facets_ttl: int = 30
+
+
 class AppConfig(Config):
     sentry_dsn: HttpUrl | None = None
     # true = цветной вывод в консоль; false = обычная консоль
@@ -73,6 +178,10 @@ class AppConfig(Config):
     # true = логи HTTP запросов
     # false = без HTTP логов
     enable_http_logs: bool = True
+    # максимум шаблонов маршрутов в label path метрик fastapi_*; остальные идут в path=other
+    metrics_max_paths: int = 200
+    # больше N SQL-запросов на HTTP-запрос — предупреждение в лог
+    query_budget: int = 30
     app_host: str
     app_port: int
     workers: int
@@ -89,6 +198,7 @@ class AppConfig(Config):
     jwt_algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
     faststream: FaststreamConfig = FaststreamConfig()  # type: ignore
+    cache: CacheConfig = CacheConfig()
 
 
 APP_CONFIG = AppConfig()  # type: ignore
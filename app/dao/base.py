@@ -1,24 +1,284 @@
+import base64
+import binascii
+import hashlib
+import inspect
+import json
 import logging
-from collections.abc import Sequence
-from typing import Any, Generic, TypeVar
+from collections.abc import AsyncIterator, Awaitable, Callable, Sequence
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from enum import Enum, StrEnum, unique
+from functools import wraps
+from typing import Any, Generic, NamedTuple, TypeVar
 
 from pydantic import BaseModel, EmailStr, HttpUrl
+from sqlalchemy import (
+    JSON,
+    Column,
+    ColumnElement,
+    Numeric,
+    RowMapping,
+    Select,
+    asc,
+    bindparam,
+    desc,
+    func,
+    insert,
+    literal_column,
+    text,
+    tuple_,
+)
 from sqlalchemy import delete as sqlalchemy_delete
-from sqlalchemy import func
 from sqlalchemy import update as sqlalchemy_update
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.orm import InstrumentedAttribute
 
+from app.core.cache import COUNT_CACHE, ENTITY_CACHE
+from app.core.settings import APP_CONFIG
 from app.db import Base
+from app.metrics import DAO_CALL
 
 logger = logging.getLogger(__name__)
 
 T = TypeVar("T", bound=Base)
 
+# ключ session.info, под которым живёт DataLoader запроса (app.dao.loader)
+LOADER_INFO_KEY = "dataloader"
+
+
+class InvalidCursorError(ValueError):
+    """Курсор пагинации повреждён или не подходит к текущей сортировке."""
+
+
+@unique
+class CountMode(StrEnum):
+    # точный COUNT(*)
+    exact = "exact"
+    # оценка планировщика: pg_class.reltuples или EXPLAIN для запроса с фильтрами
+    estimated = "estimated"
+    # точный COUNT(*), закэшированный на CACHE__COUNT_TTL секунд
+    cached = "cached"
+
+
+class RecordVersion(NamedTuple):
+    """Версия записи для условных GET: тег для ETag и время изменения для Last-Modified."""
+
+    tag: str
+    # None — у агрегата нет единого времени изменения
+    updated_at: datetime | None
+
+
+def record_version(data_id: int, updated_at: datetime) -> RecordVersion:
+    """Версия записи по её updated_at — та же, что отдаёт BaseDAO.get_version без связей."""
+    return RecordVersion(f"{data_id}-{updated_at.strftime('%Y%m%d%H%M%S%f')}", updated_at)
+
+
+def _row_version(table: Any) -> ColumnElement[str]:
+    # xmin — id транзакции, последней записавшей строку; меняется при каждом UPDATE
+    return func.concat(table.c.id, ":", literal_column(f"{table.name}.xmin"))
+
+
+def convert_value(v: Any) -> Any:
+    """Привести pydantic-типы (EmailStr, HttpUrl) к значениям для БД."""
+    if isinstance(v, EmailStr):
+        return str(v)
+    if isinstance(v, HttpUrl):
+        return str(v)
+    # Можно добавить сюда другие кастомные типы при необходимости
+    return v
+
+
+def unnest_rows(table: Any, columns: Sequence[str], rows: Sequence[Sequence[Any]], name: str = "v") -> Any:
+    """Строки как `unnest(...) AS name(columns)`: по параметру-массиву на колонку с её типом.
+
+    Текст запроса не зависит от числа строк, поэтому asyncpg готовит его один раз,
+    а NULL во всей колонке сохраняет тип колонки (в отличие от VALUES).
+    """
+    by_column = list(zip(*rows)) if rows else [()] * len(columns)
+    arrays = [
+        bindparam(f"p_{column_name}", list(column_values), type_=ARRAY(table.c[column_name].type))
+        for column_name, column_values in zip(columns, by_column, strict=True)
+    ]
+    return func.unnest(*arrays).table_valued(*columns).render_derived(name=name)
+
+
+def _sort_direction(sort_key: str | None, sort_dir: str | None) -> str | None:
+    # направление имеет смысл только при ключе сортировки; как в apply_ordering, всё кроме asc — desc
+    if sort_key is None:
+        return None
+    return "asc" if sort_dir == "asc" else "desc"
+
+
+def encode_cursor(item: Any, sort_by: str | None = None, sort_dir: str | None = "desc") -> str:
+    """Закодировать позицию записи в непрозрачный курсор.
+
+    Курсор хранит значение ключа сортировки, id (tie-breaker), а также сам ключ
+    и направление сортировки — чтобы курсор нельзя было применить к другой сортировке.
+    Подходит как ORM-объект, так и Read-схема с теми же атрибутами.
+    """
+    sort_key = sort_by if sort_by and hasattr(item, sort_by) else None
+    value = getattr(item, sort_key) if sort_key else None
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    elif value is not None and not isinstance(value, (int, str)):
+        value = str(value)
+    payload = json.dumps(
+        {"v": value, "id": item.id, "s": sort_key, "d": _sort_direction(sort_key, sort_dir)},
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[Any, int, str | None, str | None]:
+    """Раскодировать курсор в (значение ключа сортировки, id, ключ сортировки, направление)."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return payload["v"], int(payload["id"]), payload.get("s"), payload.get("d")
+    except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError, AttributeError) as e:
+        raise InvalidCursorError("Некорректный курсор пагинации") from e
+
+
+def _instrumented(name: str, func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    """Пометить SQL метода DAO для метрик db_query_* (учитывается самый внешний вызов)."""
+
+    @wraps(func)
+    async def wrapper(cls, *args: Any, **kwargs: Any) -> Any:
+        if DAO_CALL.get() is not None:
+            return await func(cls, *args, **kwargs)
+        token = DAO_CALL.set((cls.__name__, name))
+        try:
+            return await func(cls, *args, **kwargs)
+        finally:
+            DAO_CALL.reset(token)
+
+    return wrapper
+
+
+def _instrumented_stream(name: str, func: Callable[..., AsyncIterator[Any]]) -> Callable[..., AsyncIterator[Any]]:
+    """То же для методов-генераторов: метка ставится на каждый шаг, а не на весь обход.
+
+    Между шагами код потребителя работает со своим DAO_CALL (например, запросы
+    обработчика во время выгрузки не попадают в метрики stream).
+    """
+
+    @wraps(func)
+    async def wrapper(cls, *args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+        call = (cls.__name__, name)
+        iterator = func(cls, *args, **kwargs)
+        try:
+            while True:
+                token = DAO_CALL.set(DAO_CALL.get() or call)
+                try:
+                    item = await anext(iterator)
+                except StopAsyncIteration:
+                    return
+                finally:
+                    DAO_CALL.reset(token)
+                yield item
+        finally:
+            # закрытие серверного курсора при досрочном выходе — тоже SQL метода
+            token = DAO_CALL.set(DAO_CALL.get() or call)
+            try:
+                await iterator.aclose()
+            finally:
+                DAO_CALL.reset(token)
+
+    return wrapper
+
+
+def _instrument_methods(dao: type) -> None:
+    for name, attr in list(vars(dao).items()):
+        if not isinstance(attr, classmethod):
+            continue
+        if inspect.iscoroutinefunction(attr.__func__):
+            setattr(dao, name, classmethod(_instrumented(name, attr.__func__)))
+        elif inspect.isasyncgenfunction(attr.__func__):
+            setattr(dao, name, classmethod(_instrumented_stream(name, attr.__func__)))
+
 
 class BaseDAO(Generic[T]):
     model: type[T]
+    # кэшировать find_one_or_none_by_id (если кэш включён в настройках)
+    cacheable: bool = False
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        _instrument_methods(cls)
+
+    @classmethod
+    async def invalidate_cache(cls, session: AsyncSession, ids) -> None:
+        """Сбросить кэш сущностей и память DataLoader по id после изменения записей."""
+        loader = session.info.get(LOADER_INFO_KEY)
+        if loader is not None:
+            loader.forget(cls, ids)
+        if cls.cacheable and ENTITY_CACHE is not None:
+            await ENTITY_CACHE.invalidate(session, cls.model, ids)
+
+    @classmethod
+    def apply_ordering(
+        cls,
+        query: Select,
+        sort_column: InstrumentedAttribute | None = None,
+        sort_dir: str | None = "desc",
+    ) -> Select:
+        """Отсортировать по `sort_column` (если задан) с добивкой по id."""
+        id_column = cls.model.id
+        if sort_column is None:
+            return query.order_by(asc(id_column))
+        if sort_dir != "asc":
+            return query.order_by(desc(sort_column), desc(id_column))
+        return query.order_by(asc(sort_column), asc(id_column))
+
+    @classmethod
+    def apply_pagination(
+        cls,
+        query: Select,
+        *,
+        limit: int,
+        offset: int = 0,
+        cursor: str | None = None,
+        sort_column: InstrumentedAttribute | None = None,
+        sort_dir: str | None = "desc",
+    ) -> Select:
+        """Добавить к запросу детерминированную сортировку и страницу.
+
+        Без курсора используется OFFSET/LIMIT. С курсором — keyset-условие
+        `(sort_column, id) < / > (value, id)`, стоимость которого не зависит
+        от глубины страницы. Если `sort_column` не задан, сортировка по id.
+        """
+        id_column = cls.model.id
+        descending = sort_column is not None and sort_dir != "asc"
+        query = cls.apply_ordering(query, sort_column, sort_dir)
+
+        if cursor is None:
+            return query.offset(offset).limit(limit)
+
+        raw_value, last_id, cursor_key, cursor_dir = decode_cursor(cursor)
+        sort_key = sort_column.key if sort_column is not None else None
+        if (cursor_key, cursor_dir) != (sort_key, _sort_direction(sort_key, sort_dir)):
+            raise InvalidCursorError("Курсор выдан для другой сортировки")
+        if sort_column is None:
+            return query.where(id_column > last_id).limit(limit)
+
+        if raw_value is None:
+            raise InvalidCursorError("Курсор не содержит значения ключа сортировки")
+        try:
+            python_type = sort_column.type.python_type
+            if issubclass(python_type, datetime):
+                value = datetime.fromisoformat(raw_value)
+            else:
+                value = python_type(raw_value)
+        except (ValueError, TypeError, NotImplementedError, InvalidOperation) as e:
+            raise InvalidCursorError("Курсор не подходит к текущей сортировке") from e
+
+        key = tuple_(sort_column, id_column)
+        bound = tuple_(value, last_id)
+        return query.where(key < bound if descending else key > bound).limit(limit)
 
     @classmethod
     async def find_one_or_none_by_id(
@@ -27,12 +287,21 @@ class BaseDAO(Generic[T]):
         session: AsyncSession,
     ) -> T | None:
         logger.info(f"Поиск {cls.model.__name__} с ID: {data_id}")
+        cache = ENTITY_CACHE if cls.uses_entity_cache() else None
+        generation = None
+        if cache is not None:
+            record, generation = await cache.get(session, cls.model, data_id)
+            if record is not None:
+                logger.info(f"Запись с ID {data_id} найдена в кэше.")
+                return record
         try:
             query = select(cls.model).filter_by(id=data_id)
             result = await session.execute(query)
             record = result.scalar_one_or_none()
             if record:
                 logger.info(f"Запись с ID {data_id} найдена.")
+                if cache is not None:
+                    await cache.set(session, record, generation)
             else:
                 logger.info(f"Запись с ID {data_id} не найдена.")
             return record
@@ -40,6 +309,77 @@ class BaseDAO(Generic[T]):
             logger.error(f"Ошибка при поиске записи с ID {data_id}: {e}")
             raise
 
+    @classmethod
+    def uses_entity_cache(cls) -> bool:
+        """Идёт ли find_one_or_none_by_id через кэш сущностей (DAO cacheable и кэш включён)."""
+        return cls.cacheable and ENTITY_CACHE is not None
+
+    @classmethod
+    def columns_for(cls, schema: type[BaseModel]) -> list[Column]:
+        """Колонки таблицы под поля схемы ответа — для чтения через Core без ORM."""
+        table = cls.model.__table__
+        return [table.c[name] for name in schema.model_fields]
+
+    @classmethod
+    async def find_row_by_id(
+        cls,
+        session: AsyncSession,
+        data_id: int,
+        schema: type[BaseModel],
+    ) -> RowMapping | None:
+        """Строка по id только с колонками `schema`, без ORM-объекта и identity map.
+
+        Кэш сущностей не используется: для cacheable DAO при включённом кэше
+        по id дешевле читать через find_one_or_none_by_id.
+        """
+        query = select(*cls.columns_for(schema)).where(cls.model.__table__.c.id == data_id)
+        try:
+            result = await session.execute(query)
+            return result.mappings().one_or_none()
+        except SQLAlchemyError as e:
+            logger.error(f"Ошибка при поиске записи с ID {data_id}: {e}")
+            raise
+
+    @classmethod
+    async def get_version(
+        cls,
+        session: AsyncSession,
+        data_id: int,
+        relations: Sequence[InstrumentedAttribute] = (),
+    ) -> RecordVersion | None:
+        """Версия записи одним запросом по первичному ключу, без загрузки самих данных.
+
+        Без `relations` версия — `updated_at` записи. Для агрегата со связями
+        (`Car.photos`, `Order.user`, ...) и для моделей без `updated_at` — md5 по
+        (id, xmin) корня и всех связанных строк: меняется при любом INSERT/UPDATE/DELETE
+        в них. None — записи нет.
+        """
+        table = cls.model.__table__
+        updated_at = table.c.get("updated_at")
+        if updated_at is not None and not relations:
+            query = select(updated_at).where(table.c.id == data_id)
+        else:
+            parts = [_row_version(table)]
+            for relation in relations:
+                prop = relation.property
+                remote = prop.mapper.local_table
+                ((local_column, remote_column),) = prop.local_remote_pairs
+                rows = func.string_agg(_row_version(remote), aggregate_order_by(literal_column("','"), remote.c.id))
+                # пустая связь — пустая строка, чтобы части не сдвигались в concat_ws
+                parts.append(func.coalesce(select(rows).where(remote_column == local_column).scalar_subquery(), ""))
+            query = select(func.md5(func.concat_ws("|", *parts))).where(table.c.id == data_id)
+        try:
+            result = await session.execute(query)
+            row = result.one_or_none()
+        except SQLAlchemyError as e:
+            logger.error(f"Ошибка при чтении версии записи с ID {data_id}: {e}")
+            raise
+        if row is None:
+            return None
+        if isinstance(row[0], datetime):
+            return record_version(data_id, row[0])
+        return RecordVersion(row[0], None)
+
     @classmethod
     async def find_one_or_none(
         cls,
@@ -100,6 +440,28 @@ class BaseDAO(Generic[T]):
             )
             raise
 
+    @classmethod
+    async def stream(
+        cls,
+        session: AsyncSession,
+        query: Select | None = None,
+        yield_per: int = 1000,
+    ) -> AsyncIterator[T]:
+        """Отдавать записи по одной через серверный курсор.
+
+        В памяти держится не больше `yield_per` строк, поэтому подходит
+        для выгрузок произвольного размера.
+        """
+        query = select(cls.model) if query is None else query
+        logger.info(f"Потоковое чтение {cls.model.__name__}, yield_per={yield_per}")
+        try:
+            result = await session.stream_scalars(query.execution_options(yield_per=yield_per))
+            async for record in result:
+                yield record
+        except SQLAlchemyError as e:
+            logger.error(f"Ошибка при потоковом чтении записей: {e}")
+            raise
+
     @classmethod
     async def add(cls, session: AsyncSession, values: BaseModel) -> T:
         values_dict = values.model_dump(exclude_unset=True)
@@ -128,7 +490,15 @@ class BaseDAO(Generic[T]):
         session: AsyncSession,
         instances: Sequence[BaseModel],
     ) -> list[T]:
-        values_list = [item.model_dump(exclude_unset=True) for item in instances]
+        """Добавить записи через ORM и вернуть их объектами сессии.
+
+        Остаётся на ORM ради контракта: объекты попадают в identity map и дальше
+        меняются через flush. Загрузка данных без объектов — `insert_many` (нужны id)
+        или `copy_many` (не нужны); импорт авто — `CarsDAO.insert_skip_existing_vin`.
+        """
+        values_list = [
+            {k: convert_value(v) for k, v in item.model_dump(exclude_unset=True).items()} for item in instances
+        ]
         logger.info(
             f"Добавление нескольких записей {cls.model.__name__}. Количество: {len(values_list)}",
         )
@@ -143,6 +513,116 @@ class BaseDAO(Generic[T]):
             raise e
         return new_instances
 
+    @classmethod
+    async def insert_many(
+        cls,
+        session: AsyncSession,
+        instances: Sequence[BaseModel],
+        chunk_size: int = 1000,
+    ) -> list[int]:
+        """Быстрая массовая вставка через Core без создания ORM-объектов.
+
+        Пачки по `chunk_size` уходят многострочным `INSERT ... RETURNING id`.
+        Возвращает id в порядке входных данных.
+        """
+        values_list = [
+            {k: convert_value(v) for k, v in item.model_dump(exclude_unset=True).items()} for item in instances
+        ]
+        logger.info(
+            f"Массовая вставка {cls.model.__name__} (Core). Количество: {len(values_list)}",
+        )
+        table = cls.model.__table__
+        # executemany требует одинаковый набор ключей — группируем по нему
+        groups: dict[tuple[str, ...], list[int]] = {}
+        for index, row in enumerate(values_list):
+            groups.setdefault(tuple(sorted(row)), []).append(index)
+
+        ids: list[int] = [0] * len(values_list)
+        stmt = insert(table).returning(table.c.id, sort_by_parameter_order=True)
+        try:
+            for indices in groups.values():
+                for start in range(0, len(indices), chunk_size):
+                    chunk = indices[start : start + chunk_size]
+                    result = await session.execute(
+                        stmt,
+                        [values_list[i] for i in chunk],
+                        execution_options={"insertmanyvalues_page_size": chunk_size},
+                    )
+                    for index, new_id in zip(chunk, result.scalars().all(), strict=True):
+                        ids[index] = new_id
+            logger.info(f"Успешно вставлено {len(ids)} записей.")
+        except SQLAlchemyError as e:
+            await session.rollback()
+            logger.error(f"Ошибка при массовой вставке записей: {e}")
+            raise e
+        return ids
+
+    @classmethod
+    async def copy_many(
+        cls,
+        session: AsyncSession,
+        instances: Sequence[BaseModel],
+    ) -> int:
+        """Массовая вставка через asyncpg COPY, когда id новых записей не нужны.
+
+        Работает в транзакции сессии. Python-дефолты колонок (`default=`)
+        подставляются здесь; серверные (`server_default`) срабатывают только
+        для колонок, которых нет ни в одной записи.
+        """
+        values_list = [
+            {k: convert_value(v) for k, v in item.model_dump(exclude_unset=True).items()} for item in instances
+        ]
+        if not values_list:
+            return 0
+        logger.info(
+            f"Массовая вставка {cls.model.__name__} (COPY). Количество: {len(values_list)}",
+        )
+        table = cls.model.__table__
+        passed = set().union(*values_list)
+        columns = [
+            col
+            for col in table.columns
+            if col.name in passed or (col.default is not None and col.default.is_scalar and not col.primary_key)
+        ]
+
+        def copy_value(col, row: dict[str, Any]) -> Any:
+            if col.name in row:
+                value = row[col.name]
+            elif col.default is not None and col.default.is_scalar:
+                value = col.default.arg
+            else:
+                return None
+            if value is None:
+                return None
+            if isinstance(value, Enum):
+                return value.value
+            if isinstance(col.type, Numeric) and not isinstance(value, Decimal):
+                return Decimal(str(value))
+            if isinstance(col.type, JSON):
+                return json.dumps(value)
+            return value
+
+        records = [tuple(copy_value(col, row) for col in columns) for row in values_list]
+        try:
+            connection = await session.connection()
+            raw_connection = await connection.get_raw_connection()
+            driver_connection = raw_connection.driver_connection
+            if not driver_connection.is_in_transaction():
+                # asyncpg-адаптер открывает BEGIN лениво, на первом запросе
+                await connection.execute(select(1))
+            await driver_connection.copy_records_to_table(
+                table.name,
+                records=records,
+                columns=[col.name for col in columns],
+                schema_name=table.schema,
+            )
+            logger.info(f"Успешно скопировано {len(records)} записей.")
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Ошибка при COPY записей: {e}")
+            raise e
+        return len(records)
+
     @classmethod
     async def update(
         cls,
@@ -154,14 +634,6 @@ class BaseDAO(Generic[T]):
         values_dict = values.model_dump(exclude_unset=True)
 
         # Универсальное преобразование значений в values_dict
-        def convert_value(v):
-            if isinstance(v, EmailStr):
-                return str(v)
-            if isinstance(v, HttpUrl):
-                return str(v)
-            # Можно добавить сюда другие кастомные типы при необходимости
-            return v
-
         values_dict = {k: convert_value(v) for k, v in values_dict.items()}
 
         logger.info(
@@ -173,13 +645,58 @@ class BaseDAO(Generic[T]):
                 *[getattr(cls.model, k) == v for k, v in filter_dict.items()],
             )
             .values(**values_dict)
+            .returning(cls.model.id)
             .execution_options(synchronize_session="fetch")
         )
         try:
             result = await session.execute(query)
+            ids = result.scalars().all()
             await session.flush()
-            logger.info(f"Обновлено {result.rowcount} записей.")
-            return result.rowcount
+            await cls.invalidate_cache(session, ids)
+            logger.info(f"Обновлено {len(ids)} записей.")
+            return len(ids)
+        except SQLAlchemyError as e:
+            await session.rollback()
+            logger.error(f"Ошибка при обновлении записей: {e}")
+            raise e
+
+    @classmethod
+    async def update_returning(
+        cls,
+        session: AsyncSession,
+        filters: BaseModel,
+        values: BaseModel,
+    ) -> list[T]:
+        """Обновить записи и вернуть их одним `UPDATE ... RETURNING`.
+
+        В отличие от `update`, не нужен повторный SELECT для ответа:
+        объекты в сессии обновляются значениями из RETURNING.
+        """
+        filter_dict = filters.model_dump(exclude_unset=True)
+        values_dict = {k: convert_value(v) for k, v in values.model_dump(exclude_unset=True).items()}
+        conditions = [getattr(cls.model, k) == v for k, v in filter_dict.items()]
+
+        logger.info(
+            f"Обновление записей {cls.model.__name__} по фильтру: {filter_dict} с параметрами: {values_dict}",
+        )
+        if not values_dict:
+            # обновлять нечего — вернуть текущие записи
+            result = await session.execute(select(cls.model).where(*conditions))
+            return list(result.scalars().all())
+
+        query = (
+            sqlalchemy_update(cls.model)
+            .where(*conditions)
+            .values(**values_dict)
+            .returning(cls.model)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        try:
+            result = await session.execute(query)
+            records = list(result.scalars().all())
+            await cls.invalidate_cache(session, [record.id for record in records])
+            logger.info(f"Обновлено {len(records)} записей.")
+            return records
         except SQLAlchemyError as e:
             await session.rollback()
             logger.error(f"Ошибка при обновлении записей: {e}")
@@ -195,25 +712,64 @@ class BaseDAO(Generic[T]):
             logger.error("Нужен хотя бы один фильтр для удаления.")
             raise ValueError("Нужен хотя бы один фильтр для удаления.")
 
-        query = sqlalchemy_delete(cls.model).filter_by(**filter_dict)
+        query = sqlalchemy_delete(cls.model).filter_by(**filter_dict).returning(cls.model.id)
         try:
             result = await session.execute(query)
+            ids = result.scalars().all()
             await session.flush()
-            logger.info(f"Удалено {result.rowcount} записей.")
-            return result.rowcount
+            await cls.invalidate_cache(session, ids)
+            logger.info(f"Удалено {len(ids)} записей.")
+            return len(ids)
         except SQLAlchemyError as e:
             await session.rollback()
             logger.error(f"Ошибка при удалении записей: {e}")
             raise e
 
     @classmethod
-    async def count(cls, session: AsyncSession, filters: BaseModel) -> int:
-        filter_dict = filters.model_dump(exclude_unset=True)
+    async def count(
+        cls,
+        session: AsyncSession,
+        filters: BaseModel | None = None,
+        mode: CountMode = CountMode.exact,
+    ) -> int:
+        filter_dict = filters.model_dump(exclude_unset=True, exclude_none=True) if filters else {}
         logger.info(
             f"Подсчет количества записей {cls.model.__name__} по фильтру: {filter_dict}",
         )
+        conditions = [getattr(cls.model, k) == v for k, v in filter_dict.items()]
+        return await cls.count_where(session, conditions, mode)
+
+    @classmethod
+    async def count_where(
+        cls,
+        session: AsyncSession,
+        conditions: Sequence[ColumnElement[bool]] = (),
+        mode: CountMode = CountMode.exact,
+    ) -> int:
+        """Количество записей по условиям WHERE в выбранном режиме.
+
+        estimated без условий читает `pg_class.reltuples`, с условиями —
+        оценку строк из `EXPLAIN`; если таблица ещё ни разу не
+        анализировалась, считается точно.
+        """
+        query = select(func.count()).select_from(cls.model).where(*conditions)
         try:
-            query = select(func.count(cls.model.id)).filter_by(**filter_dict)
+            if mode is CountMode.estimated:
+                count = await cls._estimate_count(session, conditions)
+                if count is not None:
+                    logger.info(f"Оценка количества {cls.model.__name__}: {count}")
+                    return count
+            elif mode is CountMode.cached:
+                sql = str(query.compile(dialect=session.get_bind().dialect, compile_kwargs={"literal_binds": True}))
+                key = f"count:{cls.model.__tablename__}:{hashlib.sha1(sql.encode()).hexdigest()}"
+                cached = await COUNT_CACHE.get(key)
+                if cached is not None:
+                    return int(cached)
+                count = (await session.execute(query)).scalar() or 0
+                await COUNT_CACHE.set(key, str(count), APP_CONFIG.cache.count_ttl)
+                logger.info(f"Найдено {count} записей.")
+                return count
+
             result = await session.execute(query)
             count = result.scalar() or 0
             logger.info(f"Найдено {count} записей.")
@@ -222,6 +778,33 @@ class BaseDAO(Generic[T]):
             logger.error(f"Ошибка при подсчете записей: {e}")
             raise
 
+    @classmethod
+    async def _estimate_count(
+        cls,
+        session: AsyncSession,
+        conditions: Sequence[ColumnElement[bool]],
+    ) -> int | None:
+        if not conditions:
+            result = await session.execute(
+                select(text("reltuples::bigint"))
+                .select_from(text("pg_class"))
+                .where(
+                    text("oid = CAST(:table AS regclass)").bindparams(table=cls.model.__tablename__),
+                ),
+            )
+            reltuples = result.scalar()
+            # -1: статистики по таблице ещё нет
+            return reltuples if reltuples is not None and reltuples >= 0 else None
+
+        query = select(cls.model.id).where(*conditions)
+        sql = query.compile(dialect=session.get_bind().dialect, compile_kwargs={"literal_binds": True})
+        connection = await session.connection()
+        result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")
+        plan = result.scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
     @classmethod
     async def paginate(
         cls,
@@ -229,16 +812,24 @@ class BaseDAO(Generic[T]):
         page: int = 1,
         page_size: int = 10,
         filters: BaseModel | None = None,
+        cursor: str | None = None,
     ) -> list[T]:
+        """Страница записей: OFFSET по `page` или keyset по `cursor`.
+
+        Если передан `cursor`, параметр `page` игнорируется.
+        """
         filter_dict = filters.model_dump(exclude_unset=True, exclude_none=True) if filters else {}
         logger.info(
             f"Пагинация записей {cls.model.__name__} по фильтру: {filter_dict}, страница: {page}, размер страницы: {page_size}",
         )
+        query = cls.apply_pagination(
+            select(cls.model).filter_by(**filter_dict),
+            limit=page_size,
+            offset=(page - 1) * page_size,
+            cursor=cursor,
+        )
         try:
-            query = select(cls.model).filter_by(**filter_dict)
-            result = await session.execute(
-                query.offset((page - 1) * page_size).limit(page_size),
-            )
+            result = await session.execute(query)
             records = result.scalars().all()
             logger.info(f"Найдено {len(records)} записей на странице {page}.")
             return records
@@ -263,6 +854,28 @@ class BaseDAO(Generic[T]):
             logger.error(f"Ошибка при поиске записей по списку ID: {e}")
             raise
 
+    @classmethod
+    def _upsert_statement(
+        cls,
+        unique_fields: list[str],
+        rows: list[dict[str, Any]],
+    ):
+        """Собрать `INSERT ... ON CONFLICT (unique_fields) DO UPDATE ... RETURNING`."""
+        stmt = pg_insert(cls.model).values(rows)
+        set_ = {k: stmt.excluded[k] for k in rows[0] if k not in unique_fields}
+        # ON CONFLICT DO UPDATE не применяет Column.onupdate (updated_at) сам
+        for col in cls.model.__table__.columns:
+            if col.onupdate is not None and col.onupdate.is_clause_element and col.name not in set_:
+                set_[col.name] = col.onupdate.arg
+        if not set_:
+            # no-op обновление, чтобы RETURNING вернул и уже существующую строку
+            set_ = {k: stmt.excluded[k] for k in unique_fields}
+        return (
+            stmt.on_conflict_do_update(index_elements=unique_fields, set_=set_)
+            .returning(cls.model)
+            .execution_options(populate_existing=True)
+        )
+
     @classmethod
     async def upsert(
         cls,
@@ -270,57 +883,122 @@ class BaseDAO(Generic[T]):
         unique_fields: list[str],
         values: BaseModel,
     ) -> T:
-        values_dict = values.model_dump(exclude_unset=True)
-        filter_dict = {field: values_dict[field] for field in unique_fields if field in values_dict}
+        """Вставить или обновить запись одним запросом по `unique_fields`.
+
+        Поля из `unique_fields` должны быть покрыты уникальным индексом.
+        """
+        values_dict = {k: convert_value(v) for k, v in values.model_dump(exclude_unset=True).items()}
 
         logger.info(f"Upsert для {cls.model.__name__}")
         try:
-            existing = await cls.find_one_or_none(
-                session,
-                BaseModel.model_construct(**filter_dict),
-            )
-            if existing:
-                for key, value in values_dict.items():
-                    setattr(existing, key, value)
-                await session.flush()
-                logger.info(
-                    f"Обновлена существующая запись {cls.model.__name__}",
-                )
-                return existing
-            else:
-                new_instance = cls.model(**values_dict)
-                session.add(new_instance)
-                await session.flush()
-                logger.info(f"Создана новая запись {cls.model.__name__}")
-                return new_instance
+            result = await session.execute(cls._upsert_statement(unique_fields, [values_dict]))
+            record = result.scalar_one()
+            await session.flush()
+            await cls.invalidate_cache(session, [record.id])
+            logger.info(f"Upsert {cls.model.__name__} выполнен, id={record.id}")
+            return record
         except SQLAlchemyError as e:
             await session.rollback()
             logger.error(f"Ошибка при upsert: {e}")
             raise
 
+    @classmethod
+    async def upsert_many(
+        cls,
+        session: AsyncSession,
+        unique_fields: list[str],
+        instances: Sequence[BaseModel],
+        chunk_size: int = 500,
+    ) -> list[T]:
+        """Массовый upsert: по одному `INSERT ... ON CONFLICT` на пачку.
+
+        Записи группируются по набору переданных полей; при повторе
+        уникального ключа во входных данных побеждает последняя запись.
+        """
+        # {набор полей: {уникальный ключ: значения}}
+        groups: dict[tuple[str, ...], dict[tuple, dict[str, Any]]] = {}
+        for item in instances:
+            values_dict = {k: convert_value(v) for k, v in item.model_dump(exclude_unset=True).items()}
+            key = tuple(values_dict.get(field) for field in unique_fields)
+            groups.setdefault(tuple(sorted(values_dict)), {})[key] = values_dict
+
+        logger.info(
+            f"Массовый upsert {cls.model.__name__}. Количество: {len(instances)}",
+        )
+        try:
+            records: list[T] = []
+            for rows_by_key in groups.values():
+                rows = list(rows_by_key.values())
+                for start in range(0, len(rows), chunk_size):
+                    result = await session.execute(
+                        cls._upsert_statement(unique_fields, rows[start : start + chunk_size]),
+                    )
+                    records.extend(result.scalars().all())
+            await session.flush()
+            await cls.invalidate_cache(session, [record.id for record in records])
+            logger.info(f"Upsert выполнен для {len(records)} записей")
+            return records
+        except SQLAlchemyError as e:
+            await session.rollback()
+            logger.error(f"Ошибка при массовом upsert: {e}")
+            raise
+
     @classmethod
     async def bulk_update(
         cls,
         session: AsyncSession,
         records: list[BaseModel],
+        chunk_size: int = 1000,
     ) -> int:
+        """Массово обновить записи по id.
+
+        Записи группируются по набору обновляемых колонок, каждая группа
+        уходит пачками по `chunk_size` одним `UPDATE ... FROM unnest(...)`:
+        значения колонки — один параметр-массив с типом колонки, поэтому текст
+        запроса один на группу и asyncpg готовит его один раз.
+        Возвращает число реально обновлённых строк; записи без id пропускаются.
+        """
         logger.info(f"Массовое обновление записей {cls.model.__name__}")
+        # {набор колонок: {id: значения}} — для повторного id побеждает последняя запись
+        groups: dict[tuple[str, ...], dict[Any, dict[str, Any]]] = {}
+        for record in records:
+            record_dict = record.model_dump(exclude_unset=True)
+            if "id" not in record_dict:
+                continue
+            record_id = record_dict.pop("id")
+            if not record_dict:
+                continue
+            columns = tuple(sorted(record_dict))
+            groups.setdefault(columns, {})[record_id] = {k: convert_value(v) for k, v in record_dict.items()}
+
+        table = cls.model.__table__
         try:
             updated_count = 0
-            for record in records:
-                record_dict = record.model_dump(exclude_unset=True)
-                if "id" not in record_dict:
-                    continue
-
-                update_data = {k: v for k, v in record_dict.items() if k != "id"}
-                stmt = sqlalchemy_update(cls.model).filter_by(id=record_dict["id"]).values(**update_data)
-                result = await session.execute(stmt)
-                updated_count += result.rowcount
+            for columns, rows in groups.items():
+                items = list(rows.items())
+                for start in range(0, len(items), chunk_size):
+                    chunk = items[start : start + chunk_size]
+                    data = unnest_rows(
+                        table,
+                        ("id", *columns),
+                        [(record_id, *(row[name] for name in columns)) for record_id, row in chunk],
+                    )
+                    stmt = (
+                        sqlalchemy_update(table)
+                        .where(table.c.id == data.c.id)
+                        .values({name: data.c[name] for name in columns})
+                    )
+                    result = await session.execute(stmt)
+                    updated_count += result.rowcount
 
             await session.flush()
+            await cls.invalidate_cache(session, [record_id for rows in groups.values() for record_id in rows])
             logger.info(f"Обновлено {updated_count} записей")
             return updated_count
         except SQLAlchemyError as e:
             await session.rollback()
             logger.error(f"Ошибка при массовом обновлении: {e}")
             raise
+
+
+_instrument_methods(BaseDAO)
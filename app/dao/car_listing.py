@@ -0,0 +1,31 @@
+from typing import Any
+
+from pydantic import BaseModel
+from sqlalchemy import RowMapping
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.dao.base import BaseDAO
+from app.dao.cars import CarCatalogQueries
+from app.models.car_listing import CarListing
+
+
+class CarListingDAO(CarCatalogQueries, BaseDAO[CarListing]):
+    """Чтение карточек каталога из проекции car_listing.
+
+    Колонки авто в проекции те же, что в cars, поэтому фильтры, сортировка
+    и курсор — общие с CarsDAO. Строки ведут триггеры БД: через DAO не пишем.
+    """
+
+    model = CarListing
+
+    @classmethod
+    async def find_filtered_rows(
+        cls,
+        session: AsyncSession,
+        schema: type[BaseModel],
+        **filters: Any,
+    ) -> list[RowMapping]:
+        """Страница карточек строками с колонками `schema`; параметры — как у filtered_query."""
+        result = await session.execute(cls.filtered_query(select(*cls.columns_for(schema)), **filters))
+        return list(result.mappings().all())
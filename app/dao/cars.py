@@ -1,26 +1,47 @@
-from sqlalchemy import and_, asc, desc
+import logging
+import re
+from collections.abc import AsyncIterator, Callable, Sequence
+from enum import StrEnum, unique
+from typing import Any
+
+from pydantic import BaseModel
+from sqlalchemy import ColumnElement, RowMapping, Select, and_, case, func, literal_column, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import InstrumentedAttribute, selectinload
 
-from app.dao.base import BaseDAO
-from app.models.cars import Car
+from app.dao.base import BaseDAO, RecordVersion, convert_value, unnest_rows
+from app.models.cars import SEARCH_CONFIG, Car
 
+logger = logging.getLogger(__name__)
 
-class CarsDAO(BaseDAO[Car]):
-    model = Car
+# границы корзин фасетов цены и года: корзина i — [edges[i-1], edges[i])
+PRICE_FACET_EDGES = (5_000, 10_000, 20_000, 30_000, 50_000, 100_000)
+YEAR_FACET_EDGES = (2000, 2010, 2015, 2020, 2023)
+
+
+@unique
+class CarSortField(StrEnum):
+    """Поля сортировки каталога: только их ключ попадает в курсор keyset-пагинации."""
+
+    price = "price"
+    year = "year"
+    created_at = "created_at"
+    updated_at = "updated_at"
 
-    @classmethod
-    async def get_by_vin(cls, session: AsyncSession, vin: str) -> Car | None:
-        result = await session.execute(
-            select(cls.model).where(cls.model.vin == vin),
-        )
-        return result.scalar_one_or_none()
+
+class CarCatalogQueries:
+    """Фильтры, сортировка и пагинация каталога для DAO с колонками авто (cars, car_listing)."""
+
+    # даёт BaseDAO
+    model: Any
+    apply_pagination: Callable[..., Select]
 
     @classmethod
-    async def find_filtered(
+    def filter_conditions(
         cls,
-        session: AsyncSession,
         *,
         make: str | None = None,
         model: str | None = None,
@@ -30,12 +51,8 @@ class CarsDAO(BaseDAO[Car]):
         price_max: float | None = None,
         year_min: int | None = None,
         year_max: int | None = None,
-        sort_by: str | None = None,
-        sort_dir: str | None = "desc",
-        limit: int = 20,
-        offset: int = 0,
-    ) -> list[Car]:
-        query = select(cls.model)
+    ) -> list[ColumnElement[bool]]:
+        """Условия WHERE для фильтров каталога."""
         conditions = []
 
         if make:
@@ -59,25 +76,252 @@ class CarsDAO(BaseDAO[Car]):
             conditions.append(cls.model.year >= year_min)
         if year_max is not None:
             conditions.append(cls.model.year <= year_max)
+        return conditions
+
+    @classmethod
+    def sort_column(cls, sort_by: str | None) -> InstrumentedAttribute | None:
+        sort_map = {
+            CarSortField.price: cls.model.price,
+            CarSortField.year: cls.model.year,
+            CarSortField.created_at: cls.model.created_at,
+            CarSortField.updated_at: cls.model.updated_at,
+        }
+        return sort_map.get(sort_by) if sort_by else None
 
+    @classmethod
+    def filtered_query(
+        cls,
+        query: Select,
+        *,
+        make: str | None = None,
+        model: str | None = None,
+        status: str | None = None,
+        engine_type: str | None = None,
+        price_min: float | None = None,
+        price_max: float | None = None,
+        year_min: int | None = None,
+        year_max: int | None = None,
+        sort_by: str | None = None,
+        sort_dir: str | None = "desc",
+        limit: int = 20,
+        offset: int = 0,
+        cursor: str | None = None,
+    ) -> Select:
+        """Фильтры, сортировка и пагинация каталога поверх `query`."""
+        conditions = cls.filter_conditions(
+            make=make,
+            model=model,
+            status=status,
+            engine_type=engine_type,
+            price_min=price_min,
+            price_max=price_max,
+            year_min=year_min,
+            year_max=year_max,
+        )
         if conditions:
             query = query.where(and_(*conditions))
 
-        sort_map = {
-            "price": cls.model.price,
-            "year": cls.model.year,
-            "created_at": cls.model.created_at,
-            "updated_at": cls.model.updated_at,
-        }
-        if sort_by in sort_map:
-            order_col = sort_map[sort_by]
-            query = query.order_by(
-                asc(order_col) if sort_dir == "asc" else desc(order_col),
-            )
+        # сортировка всегда добивается id, чтобы курсор был однозначным
+        return cls.apply_pagination(
+            query,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            sort_column=cls.sort_column(sort_by),
+            sort_dir=sort_dir,
+        )
+
+
+class CarsDAO(CarCatalogQueries, BaseDAO[Car]):
+    model = Car
+    cacheable = True
+
+    @classmethod
+    async def get_by_vin(cls, session: AsyncSession, vin: str) -> Car | None:
+        result = await session.execute(
+            select(cls.model).where(cls.model.vin == vin),
+        )
+        return result.scalar_one_or_none()
+
+    @classmethod
+    async def insert_skip_existing_vin(
+        cls,
+        session: AsyncSession,
+        rows: Sequence[dict],
+    ) -> dict[str, int]:
+        """Вставить пачку авто, пропуская VIN, которые уже есть в БД.
 
-        result = await session.execute(query.offset(offset).limit(limit))
+        Один `INSERT ... SELECT FROM unnest(...) ON CONFLICT (vin) DO NOTHING RETURNING id, vin`:
+        текст запроса не зависит от размера пачки. Python-дефолты колонок, которых
+        нет в строках, подставляет SQLAlchemy. Все строки должны иметь одинаковый
+        набор ключей. Возвращает {vin: id} только для реально вставленных авто.
+        """
+        if not rows:
+            return {}
+        table = cls.model.__table__
+        columns = list(rows[0])
+        data = unnest_rows(table, columns, [[convert_value(row[name]) for name in columns] for row in rows])
+        stmt = (
+            pg_insert(table)
+            .from_select(columns, select(*data.c))
+            .on_conflict_do_nothing(index_elements=[table.c.vin])
+            .returning(table.c.id, table.c.vin)
+        )
+        try:
+            result = await session.execute(stmt)
+            inserted = {vin: car_id for car_id, vin in result.all()}
+            logger.info(f"Импорт авто: вставлено {len(inserted)} из {len(rows)}")
+            return inserted
+        except SQLAlchemyError as e:
+            await session.rollback()
+            logger.error(f"Ошибка при импорте пачки авто: {e}")
+            raise
+
+    @classmethod
+    async def find_filtered(cls, session: AsyncSession, **filters: Any) -> list[Car]:
+        """Страница каталога ORM-объектами; параметры — как у filtered_query."""
+        result = await session.execute(cls.filtered_query(select(cls.model), **filters))
         return list(result.scalars().all())
 
+    @classmethod
+    async def find_filtered_rows(
+        cls,
+        session: AsyncSession,
+        schema: type[BaseModel],
+        **filters: Any,
+    ) -> list[RowMapping]:
+        """То же, что find_filtered, но строками с колонками `schema` (Core, без гидрации ORM)."""
+        result = await session.execute(cls.filtered_query(select(*cls.columns_for(schema)), **filters))
+        return list(result.mappings().all())
+
+    @classmethod
+    def search_query(cls, query: Select, q: str) -> Select:
+        """Поиск по каталогу поверх `query`, лучшие совпадения первыми.
+
+        Полнотекстовый поиск по префиксам слов в make/model/color/description
+        (`search_vector`) плюс триграммное сходство с "марка модель" для опечаток.
+        """
+        document = cls.model.make.concat(literal_column("' '")).concat(cls.model.model).self_group()
+        similarity = func.word_similarity(q, document)
+        match = document.op("%>")(q)
+        rank = similarity
+        terms = re.findall(r"\w+", q.lower())
+        if terms:
+            search_vector = cls.model.__table__.c.search_vector
+            tsquery = func.to_tsquery(SEARCH_CONFIG, " & ".join(f"{term}:*" for term in terms))
+            match = or_(search_vector.op("@@")(tsquery), match)
+            rank = func.ts_rank_cd(search_vector, tsquery) + similarity
+        return query.where(match).order_by(rank.desc(), cls.model.id.desc())
+
+    @classmethod
+    async def search_rows(
+        cls,
+        session: AsyncSession,
+        schema: type[BaseModel],
+        q: str,
+        *,
+        limit: int = 20,
+        offset: int = 0,
+        **filters: Any,
+    ) -> list[RowMapping]:
+        """Страница поиска строками с колонками `schema`; `filters` — как у filter_conditions."""
+        query = select(*cls.columns_for(schema))
+        conditions = cls.filter_conditions(**filters)
+        if conditions:
+            query = query.where(and_(*conditions))
+        query = cls.search_query(query, q).limit(limit).offset(offset)
+        result = await session.execute(query)
+        return list(result.mappings().all())
+
+    @staticmethod
+    def _bucket(column: InstrumentedAttribute, edges: Sequence[int]) -> ColumnElement[int]:
+        # границы — литералы, а не bind-параметры: выражение повторяется в GROUP BY
+        # и должно совпасть с SELECT текстуально
+        return case(
+            *((column < literal_column(str(edge)), literal_column(str(index))) for index, edge in enumerate(edges)),
+            else_=literal_column(str(len(edges))),
+        )
+
+    @classmethod
+    async def facet_counts(
+        cls,
+        session: AsyncSession,
+        conditions: Sequence[ColumnElement[bool]] = (),
+    ) -> tuple[int, dict[str, dict[Any, int]]]:
+        """Количество авто по значениям фасетов одним запросом `GROUPING SETS`.
+
+        Возвращает (всего, {фасет: {значение: количество}}); для price и year
+        значение — номер корзины по PRICE_FACET_EDGES / YEAR_FACET_EDGES.
+        """
+        facets = {
+            "make": cls.model.make,
+            "engine_type": cls.model.engine_type,
+            "transmission": cls.model.transmission,
+            "condition": cls.model.condition,
+            "status": cls.model.status,
+            "price": cls._bucket(cls.model.price, PRICE_FACET_EDGES),
+            "year": cls._bucket(cls.model.year, YEAR_FACET_EDGES),
+        }
+        names, columns = list(facets), list(facets.values())
+        query = (
+            select(*columns, func.grouping(*columns), func.count())
+            .where(*conditions)
+            .group_by(func.grouping_sets(*columns, literal_column("()")))
+        )
+        try:
+            result = await session.execute(query)
+        except SQLAlchemyError as e:
+            logger.error(f"Ошибка при подсчете фасетов: {e}")
+            raise
+
+        # бит grouping() равен 0 у колонки, по которой сгруппирована строка;
+        # старший бит соответствует первой колонке
+        total = 0
+        counts: dict[str, dict[Any, int]] = {name: {} for name in names}
+        full_mask = (1 << len(columns)) - 1
+        for *values, grouping, count in result.all():
+            if grouping == full_mask:
+                total = count
+                continue
+            index = len(columns) - (full_mask ^ grouping).bit_length()
+            counts[names[index]][values[index]] = count
+        logger.info(f"Фасеты {cls.model.__name__}: {total} записей")
+        return total, counts
+
+    @classmethod
+    def stream_filtered(
+        cls,
+        session: AsyncSession,
+        *,
+        make: str | None = None,
+        model: str | None = None,
+        status: str | None = None,
+        engine_type: str | None = None,
+        price_min: float | None = None,
+        price_max: float | None = None,
+        year_min: int | None = None,
+        year_max: int | None = None,
+        sort_by: str | None = None,
+        sort_dir: str | None = "desc",
+        yield_per: int = 1000,
+    ) -> AsyncIterator[Car]:
+        """Потоковая выгрузка авто с теми же фильтрами, что у find_filtered."""
+        query = select(cls.model)
+        conditions = cls.filter_conditions(
+            make=make,
+            model=model,
+            status=status,
+            engine_type=engine_type,
+            price_min=price_min,
+            price_max=price_max,
+            year_min=year_min,
+            year_max=year_max,
+        )
+        if conditions:
+            query = query.where(and_(*conditions))
+        query = cls.apply_ordering(query, cls.sort_column(sort_by), sort_dir)
+        return cls.stream(session, query, yield_per=yield_per)
+
     @classmethod
     async def get_with_relations(
         cls,
@@ -101,6 +345,15 @@ class CarsDAO(BaseDAO[Car]):
         result = await session.execute(stmt)
         return result.scalar_one_or_none()
 
+    @classmethod
+    async def get_details_version(cls, session: AsyncSession, car_id: int) -> RecordVersion | None:
+        """Версия агрегата из get_with_relations — без загрузки связей."""
+        return await cls.get_version(
+            session,
+            car_id,
+            (cls.model.photos, cls.model.reports, cls.model.reviews, cls.model.orders),
+        )
+
     @classmethod
     async def get_car_with_orders(cls, car_id: int, session: AsyncSession) -> Car | None:
         result = await session.execute(
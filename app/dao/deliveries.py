@@ -1,4 +1,4 @@
-from sqlalchemy import and_, or_
+from sqlalchemy import ColumnElement, and_, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
@@ -41,16 +41,14 @@ class DeliveriesDAO(BaseDAO[Delivery]):
         return result.scalar_one_or_none()
 
     @classmethod
-    async def find_filtered(
+    def filter_conditions(
         cls,
-        session: AsyncSession,
         *,
         order_id: int | None = None,
         status: str | None = None,
         q: str | None = None,
-        limit: int = 20,
-        offset: int = 0,
-    ) -> list[Delivery]:
+    ) -> list[ColumnElement[bool]]:
+        """Условия WHERE для фильтров списка доставок."""
         conditions = []
         if order_id is not None:
             conditions.append(cls.model.order_id == order_id)
@@ -63,9 +61,24 @@ class DeliveriesDAO(BaseDAO[Delivery]):
                     cls.model.tracking_number.ilike(pattern),
                 ),
             )
+        return conditions
+
+    @classmethod
+    async def find_filtered(
+        cls,
+        session: AsyncSession,
+        *,
+        order_id: int | None = None,
+        status: str | None = None,
+        q: str | None = None,
+        limit: int = 20,
+        offset: int = 0,
+        cursor: str | None = None,
+    ) -> list[Delivery]:
+        conditions = cls.filter_conditions(order_id=order_id, status=status, q=q)
         stmt = select(cls.model)
         if conditions:
             stmt = stmt.where(and_(*conditions))
-        stmt = stmt.offset(offset).limit(limit)
+        stmt = cls.apply_pagination(stmt, limit=limit, offset=offset, cursor=cursor)
         result = await session.execute(stmt)
         return list(result.scalars().all())
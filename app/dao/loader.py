@@ -0,0 +1,106 @@
+import asyncio
+import logging
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.dao.base import LOADER_INFO_KEY, BaseDAO
+
+logger = logging.getLogger(__name__)
+
+
+class DataLoader:
+    """Батчинг и мемоизация поиска по id в рамках одной сессии (запроса).
+
+    Все `load` одного DAO, вызванные до следующего витка event loop,
+    уходят одним `WHERE id IN (...)` через `find_by_ids`. Результаты
+    запоминаются до конца сессии; записи, изменённые через DAO,
+    из памяти сбрасываются. Пачка выполняется фоновой задачей на той же
+    сессии, поэтому результаты `load` нужно дождаться до других запросов.
+
+    Экономия — один запрос на модель вместо запроса на каждый id. Пачки разных
+    моделей идут последовательно на одной сессии, поэтому одиночные проверки
+    существования по разным моделям выгоднее делать прямо через DAO: батч им
+    ничего не сэкономит.
+
+        loader = DataLoader.for_session(session)
+        users = await loader.load_many(UsersDAO, user_ids)
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+        self._memo: dict[tuple[type[BaseDAO], Any], asyncio.Future] = {}
+        self._queue: dict[type[BaseDAO], dict[Any, asyncio.Future]] = {}
+        self._dispatch: asyncio.Task | None = None
+
+    @classmethod
+    def for_session(cls, session: AsyncSession) -> "DataLoader":
+        """Загрузчик, привязанный к сессии (создаётся при первом обращении)."""
+        loader = session.info.get(LOADER_INFO_KEY)
+        if loader is None:
+            loader = session.info[LOADER_INFO_KEY] = cls(session)
+        return loader
+
+    def load(self, dao: type[BaseDAO], record_id: Any) -> asyncio.Future:
+        """Запись по id или None; повторный вызов вернёт тот же результат."""
+        key = (dao, record_id)
+        future = self._memo.get(key)
+        if future is not None:
+            return future
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._memo[key] = future
+        self._queue.setdefault(dao, {})[record_id] = future
+        if self._dispatch is None:
+            self._dispatch = loop.create_task(self._dispatch_batch())
+        return future
+
+    async def load_many(self, dao: type[BaseDAO], ids: list[Any]) -> list[Any]:
+        return list(await asyncio.gather(*(self.load(dao, record_id) for record_id in ids)))
+
+    def forget(self, dao: type[BaseDAO], ids) -> None:
+        """Сбросить запомненные записи после их изменения."""
+        for record_id in ids:
+            self._memo.pop((dao, record_id), None)
+
+    def clear(self) -> None:
+        self._memo.clear()
+
+    async def _dispatch_batch(self) -> None:
+        # пока задача жива, новые load только пополняют очередь: второй задачи на той же
+        # сессии не будет, очередь, набранная во время запросов, уходит следующей пачкой
+        try:
+            while True:
+                # даём остальным корутинам текущего витка поставить свои id в очередь
+                await asyncio.sleep(0)
+                queue, self._queue = self._queue, {}
+                if not queue:
+                    return
+                await self._run_batch(queue)
+        finally:
+            self._dispatch = None
+
+    async def _run_batch(self, queue: dict[type[BaseDAO], dict[Any, asyncio.Future]]) -> None:
+        # сессия не допускает параллельных запросов — пачки по DAO идут по очереди
+        for dao, futures in queue.items():
+            ids = list(futures)
+            try:
+                if len(ids) == 1 and dao.uses_entity_cache():
+                    # одиночный id у кэшируемой модели — через кэш сущностей
+                    record = await dao.find_one_or_none_by_id(ids[0], self.session)
+                    records = [record] if record is not None else []
+                else:
+                    records = await dao.find_by_ids(self.session, ids)
+            except Exception as e:
+                for record_id, future in futures.items():
+                    self._memo.pop((dao, record_id), None)
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            by_id = {record.id: record for record in records}
+            logger.info(f"DataLoader {dao.model.__name__}: {len(ids)} id одним запросом")
+            for record_id, future in futures.items():
+                if not future.done():
+                    future.set_result(by_id.get(record_id))
@@ -1,14 +1,19 @@
-from sqlalchemy import and_, or_
+from collections.abc import AsyncIterator
+from typing import Any
+
+from pydantic import BaseModel
+from sqlalchemy import ColumnElement, RowMapping, Select, and_, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
 
-from app.dao.base import BaseDAO
+from app.dao.base import BaseDAO, RecordVersion
 from app.models.orders import Order
 
 
 class OrdersDAO(BaseDAO[Order]):
     model = Order
+    cacheable = True
 
     @classmethod
     async def get_for_user(
@@ -46,18 +51,25 @@ class OrdersDAO(BaseDAO[Order]):
         return result.scalar_one_or_none()
 
     @classmethod
-    async def find_filtered(
+    async def get_details_version(cls, session: AsyncSession, order_id: int) -> RecordVersion | None:
+        """Версия агрегата из get_with_relations — без загрузки связей."""
+        return await cls.get_version(
+            session,
+            order_id,
+            (cls.model.user, cls.model.car, cls.model.payments, cls.model.deliveries),
+        )
+
+    @classmethod
+    def filter_conditions(
         cls,
-        session: AsyncSession,
         *,
         user_id: int | None = None,
         car_id: int | None = None,
         status: str | None = None,
         payment_method: str | None = None,
         q: str | None = None,
-        limit: int = 20,
-        offset: int = 0,
-    ) -> list[Order]:
+    ) -> list[ColumnElement[bool]]:
+        """Условия WHERE для фильтров списка заказов."""
         conditions = []
         if user_id is not None:
             conditions.append(cls.model.user_id == user_id)
@@ -76,10 +88,72 @@ class OrdersDAO(BaseDAO[Order]):
                     cls.model.customer_phone.ilike(pattern),
                 ),
             )
+        return conditions
 
-        stmt = select(cls.model)
+    @classmethod
+    def filtered_query(
+        cls,
+        stmt: Select,
+        *,
+        user_id: int | None = None,
+        car_id: int | None = None,
+        status: str | None = None,
+        payment_method: str | None = None,
+        q: str | None = None,
+        limit: int = 20,
+        offset: int = 0,
+        cursor: str | None = None,
+    ) -> Select:
+        """Фильтры и пагинация списка заказов поверх `stmt`."""
+        conditions = cls.filter_conditions(
+            user_id=user_id,
+            car_id=car_id,
+            status=status,
+            payment_method=payment_method,
+            q=q,
+        )
         if conditions:
             stmt = stmt.where(and_(*conditions))
-        stmt = stmt.offset(offset).limit(limit)
-        result = await session.execute(stmt)
+        return cls.apply_pagination(stmt, limit=limit, offset=offset, cursor=cursor)
+
+    @classmethod
+    async def find_filtered(cls, session: AsyncSession, **filters: Any) -> list[Order]:
+        """Страница заказов ORM-объектами; параметры — как у filtered_query."""
+        result = await session.execute(cls.filtered_query(select(cls.model), **filters))
         return list(result.scalars().all())
+
+    @classmethod
+    async def find_filtered_rows(
+        cls,
+        session: AsyncSession,
+        schema: type[BaseModel],
+        **filters: Any,
+    ) -> list[RowMapping]:
+        """То же, что find_filtered, но строками с колонками `schema` (Core, без гидрации ORM)."""
+        result = await session.execute(cls.filtered_query(select(*cls.columns_for(schema)), **filters))
+        return list(result.mappings().all())
+
+    @classmethod
+    def stream_filtered(
+        cls,
+        session: AsyncSession,
+        *,
+        user_id: int | None = None,
+        car_id: int | None = None,
+        status: str | None = None,
+        payment_method: str | None = None,
+        q: str | None = None,
+        yield_per: int = 1000,
+    ) -> AsyncIterator[Order]:
+        """Потоковая выгрузка заказов с теми же фильтрами, что у find_filtered."""
+        conditions = cls.filter_conditions(
+            user_id=user_id,
+            car_id=car_id,
+            status=status,
+            payment_method=payment_method,
+            q=q,
+        )
+        stmt = select(cls.model)
+        if conditions:
+            stmt = stmt.where(and_(*conditions))
+        return cls.stream(session, cls.apply_ordering(stmt), yield_per=yield_per)
@@ -1,4 +1,6 @@
-from sqlalchemy import and_
+from collections.abc import AsyncIterator
+
+from sqlalchemy import ColumnElement, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
@@ -42,16 +44,14 @@ class PaymentsDAO(BaseDAO[Payment]):
         return result.scalar_one_or_none()
 
     @classmethod
-    async def find_filtered(
+    def filter_conditions(
         cls,
-        session: AsyncSession,
         *,
         order_id: int | None = None,
         status: str | None = None,
         payment_type: str | None = None,
-        limit: int = 20,
-        offset: int = 0,
-    ) -> list[Payment]:
+    ) -> list[ColumnElement[bool]]:
+        """Условия WHERE для фильтров списка платежей."""
         conditions = []
         if order_id is not None:
             conditions.append(cls.model.order_id == order_id)
@@ -59,10 +59,50 @@ class PaymentsDAO(BaseDAO[Payment]):
             conditions.append(cls.model.status == status)
         if payment_type is not None:
             conditions.append(cls.model.payment_type == payment_type)
+        return conditions
+
+    @classmethod
+    async def find_filtered(
+        cls,
+        session: AsyncSession,
+        *,
+        order_id: int | None = None,
+        status: str | None = None,
+        payment_type: str | None = None,
+        limit: int = 20,
+        offset: int = 0,
+        cursor: str | None = None,
+    ) -> list[Payment]:
+        conditions = cls.filter_conditions(
+            order_id=order_id,
+            status=status,
+            payment_type=payment_type,
+        )
 
         stmt = select(cls.model)
         if conditions:
             stmt = stmt.where(and_(*conditions))
-        stmt = stmt.offset(offset).limit(limit)
+        stmt = cls.apply_pagination(stmt, limit=limit, offset=offset, cursor=cursor)
         result = await session.execute(stmt)
         return list(result.scalars().all())
+
+    @classmethod
+    def stream_filtered(
+        cls,
+        session: AsyncSession,
+        *,
+        order_id: int | None = None,
+        status: str | None = None,
+        payment_type: str | None = None,
+        yield_per: int = 1000,
+    ) -> AsyncIterator[Payment]:
+        """Потоковая выгрузка платежей с теми же фильтрами, что у find_filtered."""
+        conditions = cls.filter_conditions(
+            order_id=order_id,
+            status=status,
+            payment_type=payment_type,
+        )
+        stmt = select(cls.model)
+        if conditions:
+            stmt = stmt.where(and_(*conditions))
+        return cls.stream(session, cls.apply_ordering(stmt), yield_per=yield_per)
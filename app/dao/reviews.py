@@ -1,4 +1,4 @@
-from sqlalchemy import and_, or_
+from sqlalchemy import ColumnElement, and_, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
@@ -50,18 +50,16 @@ class ReviewsDAO(BaseDAO[Review]):
         return result.scalar_one_or_none()
 
     @classmethod
-    async def find_filtered(
+    def filter_conditions(
         cls,
-        session: AsyncSession,
         *,
         user_id: int | None = None,
         car_id: int | None = None,
         rating_min: int | None = None,
         rating_max: int | None = None,
         q: str | None = None,
-        limit: int = 20,
-        offset: int = 0,
-    ) -> list[Review]:
+    ) -> list[ColumnElement[bool]]:
+        """Условия WHERE для фильтров списка отзывов."""
         conditions = []
         if user_id is not None:
             conditions.append(cls.model.user_id == user_id)
@@ -79,10 +77,33 @@ class ReviewsDAO(BaseDAO[Review]):
                     cls.model.comment.ilike(pattern),
                 ),
             )
+        return conditions
+
+    @classmethod
+    async def find_filtered(
+        cls,
+        session: AsyncSession,
+        *,
+        user_id: int | None = None,
+        car_id: int | None = None,
+        rating_min: int | None = None,
+        rating_max: int | None = None,
+        q: str | None = None,
+        limit: int = 20,
+        offset: int = 0,
+        cursor: str | None = None,
+    ) -> list[Review]:
+        conditions = cls.filter_conditions(
+            user_id=user_id,
+            car_id=car_id,
+            rating_min=rating_min,
+            rating_max=rating_max,
+            q=q,
+        )
 
         query = select(cls.model)
         if conditions:
             query = query.where(and_(*conditions))
-        query = query.offset(offset).limit(limit)
+        query = cls.apply_pagination(query, limit=limit, offset=offset, cursor=cursor)
         result = await session.execute(query)
         return list(result.scalars().all())
@@ -9,6 +9,8 @@ from app.models.users import User
 
 class UsersDAO(BaseDAO[User]):
     model = User
+    # не кэшируем: в кэш попал бы hashed_password, а Redis общий для всех воркеров
+    cacheable = False
 
     @classmethod
     async def get_with_relations(
@@ -1,15 +1,101 @@
+import asyncio
+import logging
+import time
 from collections.abc import AsyncGenerator
 from datetime import datetime
 from typing import Annotated, Any
 
-from fastapi import Request
-from sqlalchemy import TIMESTAMP, Integer, func
+from fastapi import Request, Response
+from sqlalchemy import TIMESTAMP, Integer, func, text
 from sqlalchemy.ext.asyncio import (
     AsyncAttrs,
+    AsyncEngine,
     AsyncSession,
+    async_sessionmaker,
 )
 from sqlalchemy.orm import DeclarativeBase, Mapped, declared_attr, mapped_column
 
+from app.core.settings import APP_CONFIG
+from app.metrics import DB_REPLICA_AVAILABLE, DB_REPLICA_LAG
+
+logger = logging.getLogger(__name__)
+
+# cookie read-your-writes: до этого unix-времени клиент читает из primary
+PRIMARY_STICKY_COOKIE = "db_primary_until"
+READ_ONLY_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# 0, если реплика догнала primary; иначе возраст последней применённой транзакции
+REPLICA_LAG_SQL = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END",
+)
+
+
+class ReplicaMonitor:
+    """Периодически проверяет доступность и отставание реплики."""
+
+    def __init__(self, engine: AsyncEngine, max_lag: float, interval: float) -> None:
+        self.engine = engine
+        self.max_lag = max_lag
+        self.interval = interval
+        self.available = False
+
+    async def check(self) -> None:
+        try:
+            async with self.engine.connect() as conn:
+                lag = (await conn.execute(REPLICA_LAG_SQL)).scalar() or 0
+        except Exception as e:
+            if self.available:
+                logger.warning(f"Реплика недоступна, чтение идёт в primary: {e}")
+            self.available = False
+        else:
+            available = float(lag) <= self.max_lag
+            if available != self.available:
+                logger.info(f"Реплика {'включена' if available else 'отключена'} для чтения, отставание {lag:.1f}s")
+            self.available = available
+            DB_REPLICA_LAG.set(float(lag))
+        DB_REPLICA_AVAILABLE.set(int(self.available))
+
+    async def run(self) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(self.interval)
+
+
+def read_session_maker(request: Request) -> async_sessionmaker[AsyncSession]:
+    """Фабрика сессий для чтения: реплика, если она есть, здорова и клиент не писал недавно."""
+    state = request.app.state
+    replica = getattr(state, "replica_session_maker", None)
+    if replica is None or not state.replica_monitor.available:
+        return state.session_maker
+    sticky_until = request.cookies.get(PRIMARY_STICKY_COOKIE)
+    try:
+        if sticky_until and float(sticky_until) > time.time():
+            return state.session_maker
+    except ValueError:
+        pass
+    return replica
+
+
+def _stick_to_primary(request: Request, response: Response) -> None:
+    """После записи клиент какое-то время читает из primary (если реплика настроена)."""
+    if request.method in READ_ONLY_METHODS or getattr(request.app.state, "replica_session_maker", None) is None:
+        return
+    window = APP_CONFIG.db.replica_sticky_seconds
+    response.set_cookie(
+        PRIMARY_STICKY_COOKIE,
+        str(int(time.time()) + window),
+        max_age=window,
+        httponly=True,
+    )
+
+
+def _route_session_maker(request: Request, response: Response) -> async_sessionmaker[AsyncSession]:
+    if request.method in READ_ONLY_METHODS:
+        return read_session_maker(request)
+    _stick_to_primary(request, response)
+    return request.app.state.session_maker
+
 
 async def get_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
     session_maker = request.app.state.session_maker
@@ -19,25 +105,42 @@ async def get_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
 
 async def get_session_with_commit(
     request: Request,
+    response: Response,
 ) -> AsyncGenerator[AsyncSession, None]:
-    """Асинхронная сессия с автоматическим коммитом (через app.state)."""
+    """Асинхронная сессия с автоматическим коммитом (через app.state).
+
+    Cookie read-your-writes ставится до yield: после yield (там, где коммит)
+    менять ответ уже поздно, заголовки `response` в него к этому времени
+    перенесены. Если коммит упадёт, запрос завершится ошибкой, а лишнее окно
+    чтения из primary безвредно.
+    """
+    _stick_to_primary(request, response)
     session_maker = request.app.state.session_maker
     async with session_maker() as session:
         try:
             yield session
-            await session.commit()
         except Exception:
             await session.rollback()
             raise
+        else:
+            try:
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
         finally:
             await session.close()
 
 
 async def get_session_without_commit(
     request: Request,
+    response: Response,
 ) -> AsyncGenerator[AsyncSession, None]:
-    """Асинхронная сессия без автоматического коммита (через app.state)."""
-    session_maker = request.app.state.session_maker
+    """Асинхронная сессия без автоматического коммита (через app.state).
+
+    GET/HEAD идут в реплику (если настроена), остальные методы — в primary.
+    """
+    session_maker = _route_session_maker(request, response)
     async with session_maker() as session:
         try:
             yield session
@@ -48,6 +151,21 @@ async def get_session_without_commit(
             await session.close()
 
 
+async def release_connection(session: AsyncSession) -> None:
+    """Вернуть соединение в пул сразу после чтения, не дожидаясь сериализации ответа.
+
+    AsyncSession и так берёт соединение только на первом запросе; здесь оно
+    отдаётся обратно раньше, чем закроется зависимость. Загруженные объекты
+    остаются доступны (отсоединёнными), следующий запрос возьмёт новое
+    соединение. Только для read-only обработчиков: незакоммиченные
+    изменения откатываются.
+    """
+    if session.new or session.dirty or session.deleted:
+        logger.warning("release_connection: в сессии есть несохранённые изменения, соединение не отпущено")
+        return
+    await session.close()
+
+
 str_uniq = Annotated[str, mapped_column(unique=True, nullable=False)]
 
 
@@ -69,7 +187,7 @@ class Base(AsyncAttrs, DeclarativeBase):
         return cls.__name__.lower() + "s"
 
     def to_dict(self) -> dict[str, Any]:
-        return {c.name: getattr(self, c.name) for c in self.__table__.columns}
+        return {key: getattr(self, key) for key in self.__mapper__.columns.keys()}
 
     def __repr__(self) -> str:
         """Строковое представление объекта для удобства отладки."""
@@ -1,11 +1,41 @@
 from __future__ import annotations
 
+import asyncio
+import logging
+import os
+import re
+import threading
 import time
-from collections.abc import Callable
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
 
-from fastapi import FastAPI, Request
-from prometheus_client import Counter, Gauge, Histogram, Info
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi import FastAPI, Request, Response
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    Info,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import Collector
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+METRICS_PATH = "/metrics"
+# label path для запросов без маршрута и сверх лимита шаблонов
+OTHER_PATH = "other"
+
+logger = logging.getLogger(__name__)
 
 REQUESTS_TOTAL = Counter(
     "fastapi_requests_total",
@@ -38,72 +68,466 @@ EXCEPTIONS_TOTAL = Counter(
     ["app_name"],
 )
 
+# метка pool у db_pool_*: primary или replica
+PRIMARY_POOL = "primary"
+REPLICA_POOL = "replica"
+DB_POOL_SIZE = Gauge("db_pool_size", "Размер пула соединений (pool_size)", ["pool"])
+DB_POOL_CHECKED_OUT = Gauge("db_pool_checked_out", "Соединения, выданные из пула", ["pool"])
+DB_POOL_CHECKED_IN = Gauge("db_pool_checked_in", "Свободные соединения в пуле", ["pool"])
+DB_POOL_OVERFLOW = Gauge("db_pool_overflow", "Соединения сверх pool_size (max_overflow)", ["pool"])
+DB_POOL_WAIT = Histogram(
+    "db_pool_wait_seconds",
+    "Время получения соединения из пула",
+    ["pool"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+DB_POOL_TIMEOUTS = Counter(
+    "db_pool_timeouts_total",
+    "Сколько раз не дождались свободного соединения (pool_timeout)",
+    ["pool"],
+)
+DB_REPLICA_LAG = Gauge("db_replica_lag_seconds", "Отставание реплики для чтения")
+DB_REPLICA_AVAILABLE = Gauge("db_replica_available", "Реплика используется для чтения (1/0)")
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "Длительность SQL-запросов по методам DAO",
+    ["dao", "method"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+DB_QUERY_ROWS = Histogram(
+    "db_query_rows",
+    "Строк вернул или изменил SQL-запрос, по методам DAO",
+    ["dao", "method"],
+    buckets=(0, 1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000),
+)
+DB_SLOW_QUERIES = Counter(
+    "db_slow_queries_total",
+    "SQL-запросы дольше DB__SLOW_QUERY_MS",
+    ["dao", "method"],
+)
+
+REQUEST_DB_QUERIES = Histogram(
+    "fastapi_request_db_queries",
+    "Число SQL-запросов на HTTP-запрос",
+    ["method", "path", "app_name"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89),
+)
+
+# заголовок с числом SQL-запросов (только в debug)
+DB_QUERIES_HEADER = "X-DB-Queries"
+
+# (DAO, метод), из которого выполняется запрос, — ставит BaseDAO; вне DAO — None
+DAO_CALL: ContextVar[tuple[str, str] | None] = ContextVar("dao_call", default=None)
+# execution option, которым помечаются служебные запросы, не попадающие в метрики
+SKIP_QUERY_METRICS = "skip_query_metrics"
+
+
+class QueryCounter:
+    """SQL-запросы одного HTTP-запроса (или блока `count_queries`)."""
+
+    __slots__ = ("count", "statements")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.statements: dict[str, int] = {}
+
+    def add(self, statement: str) -> int:
+        """Учесть запрос; вернуть, сколько раз уже выполнялся тот же SQL."""
+        self.count += 1
+        repeats = self.statements[statement] = self.statements.get(statement, 0) + 1
+        return repeats
+
+
+QUERY_COUNTER: ContextVar[QueryCounter | None] = ContextVar("query_counter", default=None)
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryCounter]:
+    """Считать SQL-запросы внутри блока (включая вызовы ASGI-приложения в том же event loop)."""
+    counter = QueryCounter()
+    token = QUERY_COUNTER.set(counter)
+    try:
+        yield counter
+    finally:
+        QUERY_COUNTER.reset(token)
+
+
+@contextmanager
+def assert_max_queries(limit: int) -> Iterator[QueryCounter]:
+    """Упасть с AssertionError, если блок выполнил больше `limit` SQL-запросов.
+
+    Для проверок N+1 в CI: вызов сервиса или ручки через `httpx.AsyncClient(transport=ASGITransport(app))`
+    внутри блока учитывается целиком.
 
-class _PrometheusMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app: FastAPI, app_name: str) -> None:
-        super().__init__(app)
+        with assert_max_queries(5):
+            await client.get("/v1/users/1/profile")
+    """
+    with count_queries() as counter:
+        yield counter
+    if counter.count > limit:
+        repeated = {statement: n for statement, n in counter.statements.items() if n > 1}
+        raise AssertionError(f"Выполнено {counter.count} SQL-запросов при лимите {limit}; повторы: {repeated}")
+
+
+class MeteredQueuePool(AsyncAdaptedQueuePool):
+    """Пул asyncpg, который пишет время ожидания соединения в db_pool_wait_seconds.
+
+    `metrics_label` — метка `pool` в db_pool_*; передаётся в `create_async_engine`
+    вместе с `poolclass=MeteredQueuePool`.
+    """
+
+    def __init__(self, creator, metrics_label: str = PRIMARY_POOL, **kw) -> None:
+        # не keyword-only: create_engine передаёт пулу только аргументы из co_varnames __init__
+        super().__init__(creator, **kw)
+        self._set_metrics_label(metrics_label)
+
+    def _set_metrics_label(self, metrics_label: str) -> None:
+        self.metrics_label = metrics_label
+        self._wait = DB_POOL_WAIT.labels(pool=metrics_label)
+        self._timeouts = DB_POOL_TIMEOUTS.labels(pool=metrics_label)
+
+    def recreate(self) -> MeteredQueuePool:
+        # QueuePool.recreate (engine.dispose) не знает аргументов подкласса
+        pool = super().recreate()
+        pool._set_metrics_label(self.metrics_label)
+        return pool
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self._timeouts.inc()
+            raise
+        finally:
+            self._wait.observe(time.perf_counter() - start)
+
+
+def setup_db_pool_metrics(engine: AsyncEngine) -> None:
+    """Публикует состояние пула движка на /metrics с его меткой pool (снимается при каждом scrape)."""
+    pool = engine.sync_engine.pool
+    if not isinstance(pool, MeteredQueuePool):
+        return
+    label = pool.metrics_label
+    DB_POOL_SIZE.labels(pool=label).set_function(pool.size)
+    DB_POOL_CHECKED_OUT.labels(pool=label).set_function(pool.checkedout)
+    DB_POOL_CHECKED_IN.labels(pool=label).set_function(pool.checkedin)
+    # overflow() отрицательный, пока пул не заполнен до pool_size
+    DB_POOL_OVERFLOW.labels(pool=label).set_function(lambda: max(pool.overflow(), 0))
+
+
+class QueryMetrics:
+    """Метрики SQL по методам DAO на событиях движка SQLAlchemy.
+
+    Время и число строк каждого запроса пишутся в db_query_duration_seconds и
+    db_query_rows с метками DAO и метода (`CarsDAO`, `find_filtered`). Запросы
+    дольше `slow_query_ms` логируются с параметрами; для медленных SELECT можно
+    снять `EXPLAIN (ANALYZE, BUFFERS)` — отдельной фоновой задачей на своём соединении.
+    Запросы считаются в `QUERY_COUNTER` текущего HTTP-запроса; одинаковый SQL,
+    повторённый `n_plus_one_threshold` раз, логируется как возможный N+1.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        slow_query_ms: float = 0,
+        explain: bool = False,
+        n_plus_one_threshold: int = 5,
+    ) -> None:
+        self.engine = engine
+        self.slow_query_seconds = slow_query_ms / 1000
+        self.explain = explain
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self._children: dict[tuple[str, str], tuple[Histogram, Histogram]] = {}
+        # каждый текст запроса объясняем один раз
+        self._explained: set[str] = set()
+        self._tasks: set[asyncio.Task] = set()
+        event.listen(engine.sync_engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine.sync_engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        context._query_started = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        duration = time.perf_counter() - context._query_started
+        if context.execution_options.get(SKIP_QUERY_METRICS):
+            return
+        dao, method = DAO_CALL.get() or ("none", "none")
+        children = self._children.get((dao, method))
+        if children is None:
+            children = self._children[dao, method] = (
+                DB_QUERY_DURATION.labels(dao=dao, method=method),
+                DB_QUERY_ROWS.labels(dao=dao, method=method),
+            )
+        children[0].observe(duration)
+        if not executemany and cursor.rowcount >= 0:
+            children[1].observe(cursor.rowcount)
+
+        counter = QUERY_COUNTER.get()
+        if counter is not None and counter.add(statement) == self.n_plus_one_threshold:
+            logger.warning(
+                f"Возможный N+1 в {dao}.{method}: один и тот же SQL выполнен "
+                f"{self.n_plus_one_threshold} раз за запрос\n{statement}"
+            )
+
+        if self.slow_query_seconds and duration >= self.slow_query_seconds:
+            DB_SLOW_QUERIES.labels(dao=dao, method=method).inc()
+            logger.warning(
+                f"Медленный SQL {dao}.{method}: {duration * 1000:.0f} мс\n{statement}\nПараметры: {parameters!r:.1000}"
+            )
+            if self.explain and not executemany and statement.lstrip()[:6].upper() == "SELECT":
+                self._schedule_explain(statement, parameters, f"{dao}.{method}")
+
+    def _schedule_explain(self, statement: str, parameters: Any, label: str) -> None:
+        if statement in self._explained:
+            return
+        if len(self._explained) >= 1000:
+            self._explained.clear()
+        self._explained.add(statement)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(self._explain(statement, parameters, label))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _explain(self, statement: str, parameters: Any, label: str) -> None:
+        # ANALYZE выполняет запрос ещё раз, поэтому только SELECT и в отдельной транзакции с откатом
+        try:
+            async with self.engine.connect() as conn:
+                result = await conn.exec_driver_sql(
+                    f"EXPLAIN (ANALYZE, BUFFERS) {statement}",
+                    parameters,
+                    execution_options={SKIP_QUERY_METRICS: True},
+                )
+                plan = "\n".join(row[0] for row in result)
+        except Exception as e:
+            logger.warning(f"Не удалось снять EXPLAIN для {label}: {e}")
+            return
+        logger.warning(f"EXPLAIN (ANALYZE, BUFFERS) медленного SQL {label}:\n{plan}")
+
+
+def setup_db_query_metrics(
+    engine: AsyncEngine,
+    slow_query_ms: float = 0,
+    explain: bool = False,
+    n_plus_one_threshold: int = 5,
+) -> QueryMetrics:
+    """Включает метрики SQL по методам DAO для движка."""
+    return QueryMetrics(
+        engine,
+        slow_query_ms=slow_query_ms,
+        explain=explain,
+        n_plus_one_threshold=n_plus_one_threshold,
+    )
+
+
+class _RouteMetrics:
+    """Дочерние серии метрик одного (метод, шаблон маршрута) — `.labels()` считается один раз."""
+
+    __slots__ = ("app_name", "db_queries", "duration", "path", "requests", "responses")
+
+    def __init__(self, method: str, path: str, app_name: str) -> None:
+        self.path = path
         self.app_name = app_name
+        self.requests = REQUESTS_TOTAL.labels(method=method, path=path, app_name=app_name)
+        self.duration = REQUEST_DURATION.labels(method=method, path=path, app_name=app_name)
+        self.db_queries = REQUEST_DB_QUERIES.labels(method=method, path=path, app_name=app_name)
+        self.responses: dict[int, Counter] = {}
+
+    def response(self, status_code: int) -> Counter:
+        child = self.responses.get(status_code)
+        if child is None:
+            child = self.responses[status_code] = RESPONSES_TOTAL.labels(
+                path=self.path,
+                status_code=str(status_code),
+                app_name=self.app_name,
+            )
+        return child
 
-    async def dispatch(
+
+class PrometheusMiddleware:
+    """ASGI-middleware метрик fastapi_* для дашборда 16110.
+
+    Работает напрямую с ASGI-сообщениями: без задачи и потока на запрос,
+    как у BaseHTTPMiddleware. Статус берётся из `http.response.start`,
+    путь — шаблон маршрута (`/v1/cars/{car_id}`) из `scope["route"]` после роутинга.
+    Сырые пути в label не попадают: запросы без маршрута и шаблоны сверх `max_paths`
+    пишутся с path=other, так что число серий ограничено.
+    Для fastapi_requests_in_progress шаблон нужен до вызова приложения: он ищется
+    среди уже встречавшихся маршрутов; первый запрос к маршруту в gauge не попадает.
+
+    Здесь же считаются SQL-запросы запроса (fastapi_request_db_queries): больше
+    `query_budget` — предупреждение в лог, при `debug` число отдаётся в X-DB-Queries.
+    """
+
+    def __init__(
         self,
-        request: Request,
-        call_next: Callable,
-    ):  # type: ignore[override]
-        raw_path = request.url.path
-        # Используем шаблон маршрута (меньше кардинальность)
-        route = request.scope.get("route")
-        path = getattr(route, "path", raw_path)
-        if path == "/metrics":
-            return await call_next(request)
-
-        method = request.method
-        REQUESTS_IN_PROGRESS.labels(path=path, app_name=self.app_name).inc()
+        app: ASGIApp,
+        app_name: str,
+        max_paths: int = 200,
+        query_budget: int = 30,
+        debug: bool = False,
+    ) -> None:
+        self.app = app
+        self.app_name = app_name
+        self.max_paths = max_paths
+        self.query_budget = query_budget
+        self.debug = debug
+        self._overflowed = False
+        self.exceptions = EXCEPTIONS_TOTAL.labels(app_name=app_name)
+        self._routes: dict[tuple[str, str], _RouteMetrics] = {}
+        self._in_progress: dict[str, Gauge] = {}
+        # встречавшиеся маршруты: без параметров — по пути, с параметрами — по regex
+        self._static_paths: set[str] = set()
+        self._path_patterns: dict[str, re.Pattern] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] == METRICS_PATH:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        # внешний счётчик (assert_max_queries в тестах) не подменяем
+        counter = QUERY_COUNTER.get()
+        token = None
+        if counter is None:
+            counter = QueryCounter()
+            token = QUERY_COUNTER.set(counter)
+        queries_before = counter.count
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.debug:
+                    queries = str(counter.count - queries_before).encode()
+                    message["headers"] = [*message.get("headers", ()), (DB_QUERIES_HEADER.encode(), queries)]
+            await send(message)
+
+        in_progress = self._in_progress_for(scope["path"])
+        if in_progress is not None:
+            in_progress.inc()
         start = time.perf_counter()
         had_exception = False
         try:
-            response = await call_next(request)
-            return response
+            await self.app(scope, receive, send_with_status)
         except Exception:
             had_exception = True
             raise
         finally:
             duration = time.perf_counter() - start
-            REQUESTS_IN_PROGRESS.labels(
-                path=path,
-                app_name=self.app_name,
-            ).dec()
-            REQUESTS_TOTAL.labels(
-                method=method,
-                path=path,
-                app_name=self.app_name,
-            ).inc()
-            # status_code доступен только после ответа
-            status_code = getattr(
-                locals().get("response", None),
-                "status_code",
-                500,
-            )
-            RESPONSES_TOTAL.labels(
-                path=path,
-                status_code=str(status_code),
-                app_name=self.app_name,
-            ).inc()
-            if had_exception or int(status_code) >= 500:
-                EXCEPTIONS_TOTAL.labels(app_name=self.app_name).inc()
-            REQUEST_DURATION.labels(
-                method=method,
-                path=path,
-                app_name=self.app_name,
-            ).observe(duration)
+            if token is not None:
+                QUERY_COUNTER.reset(token)
+            if in_progress is not None:
+                in_progress.dec()
+            metrics = self._route_metrics(scope)
+            metrics.duration.observe(duration)
+            metrics.requests.inc()
+            metrics.response(status_code).inc()
+            queries = counter.count - queries_before
+            metrics.db_queries.observe(queries)
+            if queries > self.query_budget:
+                logger.warning(
+                    f"{scope['method']} {metrics.path}: {queries} SQL-запросов при бюджете {self.query_budget}"
+                )
+            if had_exception or status_code >= 500:
+                self.exceptions.inc()
+
+    def _route_metrics(self, scope: Scope) -> _RouteMetrics:
+        path = self._path_label(scope.get("route"))
+        key = (scope["method"], path)
+        metrics = self._routes.get(key)
+        if metrics is None:
+            metrics = self._routes[key] = _RouteMetrics(scope["method"], path, self.app_name)
+        return metrics
+
+    def _path_label(self, route: Any) -> str:
+        """Шаблон маршрута; без маршрута (404) и сверх `max_paths` шаблонов — `other`."""
+        path = getattr(route, "path", None)
+        if path is None:
+            return OTHER_PATH
+        if path in self._static_paths or path in self._path_patterns:
+            return path
+        if len(self._static_paths) + len(self._path_patterns) >= self.max_paths:
+            if not self._overflowed:
+                self._overflowed = True
+                logger.warning(f"Метрики: больше {self.max_paths} шаблонов маршрутов, остальные пишутся в path=other")
+            return OTHER_PATH
+        if "{" in path:
+            self._path_patterns[path] = route.path_regex
+        else:
+            self._static_paths.add(path)
+        return path
+
+    def _in_progress_for(self, raw_path: str) -> Gauge | None:
+        if raw_path in self._static_paths:
+            path = raw_path
+        else:
+            path = next((p for p, regex in self._path_patterns.items() if regex.match(raw_path)), None)
+            if path is None:
+                return None
+        child = self._in_progress.get(path)
+        if child is None:
+            child = self._in_progress[path] = REQUESTS_IN_PROGRESS.labels(path=path, app_name=self.app_name)
+        return child
+
+
+def metrics_endpoint(request: Request) -> Response:
+    """Метрики в формате Prometheus (с multiprocess-режимом при PROMETHEUS_MULTIPROC_DIR)."""
+    registry = REGISTRY
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return Response(content=generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+
+
+class _SeriesCollector(Collector):
+    """app_metrics_series — сколько серий отдаёт /metrics (для контроля кардинальности)."""
+
+    def __init__(self, registry: CollectorRegistry) -> None:
+        self.registry = registry
+        # collect() этого коллектора вызывается изнутри registry.collect() — не считаем себя рекурсивно
+        self._local = threading.local()
+
+    def describe(self) -> list[GaugeMetricFamily]:
+        return [GaugeMetricFamily("app_metrics_series", "Число серий, которые отдаёт /metrics")]
+
+    def collect(self) -> Iterator[GaugeMetricFamily]:
+        if getattr(self._local, "collecting", False):
+            return
+        self._local.collecting = True
+        try:
+            total = sum(len(family.samples) for family in self.registry.collect())
+        finally:
+            self._local.collecting = False
+        yield GaugeMetricFamily("app_metrics_series", "Число серий, которые отдаёт /metrics", value=total + 1)
+
+
+REGISTRY.register(_SeriesCollector(REGISTRY))
 
 
-def setup_fastapi_metrics(app: FastAPI, app_name: str) -> None:
-    """Включает кастомные метрики fastapi_* для совместимости с дашбордом.
+def setup_fastapi_metrics(
+    app: FastAPI,
+    app_name: str,
+    max_paths: int = 200,
+    query_budget: int = 30,
+    debug: bool = False,
+) -> None:
+    """Включает метрики fastapi_* и эндпоинт `/metrics`.
 
-    Метрики публикуются на том же `/metrics` эндпоинте, который уже отдаёт
-    стандартные метрики через `prometheus-fastapi-instrumentator`.
+    Процессные метрики (process_*) для дашборда 13115 отдаёт prometheus_client
+    по умолчанию, отдельный инструментатор не нужен.
     """
     APP_INFO.info({"app_name": app_name})
     # Инициализация счётчиков, чтобы серии существовали сразу
     EXCEPTIONS_TOTAL.labels(app_name=app_name).inc(0)
-    app.add_middleware(_PrometheusMiddleware, app_name=app_name)
+    app.add_middleware(
+        PrometheusMiddleware,
+        app_name=app_name,
+        max_paths=max_paths,
+        query_budget=query_budget,
+        debug=debug,
+    )
+    app.add_api_route(METRICS_PATH, metrics_endpoint, methods=["GET"], include_in_schema=True)
@@ -10,3 +10,4 @@ from .deliveries import *
 from .payments import *
 from .car_reports import *
 from .reviews import *
+from .car_listing import *
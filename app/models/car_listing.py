@@ -0,0 +1,65 @@
+from datetime import datetime
+
+from sqlalchemy import TIMESTAMP, ForeignKey, Index, Integer, Numeric, String, Text
+from sqlalchemy import Enum as SQLEnum
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db import Base
+from app.models.cars import CarCondition, CarStatus, EngineType, Transmission
+
+
+class CarListing(Base):
+    """Карточка каталога: колонки авто, главное фото и агрегаты отзывов.
+
+    Денормализованная проекция только для чтения. Строки ведут триггеры БД
+    на cars, car_photos и reviews (миграция d41f6a7c3b20): при каждом изменении
+    пересчитываются только затронутые авто.
+    """
+
+    __tablename__: str = "car_listing"  # type: ignore[assignment]
+    __table_args__ = (
+        Index("ix_car_listing_make_model", "make", "model"),
+        Index("ix_car_listing_status", "status"),
+        Index("ix_car_listing_price_id", "price", "id"),
+        Index("ix_car_listing_year_id", "year", "id"),
+        Index("ix_car_listing_created_at_id", "created_at", "id"),
+    )
+
+    # id авто
+    id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("cars.id", ondelete="CASCADE"),
+        primary_key=True,
+        autoincrement=False,
+    )
+    vin: Mapped[str] = mapped_column(String(64), nullable=False)
+    make: Mapped[str] = mapped_column(String(64), nullable=False)
+    model: Mapped[str] = mapped_column(String(128), nullable=False)
+    year: Mapped[int] = mapped_column(Integer, nullable=False)
+    mileage: Mapped[int] = mapped_column(Integer, nullable=False)
+    price: Mapped[float] = mapped_column(Numeric(12, 2), nullable=False)
+    condition: Mapped[CarCondition] = mapped_column(
+        SQLEnum(CarCondition, name="car_condition"),
+        nullable=False,
+    )
+    color: Mapped[str] = mapped_column(String(64), nullable=False)
+    engine_type: Mapped[EngineType] = mapped_column(
+        SQLEnum(EngineType, name="engine_type"),
+        nullable=False,
+    )
+    transmission: Mapped[Transmission] = mapped_column(
+        SQLEnum(Transmission, name="transmission"),
+        nullable=False,
+    )
+    status: Mapped[CarStatus] = mapped_column(
+        SQLEnum(CarStatus, name="car_status"),
+        nullable=False,
+    )
+    description: Mapped[str | None] = mapped_column(Text, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(TIMESTAMP)
+
+    # url фото с is_main = true (первое по id), None — главного фото нет
+    main_photo_url: Mapped[str | None] = mapped_column(String(512), nullable=True)
+    # средняя оценка, None — отзывов нет
+    rating_avg: Mapped[float | None] = mapped_column(Numeric(3, 2), nullable=True)
+    reviews_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -2,8 +2,9 @@ from datetime import datetime
 from enum import StrEnum, unique
 from typing import TYPE_CHECKING
 
-from sqlalchemy import TIMESTAMP, Integer, Numeric, String, Text, func
+from sqlalchemy import TIMESTAMP, Column, Computed, Index, Integer, Numeric, String, Text, func, text
 from sqlalchemy import Enum as SQLEnum
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db import Base
@@ -43,8 +44,34 @@ class CarStatus(StrEnum):
     sold = "sold"
 
 
+# конфигурация полнотекстового поиска: без стемминга, марки и модели не переводятся
+SEARCH_CONFIG = "simple"
+# документ поиска по каталогу: марка и модель весомее цвета и описания
+SEARCH_VECTOR_SQL = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(make, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(model, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(color, '')), 'C') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'D')"
+)
+
+
 class Car(Base):
     __tablename__: str = "cars"  # type: ignore[assignment]
+    __table_args__ = (
+        # триграммы "марка модель" — поиск с опечатками (pg_trgm)
+        Index("ix_cars_make_model_trgm", text("(make || ' ' || model) gin_trgm_ops"), postgresql_using="gin"),
+        # фильтры и сортировки CarsDAO.filtered_query; id — добивка сортировки и ключ курсора.
+        # Каждый индекс обновляется при вставке (импорт, copy_many) и при bulk_update колонок
+        # индекса, поэтому составные — только под status, чья доля available падает по мере
+        # продаж; engine_type для этого недостаточно избирателен и идёт фильтром по (price, id)
+        Index("ix_cars_status_price_id", "status", "price", "id"),
+        Index("ix_cars_status_year_id", "status", "year", "id"),
+        Index("ix_cars_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_cars_make_model_year", "make", "model", "year"),
+        Index("ix_cars_price_id", "price", "id"),
+        Index("ix_cars_year_id", "year", "id"),
+        Index("ix_cars_created_at_id", "created_at", "id"),
+    )
     vin: Mapped[str] = mapped_column(
         String(64),
         unique=True,
@@ -102,3 +129,9 @@ class Car(Base):
         back_populates="car",
         cascade="all, delete-orphan",
     )
+
+
+# tsvector для /v1/cars/search считается в БД. Колонка есть только в таблице (для Alembic и
+# запросов Core), но не в маппинге: ORM-объекты Car её не грузят
+Car.__table__.append_column(Column("search_vector", TSVECTOR, Computed(SEARCH_VECTOR_SQL, persisted=True)))
+Index("ix_cars_search_vector", Car.__table__.c.search_vector, postgresql_using="gin")
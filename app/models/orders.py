@@ -5,11 +5,13 @@ from typing import TYPE_CHECKING
 from sqlalchemy import (
     TIMESTAMP,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
     Text,
     func,
+    text,
 )
 from sqlalchemy import Enum as SQLEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -43,6 +45,15 @@ class PaymentMethod(StrEnum):
 
 class Order(Base):
     __tablename__: str = "orders"  # type: ignore[assignment]
+    __table_args__ = (
+        # фильтры OrdersDAO.filtered_query (сортировка по id)
+        Index("ix_orders_status_id", "status", "id"),
+        Index("ix_orders_payment_method_id", "payment_method", "id"),
+        # поиск q: ilike '%...%' по имени, email и телефону (pg_trgm)
+        Index("ix_orders_customer_name_trgm", text("customer_name gin_trgm_ops"), postgresql_using="gin"),
+        Index("ix_orders_customer_email_trgm", text("customer_email gin_trgm_ops"), postgresql_using="gin"),
+        Index("ix_orders_customer_phone_trgm", text("customer_phone gin_trgm_ops"), postgresql_using="gin"),
+    )
     customer_name: Mapped[str] = mapped_column(String(128), nullable=False)
     customer_phone: Mapped[str] = mapped_column(String(64), nullable=False)
     customer_email: Mapped[str | None] = mapped_column(
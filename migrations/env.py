@@ -78,6 +78,8 @@ async def run_async_migrations() -> None:
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
         poolclass=pool.NullPool,
+        # при DB__PGBOUNCER=true — без именованных prepared statements
+        connect_args=APP_CONFIG.db.connect_args(),
     )
 
     async with connectable.connect() as connection:
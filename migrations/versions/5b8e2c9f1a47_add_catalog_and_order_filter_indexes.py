@@ -0,0 +1,58 @@
+"""add composite indexes for catalog and order filters
+
+Revision ID: 5b8e2c9f1a47
+Revises: d41f6a7c3b20
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5b8e2c9f1a47"
+down_revision: Union[str, Sequence[str], None] = "d41f6a7c3b20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (имя, таблица, колонки, using); должно совпадать с __table_args__ моделей Car и Order
+INDEXES = (
+    ("ix_cars_status_price_id", "cars", ["status", "price", "id"], None),
+    ("ix_cars_status_year_id", "cars", ["status", "year", "id"], None),
+    ("ix_cars_status_created_at_id", "cars", ["status", "created_at", "id"], None),
+    ("ix_cars_make_model_year", "cars", ["make", "model", "year"], None),
+    ("ix_cars_price_id", "cars", ["price", "id"], None),
+    ("ix_cars_year_id", "cars", ["year", "id"], None),
+    ("ix_cars_created_at_id", "cars", ["created_at", "id"], None),
+    ("ix_orders_status_id", "orders", ["status", "id"], None),
+    ("ix_orders_payment_method_id", "orders", ["payment_method", "id"], None),
+    ("ix_orders_customer_name_trgm", "orders", [sa.text("customer_name gin_trgm_ops")], "gin"),
+    ("ix_orders_customer_email_trgm", "orders", [sa.text("customer_email gin_trgm_ops")], "gin"),
+    ("ix_orders_customer_phone_trgm", "orders", [sa.text("customer_phone gin_trgm_ops")], "gin"),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # pg_trgm создаёт 7dee94f36126; CONCURRENTLY — без блокировки записи в cars/orders,
+    # но вне транзакции миграции
+    with op.get_context().autocommit_block():
+        for name, table, columns, using in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_using=using,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
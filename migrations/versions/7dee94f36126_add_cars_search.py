@@ -0,0 +1,62 @@
+"""add cars full-text and trigram search
+
+Revision ID: 7dee94f36126
+Revises: 9d2e23ddd836
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7dee94f36126"
+down_revision: Union[str, Sequence[str], None] = "9d2e23ddd836"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# должно совпадать с app.models.cars.SEARCH_VECTOR_SQL
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('simple', coalesce(make, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(model, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(color, '')), 'C') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'D')"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.add_column(
+        "cars",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR_SQL, persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_cars_search_vector",
+        "cars",
+        ["search_vector"],
+        postgresql_using="gin",
+    )
+    op.create_index(
+        "ix_cars_make_model_trgm",
+        "cars",
+        [sa.text("(make || ' ' || model) gin_trgm_ops")],
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_cars_make_model_trgm", table_name="cars")
+    op.drop_index("ix_cars_search_vector", table_name="cars")
+    op.drop_column("cars", "search_vector")
+    # расширение pg_trgm не удаляем: им могут пользоваться другие объекты БД
@@ -0,0 +1,157 @@
+"""add car_listing read model
+
+Revision ID: d41f6a7c3b20
+Revises: 7dee94f36126
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d41f6a7c3b20"
+down_revision: Union[str, Sequence[str], None] = "7dee94f36126"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CAR_COLUMNS = (
+    "id, vin, make, model, year, mileage, price, condition, color, engine_type, "
+    "transmission, status, description, created_at, updated_at"
+)
+
+LISTING_COLUMNS = [column.strip() for column in CAR_COLUMNS.split(",")] + [
+    "main_photo_url",
+    "rating_avg",
+    "reviews_count",
+]
+
+# пересобрать карточки переданных авто.
+# Сначала блокируются строки cars (FOR NO KEY UPDATE не мешает проверкам FK): параллельные
+# транзакции по одному авто пересчитывают карточку по очереди, и следующий запрос функции
+# уже видит закоммиченные изменения предыдущей. Затем upsert, а удаляются только карточки
+# авто, которых больше нет.
+REFRESH_FUNCTION_SQL = f"""
+CREATE FUNCTION car_listing_refresh(car_ids integer[]) RETURNS void
+LANGUAGE sql AS $$
+    SELECT 1 FROM cars WHERE id = ANY(car_ids) ORDER BY id FOR NO KEY UPDATE;
+    INSERT INTO car_listing ({", ".join(LISTING_COLUMNS)})
+    SELECT {", ".join(f"c.{column.strip()}" for column in CAR_COLUMNS.split(","))},
+           photo.url, rating.avg, rating.count
+    FROM cars c
+    LEFT JOIN LATERAL (
+        SELECT p.url FROM car_photos p WHERE p.car_id = c.id AND p.is_main ORDER BY p.id LIMIT 1
+    ) photo ON true
+    CROSS JOIN LATERAL (
+        SELECT round(avg(r.rating), 2) AS avg, count(*) AS count FROM reviews r WHERE r.car_id = c.id
+    ) rating
+    WHERE c.id = ANY(car_ids)
+    ON CONFLICT (id) DO UPDATE SET
+        {", ".join(f"{column} = EXCLUDED.{column}" for column in LISTING_COLUMNS[1:])};
+    DELETE FROM car_listing l
+    WHERE l.id = ANY(car_ids) AND NOT EXISTS (SELECT 1 FROM cars c WHERE c.id = l.id);
+$$
+"""
+
+# statement-level: пачка из импорта пересчитывается одним вызовом, а не построчно.
+# TG_ARGV[0] — колонка с id авто в таблице-источнике
+SYNC_FUNCTION_SQL = """
+CREATE FUNCTION car_listing_sync() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    car_ids integer[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        EXECUTE format('SELECT array_agg(DISTINCT %I) FROM new_rows', TG_ARGV[0]) INTO car_ids;
+    ELSIF TG_OP = 'DELETE' THEN
+        EXECUTE format('SELECT array_agg(DISTINCT %I) FROM old_rows', TG_ARGV[0]) INTO car_ids;
+    ELSE
+        EXECUTE format(
+            'SELECT array_agg(DISTINCT %1$I) FROM (SELECT %1$I FROM new_rows UNION SELECT %1$I FROM old_rows) t',
+            TG_ARGV[0]
+        ) INTO car_ids;
+    END IF;
+    IF car_ids IS NOT NULL THEN
+        PERFORM car_listing_refresh(car_ids);
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+# (таблица, колонка с id авто, события); удаление авто убирает карточку через ON DELETE CASCADE
+TRIGGERS = (
+    ("cars", "id", ("INSERT", "UPDATE")),
+    ("car_photos", "car_id", ("INSERT", "UPDATE", "DELETE")),
+    ("reviews", "car_id", ("INSERT", "UPDATE", "DELETE")),
+)
+
+TRANSITION_TABLES = {
+    "INSERT": "NEW TABLE AS new_rows",
+    "UPDATE": "OLD TABLE AS old_rows NEW TABLE AS new_rows",
+    "DELETE": "OLD TABLE AS old_rows",
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "car_listing",
+        sa.Column("id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("vin", sa.String(length=64), nullable=False),
+        sa.Column("make", sa.String(length=64), nullable=False),
+        sa.Column("model", sa.String(length=128), nullable=False),
+        sa.Column("year", sa.Integer(), nullable=False),
+        sa.Column("mileage", sa.Integer(), nullable=False),
+        sa.Column("price", sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.Column("condition", postgresql.ENUM(name="car_condition", create_type=False), nullable=False),
+        sa.Column("color", sa.String(length=64), nullable=False),
+        sa.Column("engine_type", postgresql.ENUM(name="engine_type", create_type=False), nullable=False),
+        sa.Column("transmission", postgresql.ENUM(name="transmission", create_type=False), nullable=False),
+        sa.Column("status", postgresql.ENUM(name="car_status", create_type=False), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.TIMESTAMP(), server_default=sa.text("now()"), nullable=True),
+        sa.Column("updated_at", sa.TIMESTAMP(), nullable=True),
+        sa.Column("main_photo_url", sa.String(length=512), nullable=True),
+        sa.Column("rating_avg", sa.Numeric(precision=3, scale=2), nullable=True),
+        sa.Column("reviews_count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["id"], ["cars.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_car_listing_make_model", "car_listing", ["make", "model"])
+    op.create_index("ix_car_listing_status", "car_listing", ["status"])
+    op.create_index("ix_car_listing_price_id", "car_listing", ["price", "id"])
+    op.create_index("ix_car_listing_year_id", "car_listing", ["year", "id"])
+    op.create_index("ix_car_listing_created_at_id", "car_listing", ["created_at", "id"])
+
+    op.execute(REFRESH_FUNCTION_SQL)
+    op.execute(SYNC_FUNCTION_SQL)
+    for table, column, events in TRIGGERS:
+        for event in events:
+            op.execute(
+                f"CREATE TRIGGER {table}_car_listing_{event.lower()} AFTER {event} ON {table} "
+                f"REFERENCING {TRANSITION_TABLES[event]} "
+                f"FOR EACH STATEMENT EXECUTE FUNCTION car_listing_sync('{column}')",
+            )
+
+    # начальное заполнение одним запросом
+    op.execute("SELECT car_listing_refresh(array_agg(id)) FROM cars")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, _, events in TRIGGERS:
+        for event in events:
+            op.execute(f"DROP TRIGGER IF EXISTS {table}_car_listing_{event.lower()} ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS car_listing_sync()")
+    op.execute("DROP FUNCTION IF EXISTS car_listing_refresh(integer[])")
+    op.drop_index("ix_car_listing_created_at_id", table_name="car_listing")
+    op.drop_index("ix_car_listing_year_id", table_name="car_listing")
+    op.drop_index("ix_car_listing_price_id", table_name="car_listing")
+    op.drop_index("ix_car_listing_status", table_name="car_listing")
+    op.drop_index("ix_car_listing_make_model", table_name="car_listing")
+    op.drop_table("car_listing")
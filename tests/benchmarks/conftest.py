@@ -0,0 +1,33 @@
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import pytest
+
+# строки отчёта, печатаются в конце прогона (pytest -m benchmark)
+_REPORT: list[str] = []
+
+
+def pytest_terminal_summary(terminalreporter: Any) -> None:
+    if _REPORT:
+        terminalreporter.section("benchmarks")
+        for line in _REPORT:
+            terminalreporter.write_line(line)
+
+
+@pytest.fixture
+def report() -> Callable[[str], None]:
+    """Добавить строку в сводку бенчмарков."""
+    return _REPORT.append
+
+
+@pytest.fixture
+def timed() -> Callable[[Callable[[], Awaitable[Any]]], Awaitable[float]]:
+    """Время выполнения корутины в секундах."""
+
+    async def measure(call: Callable[[], Awaitable[Any]]) -> float:
+        started = time.perf_counter()
+        await call()
+        return time.perf_counter() - started
+
+    return measure
@@ -0,0 +1,79 @@
+"""Массовая вставка авто: add_many (ORM) против insert_many, copy_many и пути импорта.
+
+uv run pytest -m benchmark tests/benchmarks/test_bulk_insert_bench.py (нужна TEST_DATABASE_URL)
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.api.cars.schemas import CarCreate
+from app.dao.cars import CarsDAO
+from app.models.cars import Car
+
+pytestmark = pytest.mark.benchmark
+
+# пачка импорта по умолчанию (import_cars, batch_size)
+IMPORT_BATCH = 1000
+
+
+async def _import(session: AsyncSession, cars: list[CarCreate]) -> None:
+    # как _flush_import_batch, но без коммита на каждую пачку
+    for start in range(0, len(cars), IMPORT_BATCH):
+        await CarsDAO.insert_skip_existing_vin(
+            session, [car.model_dump() for car in cars[start : start + IMPORT_BATCH]]
+        )
+
+
+VARIANTS: dict[str, Callable[[AsyncSession, list[CarCreate]], Awaitable[Any]]] = {
+    "add_many": CarsDAO.add_many,
+    "insert_many": CarsDAO.insert_many,
+    "copy_many": CarsDAO.copy_many,
+    "import": _import,
+}
+
+
+@pytest.mark.parametrize("variant", list(VARIANTS))
+@pytest.mark.parametrize("rows", [1_000, 10_000, 100_000])
+def test_bulk_insert(
+    session_maker: async_sessionmaker[AsyncSession],
+    timed: Callable[[Callable[[], Awaitable[Any]]], Awaitable[float]],
+    report: Callable[[str], None],
+    rows: int,
+    variant: str,
+) -> None:
+    cars = [
+        CarCreate(
+            vin=f"VIN{i}",
+            make="Toyota",
+            model=f"Model {i % 40}",
+            year=2000 + i % 25,
+            mileage=i,
+            price=10000 + i,
+            condition="used",
+            color="white",
+            engine_type="gasoline",
+            transmission="automatic",
+            description=f"car {i}",
+        )
+        for i in range(rows)
+    ]
+
+    async def run() -> tuple[float, int]:
+        async with session_maker() as session:
+
+            async def insert_and_commit() -> None:
+                await VARIANTS[variant](session, cars)
+                await session.commit()
+
+            elapsed = await timed(insert_and_commit)
+            return elapsed, await session.scalar(select(func.count()).select_from(Car))
+
+    elapsed, inserted = asyncio.run(run())
+
+    assert inserted == rows
+    report(f"bulk_insert {variant:>12} {rows:>7} строк: {elapsed:7.2f} с, {rows / elapsed:>9.0f} строк/с")
@@ -0,0 +1,85 @@
+"""bulk_update (UPDATE ... FROM unnest) против UPDATE на каждую запись и executemany.
+
+uv run pytest -m benchmark tests/benchmarks/test_bulk_update_bench.py (нужна TEST_DATABASE_URL)
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import pytest
+from pydantic import BaseModel
+from sqlalchemy import bindparam, text, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.dao.cars import CarsDAO
+from app.models.cars import Car
+
+pytestmark = pytest.mark.benchmark
+
+CARS_SQL = """
+    INSERT INTO cars (vin, make, model, year, mileage, price, condition, color,
+                      engine_type, transmission, status)
+    SELECT 'VIN' || i, 'Toyota', 'Camry', 2020, i, 10000 + i, 'used', 'white',
+           'gasoline', 'automatic', 'available'
+    FROM generate_series(1, :rows) AS i
+"""
+
+
+class CarPricePatch(BaseModel):
+    id: int
+    price: float
+    status: str
+
+
+async def _per_row(session: AsyncSession, patches: list[CarPricePatch]) -> None:
+    # прежняя реализация bulk_update: UPDATE на каждую запись
+    for patch in patches:
+        await session.execute(update(Car).where(Car.id == patch.id).values(price=patch.price, status=patch.status))
+
+
+async def _executemany(session: AsyncSession, patches: list[CarPricePatch]) -> None:
+    table = Car.__table__
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam("b_id"))
+        .values(price=bindparam("b_price"), status=bindparam("b_status"))
+    )
+    await session.execute(stmt, [{"b_id": p.id, "b_price": p.price, "b_status": p.status} for p in patches])
+
+
+async def _bulk_update(session: AsyncSession, patches: list[CarPricePatch]) -> None:
+    await CarsDAO.bulk_update(session, patches)
+
+
+VARIANTS = {"per_row": _per_row, "executemany": _executemany, "bulk_update": _bulk_update}
+
+
+@pytest.mark.parametrize("variant", list(VARIANTS))
+@pytest.mark.parametrize("rows", [1_000, 10_000, 100_000])
+def test_bulk_update(
+    session_maker: async_sessionmaker[AsyncSession],
+    timed: Callable[[Callable[[], Awaitable[Any]]], Awaitable[float]],
+    report: Callable[[str], None],
+    rows: int,
+    variant: str,
+) -> None:
+    patches = [CarPricePatch(id=i, price=i * 1.5, status="reserved") for i in range(1, rows + 1)]
+
+    async def run() -> tuple[float, int]:
+        async with session_maker() as session:
+            await session.execute(text(CARS_SQL), {"rows": rows})
+            await session.commit()
+
+            async def update_and_commit() -> None:
+                await VARIANTS[variant](session, patches)
+                await session.commit()
+
+            elapsed = await timed(update_and_commit)
+            changed = await session.scalar(text("SELECT count(*) FROM cars WHERE status = 'reserved'"))
+            return elapsed, changed
+
+    elapsed, changed = asyncio.run(run())
+
+    assert changed == rows
+    report(f"bulk_update {variant:>12} {rows:>7} строк: {elapsed:7.2f} с, {rows / elapsed:>9.0f} строк/с")
@@ -0,0 +1,95 @@
+"""GET /v1/cars/: запросов в секунду и время удержания соединения с release_connection и без него.
+
+uv run pytest -m benchmark tests/benchmarks/test_cars_list_bench.py (нужна TEST_DATABASE_URL)
+"""
+
+import asyncio
+import os
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import httpx
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.api.cars import routers as cars_routers
+from app.application import create_app
+from app.core.settings import APP_CONFIG
+
+pytestmark = pytest.mark.benchmark
+
+ROWS = 1_000
+REQUESTS = 1_000
+POOL_SIZE = 4
+
+CARS_SQL = """
+    INSERT INTO cars (vin, make, model, year, mileage, price, condition, color,
+                      engine_type, transmission, status, description)
+    SELECT 'VIN' || i, 'Toyota', 'Model ' || i % 40, 2000 + i % 25, i, 10000 + i, 'used', 'white',
+           'gasoline', 'automatic', 'available', 'car ' || i
+    FROM generate_series(1, :rows) AS i
+"""
+
+
+async def _hold_connection(session: AsyncSession) -> None:
+    # соединение остаётся у сессии до закрытия зависимости, как до release_connection
+    return None
+
+
+@pytest.mark.parametrize("variant", ["release", "hold"])
+@pytest.mark.parametrize("limit", [20, 100])
+@pytest.mark.parametrize("clients", [1, 32])
+def test_cars_list_rps(
+    session_maker: async_sessionmaker[AsyncSession],
+    timed: Callable[[Callable[[], Awaitable[Any]]], Awaitable[float]],
+    report: Callable[[str], None],
+    monkeypatch: pytest.MonkeyPatch,
+    clients: int,
+    limit: int,
+    variant: str,
+) -> None:
+    if variant == "hold":
+        monkeypatch.setattr(cars_routers, "release_connection", _hold_connection)
+
+    async def run() -> tuple[float, float]:
+        async with session_maker() as session:
+            await session.execute(text(CARS_SQL), {"rows": ROWS})
+            await session.commit()
+
+        engine = create_async_engine(os.environ["TEST_DATABASE_URL"], pool_size=POOL_SIZE, max_overflow=0)
+        # суммарное время между checkout и checkin соединений пула
+        held = [0.0]
+
+        @event.listens_for(engine.sync_engine.pool, "checkout")
+        def checkout(dbapi_connection: Any, record: Any, proxy: Any) -> None:
+            record.info["checked_out_at"] = time.perf_counter()
+
+        @event.listens_for(engine.sync_engine.pool, "checkin")
+        def checkin(dbapi_connection: Any, record: Any) -> None:
+            held[0] += time.perf_counter() - record.info.pop("checked_out_at")
+
+        app = create_app(APP_CONFIG)
+        app.state.session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        pending = iter(range(REQUESTS))
+        try:
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+
+                async def worker() -> None:
+                    for _ in pending:
+                        (await client.get("/v1/cars/", params={"limit": limit})).raise_for_status()
+
+                async def load() -> None:
+                    await asyncio.gather(*(worker() for _ in range(clients)))
+
+                return await timed(load), held[0] / REQUESTS
+        finally:
+            await engine.dispose()
+
+    elapsed, held = asyncio.run(run())
+
+    report(
+        f"cars_list {variant:>8} limit={limit:>3} пул={POOL_SIZE} клиентов={clients:>2}: "
+        f"{REQUESTS / elapsed:>6.0f} запросов/с, соединение занято {held * 1e3:5.2f} мс/запрос"
+    )
@@ -0,0 +1,67 @@
+"""Пропускная способность чтения каталога: напрямую в PostgreSQL (пул SQLAlchemy) против PgBouncer.
+
+uv run pytest -m benchmark tests/benchmarks/test_pgbouncer_bench.py (нужны TEST_DATABASE_URL и PGBOUNCER_URL)
+"""
+
+import asyncio
+import os
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.api.cars.schemas import CarRead
+from app.core.settings import DbConfig
+from app.dao.cars import CarsDAO
+
+pytestmark = pytest.mark.benchmark
+
+ROWS = 10_000
+QUERIES = 2_000
+
+
+@pytest.mark.parametrize("clients", [8, 64])
+@pytest.mark.parametrize("variant", ["direct", "pgbouncer"])
+def test_pgbouncer_throughput(
+    pgbouncer_url: str,
+    truncate_tables: Callable[[], None],
+    seed_catalog: Callable[[int], None],
+    timed: Callable[[Callable[[], Awaitable[Any]]], Awaitable[float]],
+    report: Callable[[str], None],
+    variant: str,
+    clients: int,
+) -> None:
+    truncate_tables()
+    seed_catalog(ROWS)
+    # настройки, с которыми приложение работает в каждом из режимов (DB__PGBOUNCER)
+    config = DbConfig(pgbouncer=variant == "pgbouncer")  # type: ignore[call-arg]
+    url = pgbouncer_url if variant == "pgbouncer" else os.environ["TEST_DATABASE_URL"]
+
+    async def run() -> float:
+        engine = create_async_engine(url, **config.engine_options())
+        session_maker = async_sessionmaker(engine, class_=AsyncSession)
+        pending = iter(range(QUERIES))
+
+        async def worker() -> None:
+            # сессия на запрос, как у get_session_without_commit
+            for i in pending:
+                async with session_maker() as session:
+                    await CarsDAO.find_filtered_rows(
+                        session, CarRead, status="available", sort_by="price", offset=i % 100
+                    )
+
+        async def load() -> None:
+            await asyncio.gather(*(worker() for _ in range(clients)))
+
+        try:
+            await load()  # прогрев пула и кэша
+            pending = iter(range(QUERIES))
+            return await timed(load)
+        finally:
+            await engine.dispose()
+
+    elapsed = asyncio.run(run())
+
+    report(f"pgbouncer {variant:>9} клиентов={clients:>2}: {QUERIES / elapsed:>6.0f} запросов/с")
+    truncate_tables()
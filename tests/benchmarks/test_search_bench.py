@@ -0,0 +1,75 @@
+"""Задержка поиска по каталогу (CarsDAO.search_rows) на 100k и 300k авто.
+
+uv run pytest -m benchmark tests/benchmarks/test_search_bench.py (нужна TEST_DATABASE_URL)
+"""
+
+import asyncio
+import statistics
+from collections.abc import Awaitable, Callable, Iterator
+from typing import Any
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.api.cars.schemas import CarRead
+from app.dao.cars import CarsDAO
+
+pytestmark = pytest.mark.benchmark
+
+RUNS = 10
+
+# запрос -> фильтры search_rows
+QUERIES: dict[str, tuple[str, dict[str, Any]]] = {
+    # частая марка: ~20% каталога совпадает, ранжируется всё
+    "make": ("toyota", {}),
+    # марка в make и в описаниях: ~40% каталога
+    "make+description": ("bmw", {}),
+    "make+model": ("bmw model 11", {}),
+    # опечатка: только триграммы по "марка модель"
+    "typo": ("Toyotta", {}),
+    "make+filters": ("toyota", {"status": "available", "price_max": 50000, "year_min": 2010}),
+}
+
+
+@pytest.fixture(scope="module", params=[100_000, 300_000], ids=lambda rows: f"{rows // 1000}k")
+def catalog(
+    request: pytest.FixtureRequest,
+    db_engine: AsyncEngine,
+    truncate_tables: Callable[[], None],
+    seed_catalog: Callable[[int], None],
+) -> Iterator[int]:
+    truncate_tables()
+    seed_catalog(request.param)
+    yield request.param
+    truncate_tables()
+
+
+@pytest.mark.parametrize("query", list(QUERIES))
+def test_search_latency(
+    catalog: int,
+    db_engine: AsyncEngine,
+    timed: Callable[[Callable[[], Awaitable[Any]]], Awaitable[float]],
+    report: Callable[[str], None],
+    query: str,
+) -> None:
+    q, filters = QUERIES[query]
+    session_maker = async_sessionmaker(db_engine, class_=AsyncSession)
+
+    async def run() -> tuple[list[float], int]:
+        async with session_maker() as session:
+
+            async def search() -> None:
+                rows[:] = await CarsDAO.search_rows(session, CarRead, q, **filters)
+
+            rows: list[Any] = []
+            # первый прогон прогревает shared buffers
+            await search()
+            return [await timed(search) for _ in range(RUNS)], len(rows)
+
+    timings, found = asyncio.run(run())
+
+    assert found
+    report(
+        f"search {catalog:>7} авто {query:>16} ({q!r}): медиана {statistics.median(timings) * 1e3:6.1f} мс, "
+        f"макс {max(timings) * 1e3:6.1f} мс"
+    )
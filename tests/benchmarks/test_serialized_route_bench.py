@@ -0,0 +1,93 @@
+"""Страница каталога через стандартный путь FastAPI (APIRoute + JSONResponse) против SerializedRoute.
+
+uv run pytest -m benchmark tests/benchmarks/test_serialized_route_bench.py (БД не нужна)
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+from typing import Any
+
+import httpx
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+
+from app.api.cars.schemas import CarRead
+from app.api.responses import SerializedJSONResponse, SerializedRoute
+
+pytestmark = pytest.mark.benchmark
+
+REQUESTS = 1_000
+
+VARIANTS: dict[str, tuple[type[APIRoute], type[JSONResponse]]] = {
+    "default": (APIRoute, JSONResponse),
+    "serialized": (SerializedRoute, SerializedJSONResponse),
+}
+
+
+def _page(size: int) -> list[CarRead]:
+    now = datetime(2024, 5, 1, tzinfo=UTC)
+    return [
+        CarRead(
+            id=i,
+            vin=f"VIN{i}",
+            make="Toyota",
+            model=f"Model {i % 40}",
+            year=2000 + i % 25,
+            mileage=i * 1000,
+            price=10000 + i,
+            condition="used",
+            color="white",
+            engine_type="gasoline",
+            transmission="automatic",
+            description=f"Автомобиль {i}, один владелец",
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(size)
+    ]
+
+
+def _app(variant: str, page: list[CarRead]) -> FastAPI:
+    route_class, response_class = VARIANTS[variant]
+    router = APIRouter(route_class=route_class)
+
+    # как list_cars: эндпоинт отдаёт готовые экземпляры CarRead
+    @router.get("/cars", response_model=list[CarRead])
+    async def list_cars() -> Any:
+        return page
+
+    app = FastAPI(default_response_class=response_class)
+    app.include_router(router)
+    return app
+
+
+@pytest.mark.parametrize("variant", list(VARIANTS))
+@pytest.mark.parametrize("size", [20, 100])
+def test_serialized_route(
+    timed: Callable[[Callable[[], Awaitable[Any]]], Awaitable[float]],
+    report: Callable[[str], None],
+    size: int,
+    variant: str,
+) -> None:
+    app = _app(variant, _page(size))
+
+    async def run() -> tuple[float, bytes]:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            body = (await client.get("/cars")).content
+
+            async def requests() -> None:
+                for _ in range(REQUESTS):
+                    (await client.get("/cars")).raise_for_status()
+
+            return await timed(requests), body
+
+    elapsed, body = asyncio.run(run())
+
+    assert body.count(b'"vin"') == size
+    report(
+        f"serialized_route {variant:>10} {size:>4} авто: {elapsed / REQUESTS * 1e6:7.0f} мкс/запрос, "
+        f"{REQUESTS / elapsed:>7.0f} запросов/с"
+    )
@@ -0,0 +1,209 @@
+import asyncio
+import os
+from collections.abc import Callable, Iterator
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+# обязательные настройки AppConfig: без них не импортируется app.core.settings.
+# Уже заданные переменные окружения не перетираются
+for name, value in {
+    "DB__USER": "postgres",
+    "DB__PASSWORD": "postgres",
+    "DB__HOST": "localhost",
+    "DB__PORT": "5432",
+    "DB__NAME": "rental_car_test",
+    "APP_HOST": "127.0.0.1",
+    "APP_PORT": "8000",
+    "WORKERS": "1",
+    "RELOAD": "false",
+    "FS__KAFKA_URL": "localhost:29092",
+    "FS__SUBJECT": "user-register",
+}.items():
+    os.environ.setdefault(name, value)
+
+from app import models
+
+# отдельная БД с расширением pg_trgm; без переменной тесты с БД пропускаются
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+# PgBouncer (pool_mode = transaction) перед той же БД; без переменной тесты через него пропускаются
+PGBOUNCER_URL = os.environ.get("PGBOUNCER_URL")
+
+# пользователь 1 с заказами, авто 1 с фото, отчётами и отзывами; у связей по несколько строк,
+# чтобы ленивые загрузки и N+1 проявлялись в тестах
+SAMPLE_DATA_SQL = (
+    "INSERT INTO users (email, phone, hashed_password, is_active, role) "
+    "VALUES ('ivan@example.com', '+79000000000', 'x', true, 'customer')",
+    """
+    INSERT INTO cars (vin, make, model, year, mileage, price, condition, color,
+                      engine_type, transmission, status, description)
+    SELECT 'VIN' || i, 'Toyota', 'Camry', 2018 + i, 1000 * i, 20000 + i, 'used', 'white',
+           'gasoline', 'automatic', 'available', 'один владелец'
+    FROM generate_series(1, 3) AS i
+    """,
+    """
+    INSERT INTO orders (customer_name, customer_phone, customer_email, car_id, user_id,
+                        status, payment_method, total_amount)
+    SELECT 'Ivan', '+79000000000', 'ivan@example.com', i, 1, 'paid', 'card', 20000 + i
+    FROM generate_series(1, 3) AS i
+    """,
+    """
+    INSERT INTO payments (order_id, amount, status, payment_type)
+    SELECT 1, 10000, 'paid', 'installment' FROM generate_series(1, 2)
+    """,
+    "INSERT INTO deliveries (order_id, status) SELECT i, 'pending' FROM generate_series(1, 3) AS i",
+    "INSERT INTO reviews (customer_name, car_id, user_id, rating) SELECT 'Ivan', 1, 1, i FROM generate_series(3, 5) AS i",
+    """
+    INSERT INTO car_photos (car_id, url, is_main)
+    SELECT 1, 'https://example.com/' || i || '.jpg', i = 1 FROM generate_series(1, 3) AS i
+    """,
+    """
+    INSERT INTO car_reports (car_id, report_type, data)
+    VALUES (1, 'vin_check', '{"ok": true}'), (1, 'technical_inspection', '{"ok": true}')
+    """,
+    """
+    INSERT INTO car_listing (id, vin, make, model, year, mileage, price, condition, color,
+                             engine_type, transmission, status, description, created_at,
+                             updated_at, main_photo_url, rating_avg, reviews_count)
+    SELECT id, vin, make, model, year, mileage, price, condition, color, engine_type,
+           transmission, status, description, created_at, updated_at,
+           CASE WHEN id = 1 THEN 'https://example.com/1.jpg' END,
+           CASE WHEN id = 1 THEN 4 END, CASE WHEN id = 1 THEN 3 ELSE 0 END
+    FROM cars
+    """,
+)
+
+
+async def _run_schema(engine: AsyncEngine, create: bool) -> None:
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        await conn.run_sync(models.Base.metadata.drop_all)
+        if create:
+            await conn.run_sync(models.Base.metadata.create_all)
+    await engine.dispose()
+
+
+# каталог для планов и замеров: статусы с перекосом (фильтр по редкому значению должен идти
+# по составному индексу, а не по индексу сортировки с отбрасыванием строк), в описаниях
+# встречаются марки — для проверки ранжирования поиска
+CATALOG_SQL = (
+    """
+    INSERT INTO cars (vin, make, model, year, mileage, price, condition, color,
+                      engine_type, transmission, status, description, created_at, updated_at)
+    SELECT 'VIN' || i,
+           (ARRAY['Toyota', 'BMW', 'Audi', 'Kia', 'Lada'])[1 + i % 5],
+           'Model ' || i % 40,
+           1995 + i % 30,
+           i % 300000,
+           1000 + (i * 37) % 150000,
+           CASE WHEN i % 2 = 0 THEN 'new' ELSE 'used' END::car_condition,
+           'color ' || i % 10,
+           CASE WHEN i % 20 = 0 THEN 'electric' ELSE 'gasoline' END::engine_type,
+           'automatic'::transmission,
+           CASE WHEN i % 20 = 0 THEN 'available' ELSE 'sold' END::car_status,
+           (ARRAY['один владелец', 'полный привод', 'гаражное хранение', 'обслуживался у дилера BMW'])[1 + i % 4],
+           now() - i * interval '1 minute',
+           now() - i * interval '1 minute'
+    FROM generate_series(1, :rows) AS i
+    """,
+    """
+    INSERT INTO orders (customer_name, customer_phone, customer_email, car_id, status,
+                        payment_method, total_amount)
+    SELECT 'Customer ' || md5(i::text),
+           '+7' || (9000000000 + i),
+           'user' || i || '@example.com',
+           1 + i % :rows,
+           CASE WHEN i % 20 = 0 THEN 'paid' ELSE 'completed' END::order_status,
+           CASE WHEN i % 20 = 0 THEN 'lease' ELSE 'card' END::payment_method,
+           1000 + i % 100000
+    FROM generate_series(1, :rows) AS i
+    """,
+)
+
+
+async def _seed_catalog(engine: AsyncEngine, rows: int) -> None:
+    async with engine.begin() as conn:
+        for sql in CATALOG_SQL:
+            await conn.execute(text(sql), {"rows": rows})
+    # VACUUM вне транзакции: без него GIN-индексы остаются с неслитым pending list
+    # (строки вставлены после создания индекса), и планировщик их недооценивает
+    async with engine.connect() as conn:
+        autocommit = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await autocommit.execute(text("VACUUM ANALYZE cars, orders"))
+    await engine.dispose()
+
+
+async def _seed_sample_data(session_maker: async_sessionmaker[AsyncSession]) -> None:
+    async with session_maker() as session:
+        for sql in SAMPLE_DATA_SQL:
+            await session.execute(text(sql))
+        await session.commit()
+
+
+async def _truncate(engine: AsyncEngine) -> None:
+    tables = ", ".join(table.name for table in models.Base.metadata.sorted_tables)
+    async with engine.begin() as conn:
+        await conn.execute(text(f"TRUNCATE {tables} RESTART IDENTITY CASCADE"))
+    await engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def db_engine() -> Iterator[AsyncEngine]:
+    """Engine тестовой БД; схема создаётся из моделей на всю сессию и удаляется в конце.
+
+    NullPool: тесты гоняют корутины в своих asyncio.run, соединение не должно
+    пережить цикл событий, в котором открыто.
+    """
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL не задан")
+    engine = create_async_engine(TEST_DATABASE_URL, poolclass=NullPool)
+    asyncio.run(_run_schema(engine, create=True))
+    yield engine
+    asyncio.run(_run_schema(engine, create=False))
+
+
+@pytest.fixture(scope="session")
+def pgbouncer_url(db_engine: AsyncEngine) -> str:
+    """URL тестовой БД через PgBouncer; схему создаёт db_engine напрямую."""
+    if not PGBOUNCER_URL:
+        pytest.skip("PGBOUNCER_URL не задан")
+    return PGBOUNCER_URL
+
+
+@pytest.fixture(scope="session")
+def truncate_tables(db_engine: AsyncEngine) -> Callable[[], None]:
+    """Очистить все таблицы тестовой БД (для фикстур с данными на модуль)."""
+    return lambda: asyncio.run(_truncate(db_engine))
+
+
+@pytest.fixture(scope="session")
+def seed_catalog(db_engine: AsyncEngine) -> Callable[[int], None]:
+    """Заполнить пустые cars и orders по `rows` строк (CATALOG_SQL) и собрать статистику."""
+    return lambda rows: asyncio.run(_seed_catalog(db_engine, rows))
+
+
+@pytest.fixture
+def session_maker(db_engine: AsyncEngine, truncate_tables: Callable[[], None]) -> async_sessionmaker[AsyncSession]:
+    """Фабрика сессий к пустой тестовой БД: таблицы очищаются перед каждым тестом."""
+    truncate_tables()
+    return async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+@pytest.fixture
+def sample_data(session_maker: async_sessionmaker[AsyncSession]) -> None:
+    """Небольшой связанный набор данных (SAMPLE_DATA_SQL) в пустой тестовой БД."""
+    asyncio.run(_seed_sample_data(session_maker))
+
+
+@pytest.fixture
+def client(session_maker: async_sessionmaker[AsyncSession]) -> TestClient:
+    """Приложение на тестовой БД без lifespan (Kafka и пул из настроек не нужны)."""
+    from app.application import create_app
+    from app.core.settings import APP_CONFIG
+
+    app = create_app(APP_CONFIG)
+    app.state.session_maker = session_maker
+    return TestClient(app)
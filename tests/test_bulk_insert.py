@@ -0,0 +1,153 @@
+"""BaseDAO.insert_many / copy_many: порядок id, Python-дефолты и pydantic-типы (нужна TEST_DATABASE_URL)."""
+
+import asyncio
+from typing import Any
+
+import pytest
+from pydantic import BaseModel, EmailStr, HttpUrl
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.dao.base import BaseDAO
+from app.dao.car_photos import CarPhotosDAO
+from app.dao.cars import CarsDAO
+from app.dao.orders import OrdersDAO
+
+
+class CarIn(BaseModel):
+    """Авто без status: значение должен подставить default колонки."""
+
+    vin: str
+    make: str
+    model: str
+    year: int
+    mileage: int
+    price: float
+    condition: str
+    color: str
+    engine_type: str
+    transmission: str
+    description: str | None = None
+
+
+def _car(vin: str, **extra: Any) -> CarIn:
+    # поля задаются явно: DAO берут model_dump(exclude_unset=True)
+    return CarIn(
+        vin=vin,
+        make="Toyota",
+        model="Camry",
+        year=2020,
+        mileage=0,
+        price=10000,
+        condition="used",
+        color="white",
+        engine_type="gasoline",
+        transmission="automatic",
+        **extra,
+    )
+
+
+class PhotoIn(BaseModel):
+    car_id: int
+    url: HttpUrl
+
+
+class OrderIn(BaseModel):
+    customer_name: str
+    customer_phone: str
+    customer_email: EmailStr
+    car_id: int
+    status: str
+    payment_method: str
+    total_amount: float
+
+
+def _order(customer_email: str) -> OrderIn:
+    return OrderIn(
+        customer_name="Ivan",
+        customer_phone="+79000000000",
+        customer_email=customer_email,
+        car_id=1,
+        status="pending",
+        payment_method="card",
+        total_amount=100,
+    )
+
+
+async def _insert(
+    session_maker: async_sessionmaker[AsyncSession],
+    dao: type[BaseDAO],
+    method: str,
+    records: list[BaseModel],
+    query: str,
+    with_car: bool = False,
+) -> tuple[Any, list[Any]]:
+    async with session_maker() as session:
+        if with_car:
+            await CarsDAO.insert_many(session, [_car("PARENT")])
+        result = await getattr(dao, method)(session, records)
+        await session.commit()
+        return result, list((await session.execute(text(query))).all())
+
+
+def test_insert_many_returns_ids_in_input_order(session_maker: async_sessionmaker[AsyncSession]) -> None:
+    # разные наборы колонок уходят разными пачками, id всё равно в порядке входа
+    records = [_car(f"VIN{i}", **({"description": "x"} if i % 2 else {})) for i in range(7)]
+
+    ids, rows = asyncio.run(_insert(session_maker, CarsDAO, "insert_many", records, "SELECT id, vin FROM cars"))
+
+    vin_by_id = dict(rows)
+    assert [vin_by_id[car_id] for car_id in ids] == [f"VIN{i}" for i in range(7)]
+
+
+@pytest.mark.parametrize("method", ["insert_many", "copy_many"])
+def test_python_defaults_are_applied(session_maker: async_sessionmaker[AsyncSession], method: str) -> None:
+    _, rows = asyncio.run(
+        _insert(session_maker, CarsDAO, method, [_car("A"), _car("B")], "SELECT status FROM cars"),
+    )
+
+    assert [status for (status,) in rows] == ["available", "available"]
+
+
+@pytest.mark.parametrize("method", ["add_many", "insert_many", "copy_many"])
+@pytest.mark.parametrize(
+    ("dao", "record", "query", "expected"),
+    [
+        (
+            CarPhotosDAO,
+            PhotoIn(car_id=1, url="https://example.com/a.jpg"),
+            "SELECT url FROM car_photos",
+            "https://example.com/a.jpg",
+        ),
+        (OrdersDAO, _order("ivan@example.com"), "SELECT customer_email FROM orders", "ivan@example.com"),
+    ],
+    ids=["HttpUrl", "EmailStr"],
+)
+def test_pydantic_types_are_converted(
+    session_maker: async_sessionmaker[AsyncSession],
+    method: str,
+    dao: type[BaseDAO],
+    record: BaseModel,
+    query: str,
+    expected: str,
+) -> None:
+    _, rows = asyncio.run(_insert(session_maker, dao, method, [record], query, with_car=True))
+
+    assert rows == [(expected,)]
+
+
+def test_import_batch_skips_existing_vins(session_maker: async_sessionmaker[AsyncSession]) -> None:
+    async def run() -> tuple[dict[str, int], list[Any]]:
+        async with session_maker() as session:
+            await CarsDAO.insert_many(session, [_car("A")])
+            inserted = await CarsDAO.insert_skip_existing_vin(
+                session,
+                [_car(vin).model_dump() for vin in ("A", "B", "C")],
+            )
+            await session.commit()
+            return inserted, list((await session.execute(text("SELECT id, vin, status FROM cars ORDER BY id"))).all())
+
+    inserted, rows = asyncio.run(run())
+
+    assert inserted == {vin: car_id for car_id, vin, _ in rows if vin != "A"}
+    assert [(vin, status) for _, vin, status in rows] == [("A", "available"), ("B", "available"), ("C", "available")]
@@ -0,0 +1,147 @@
+"""BaseDAO.bulk_update: UPDATE ... FROM unnest(...) по группам колонок (нужна TEST_DATABASE_URL)."""
+
+import asyncio
+from decimal import Decimal
+from typing import Any
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.api.cars.schemas import CarUpdate
+from app.api.orders.schemas import OrderUpdate
+from app.dao.cars import CarsDAO
+from app.dao.orders import OrdersDAO
+from app.models.cars import CarStatus
+
+ROWS = 5
+
+CARS_SQL = """
+    INSERT INTO cars (vin, make, model, year, mileage, price, condition, color,
+                      engine_type, transmission, status, description)
+    SELECT 'VIN' || i, 'Toyota', 'Camry', 2020, 1000 * i, 10000 + i, 'used', 'white',
+           'gasoline', 'automatic', 'available', 'car ' || i
+    FROM generate_series(1, :rows) AS i
+"""
+
+
+class CarPatch(CarUpdate):
+    id: int
+
+
+class OrderPatch(OrderUpdate):
+    id: int
+
+
+async def _bulk_update(
+    session_maker: async_sessionmaker[AsyncSession],
+    records: list[CarPatch],
+    **kwargs: Any,
+) -> tuple[int, list[str], list[dict[str, Any]]]:
+    """Засеять авто, выполнить bulk_update и вернуть (rowcount, UPDATE-запросы, строки cars по id)."""
+    statements: list[str] = []
+
+    def capture(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        if statement.startswith("UPDATE"):
+            statements.append(statement)
+
+    async with session_maker() as session:
+        await session.execute(text(CARS_SQL), {"rows": ROWS})
+        await session.commit()
+
+        sync_engine = session_maker.kw["bind"].sync_engine
+        event.listen(sync_engine, "before_cursor_execute", capture)
+        try:
+            updated = await CarsDAO.bulk_update(session, records, **kwargs)
+            await session.commit()
+        finally:
+            event.remove(sync_engine, "before_cursor_execute", capture)
+
+        rows = await session.execute(text("SELECT id, price, status, description, mileage FROM cars ORDER BY id"))
+        return updated, statements, [dict(row) for row in rows.mappings()]
+
+
+def test_returns_rows_actually_updated(session_maker: async_sessionmaker[AsyncSession]) -> None:
+    records = [CarPatch(id=1, mileage=1), CarPatch(id=2, mileage=2), CarPatch(id=404, mileage=3)]
+
+    updated, _, rows = asyncio.run(_bulk_update(session_maker, records))
+
+    assert updated == 2
+    assert [row["mileage"] for row in rows] == [1, 2, 3000, 4000, 5000]
+
+
+def test_groups_records_by_column_set(session_maker: async_sessionmaker[AsyncSession]) -> None:
+    records = [
+        CarPatch(id=1, price=1.5),
+        CarPatch(id=2, status=CarStatus.sold, description="продано"),
+        CarPatch(id=3, price=3.5),
+        # повторный id: побеждает последняя запись
+        CarPatch(id=1, price=7.25),
+    ]
+
+    updated, statements, rows = asyncio.run(_bulk_update(session_maker, records))
+
+    assert updated == 3
+    assert len(statements) == 2
+    assert [(row["price"], row["status"], row["description"]) for row in rows[:3]] == [
+        (Decimal("7.25"), "available", "car 1"),
+        (Decimal("10002.00"), "sold", "продано"),
+        (Decimal("3.50"), "available", "car 3"),
+    ]
+
+
+def test_sends_chunks(session_maker: async_sessionmaker[AsyncSession]) -> None:
+    records = [CarPatch(id=i, mileage=i) for i in range(1, ROWS + 1)]
+
+    updated, statements, rows = asyncio.run(_bulk_update(session_maker, records, chunk_size=2))
+
+    assert updated == ROWS
+    assert len(statements) == 3
+    assert [row["mileage"] for row in rows] == list(range(1, ROWS + 1))
+
+
+@pytest.mark.parametrize(
+    ("patch", "column", "expected"),
+    [
+        ({"status": CarStatus.reserved}, "status", "reserved"),
+        ({"status": "sold"}, "status", "sold"),
+        ({"price": 12345.67}, "price", Decimal("12345.67")),
+        ({"description": None}, "description", None),
+    ],
+    ids=["enum", "enum-str", "numeric", "null"],
+)
+def test_casts_values(
+    session_maker: async_sessionmaker[AsyncSession],
+    patch: dict[str, Any],
+    column: str,
+    expected: Any,
+) -> None:
+    # одна запись в пачке: тип значения задаёт только приведение массива к типу колонки
+    updated, _, rows = asyncio.run(_bulk_update(session_maker, [CarPatch(id=1, **patch)]))
+
+    assert updated == 1
+    assert rows[0][column] == expected
+
+
+def test_null_into_non_text_column(session_maker: async_sessionmaker[AsyncSession]) -> None:
+    async def run() -> tuple[int, Any]:
+        async with session_maker() as session:
+            await session.execute(text(CARS_SQL), {"rows": 1})
+            await session.execute(
+                text(
+                    "INSERT INTO users (email, hashed_password, is_active, role) VALUES ('a@example.com', 'x', true, 'customer')"
+                )
+            )
+            await session.execute(
+                text(
+                    "INSERT INTO orders (customer_name, customer_phone, car_id, user_id, status, payment_method, "
+                    "total_amount) VALUES ('Ivan', '+79000000000', 1, 1, 'pending', 'card', 100)"
+                )
+            )
+            await session.commit()
+            updated = await OrdersDAO.bulk_update(session, [OrderPatch(id=1, user_id=None)])
+            await session.commit()
+            return updated, (await session.execute(text("SELECT user_id FROM orders"))).scalar_one()
+
+    # вся колонка пачки — NULL: в VALUES такая колонка выводилась бы как text
+    assert asyncio.run(run()) == (1, None)
@@ -0,0 +1,80 @@
+"""Keyset-пагинация списка и карточек авто по каждому допустимому полю сортировки (нужна TEST_DATABASE_URL)."""
+
+import asyncio
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.api.pagination import NEXT_CURSOR_HEADER
+from app.dao.cars import CarSortField
+
+ROWS = 25
+PAGE = 10
+
+# повторяющиеся значения ключей: порядок внутри равных держит id
+SEED_SQL = (
+    """
+    INSERT INTO cars (vin, make, model, year, mileage, price, condition, color,
+                      engine_type, transmission, status, created_at, updated_at)
+    SELECT 'VIN' || i, 'Toyota', 'Camry', 2000 + i % 5, 1000 * i, 1000 + i % 7 * 500,
+           'used', 'white', 'gasoline', 'automatic', 'available',
+           timestamp '2025-01-01' + i % 6 * interval '1 minute',
+           timestamp '2025-01-01' + i % 4 * interval '1 hour'
+    FROM generate_series(1, :rows) AS i
+    """,
+    """
+    INSERT INTO car_listing (id, vin, make, model, year, mileage, price, condition, color,
+                             engine_type, transmission, status, description, created_at,
+                             updated_at, reviews_count)
+    SELECT id, vin, make, model, year, mileage, price, condition, color,
+           engine_type, transmission, status, description, created_at, updated_at, 0
+    FROM cars
+    """,
+)
+
+
+async def _seed(session_maker: async_sessionmaker[AsyncSession]) -> None:
+    async with session_maker() as session:
+        for sql in SEED_SQL:
+            await session.execute(text(sql), {"rows": ROWS})
+        await session.commit()
+
+
+@pytest.fixture
+def seeded_client(client: TestClient, session_maker: async_sessionmaker[AsyncSession]) -> TestClient:
+    asyncio.run(_seed(session_maker))
+    return client
+
+
+def _expected(items: list[dict[str, Any]], sort_by: str, sort_dir: str) -> list[int]:
+    ordered = sorted(items, key=lambda item: (item[sort_by], item["id"]), reverse=sort_dir == "desc")
+    return [item["id"] for item in ordered]
+
+
+@pytest.mark.parametrize("path", ["/v1/cars/", "/v1/cars/cards"])
+@pytest.mark.parametrize("sort_dir", ["asc", "desc"])
+@pytest.mark.parametrize("sort_by", [field.value for field in CarSortField])
+def test_cursor_walks_two_pages(seeded_client: TestClient, path: str, sort_by: str, sort_dir: str) -> None:
+    params = {"sort_by": sort_by, "sort_dir": sort_dir}
+    everything = seeded_client.get(path, params={**params, "limit": 100}).json()
+
+    first = seeded_client.get(path, params={**params, "limit": PAGE})
+    assert first.status_code == 200
+    second = seeded_client.get(path, params={**params, "limit": PAGE, "cursor": first.headers[NEXT_CURSOR_HEADER]})
+    assert second.status_code == 200, second.text
+
+    walked = [item["id"] for item in first.json() + second.json()]
+    assert walked == _expected(everything, sort_by, sort_dir)[: 2 * PAGE]
+    assert NEXT_CURSOR_HEADER in second.headers
+
+
+@pytest.mark.parametrize("path", ["/v1/cars/", "/v1/cars/cards"])
+@pytest.mark.parametrize("sort_by", ["make", "vin", "id"])
+def test_unknown_sort_key_is_rejected(seeded_client: TestClient, path: str, sort_by: str) -> None:
+    response = seeded_client.get(path, params={"sort_by": sort_by})
+
+    assert response.status_code == 422
+    assert NEXT_CURSOR_HEADER not in response.headers
@@ -0,0 +1,100 @@
+"""Поиск по каталогу: ранжирование, опечатки и фильтры (нужна TEST_DATABASE_URL)."""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+# vin -> (марка, модель, год, цена, статус, описание)
+CARS = {
+    "CAMRY": ("Toyota", "Camry", 2020, 25000, "available", "один владелец"),
+    "COROLLA": ("Toyota", "Corolla", 2015, 12000, "available", "гаражное хранение"),
+    "COROLLA-SOLD": ("Toyota", "Corolla", 2019, 15000, "sold", "полный привод"),
+    "RIO": ("Kia", "Rio", 2021, 14000, "available", "обменяли на Toyota, один владелец"),
+    "X5": ("BMW", "X5", 2022, 60000, "reserved", "полный привод"),
+}
+
+INSERT_SQL = """
+    INSERT INTO cars (vin, make, model, year, mileage, price, condition, color,
+                      engine_type, transmission, status, description)
+    VALUES (:vin, :make, :model, :year, 0, :price, 'used', 'white',
+            'gasoline', 'automatic', :status, :description)
+"""
+
+
+async def _seed(session_maker: async_sessionmaker[AsyncSession]) -> None:
+    async with session_maker() as session:
+        await session.execute(
+            text(INSERT_SQL),
+            [
+                {
+                    "vin": vin,
+                    "make": make,
+                    "model": model,
+                    "year": year,
+                    "price": price,
+                    "status": status,
+                    "description": description,
+                }
+                for vin, (make, model, year, price, status, description) in CARS.items()
+            ],
+        )
+        await session.commit()
+
+
+@pytest.fixture
+def seeded_client(client: TestClient, session_maker: async_sessionmaker[AsyncSession]) -> TestClient:
+    asyncio.run(_seed(session_maker))
+    return client
+
+
+def _search(client: TestClient, **params: str | int) -> list[str]:
+    response = client.get("/v1/cars/search", params=params)
+    if response.status_code == 404:
+        return []
+    assert response.status_code == 200, response.text
+    return [car["vin"] for car in response.json()]
+
+
+def test_make_and_model_rank_above_description(seeded_client: TestClient) -> None:
+    found = _search(seeded_client, q="toyota")
+
+    # Rio упоминает Toyota только в описании (вес D) — он последний
+    assert set(found[:3]) == {"CAMRY", "COROLLA", "COROLLA-SOLD"}
+    assert found[3:] == ["RIO"]
+
+
+def test_model_match_ranks_first(seeded_client: TestClient) -> None:
+    found = _search(seeded_client, q="toyota camry")
+
+    assert found[0] == "CAMRY"
+
+
+@pytest.mark.parametrize(
+    ("q", "expected"),
+    [
+        ("Corola", {"COROLLA", "COROLLA-SOLD"}),
+        ("Toyta Camry", {"CAMRY"}),
+        ("Toyotta", {"CAMRY", "COROLLA", "COROLLA-SOLD"}),
+    ],
+)
+def test_typos_match_by_word_similarity(seeded_client: TestClient, q: str, expected: set[str]) -> None:
+    # ни один префикс из запроса не совпадает с лексемами — находит только %> по "марка модель"
+    assert set(_search(seeded_client, q=q)) == expected
+
+
+@pytest.mark.parametrize(
+    ("params", "expected"),
+    [
+        ({"status": "available"}, ["CAMRY", "COROLLA", "RIO"]),
+        ({"price_max": 14000}, ["COROLLA", "RIO"]),
+        ({"price_min": 13000, "year_min": 2019}, ["CAMRY", "COROLLA-SOLD", "RIO"]),
+        ({"status": "available", "year_max": 2016}, ["COROLLA"]),
+        ({"make": "Toyota", "status": "sold"}, ["COROLLA-SOLD"]),
+        ({"status": "reserved"}, []),
+    ],
+)
+def test_search_with_filters(seeded_client: TestClient, params: dict[str, str | int], expected: list[str]) -> None:
+    assert sorted(_search(seeded_client, q="toyota", **params)) == expected
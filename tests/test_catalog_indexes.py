@@ -0,0 +1,111 @@
+"""Планы запросов каталога и списка заказов на индексах миграции 5b8e2c9f1a47.
+
+Нужна отдельная БД с доступным расширением pg_trgm (TEST_DATABASE_URL, см. conftest).
+Схема создаётся из моделей (индексы в __table_args__ повторяют миграцию), таблицы
+заполняются один раз на модуль и очищаются после него.
+"""
+
+import asyncio
+import json
+from collections.abc import Callable, Iterator
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from sqlalchemy import Select
+from sqlalchemy.dialects.postgresql.asyncpg import dialect as asyncpg_dialect
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.future import select
+
+from app.dao.base import encode_cursor
+from app.dao.cars import CarsDAO
+from app.dao.orders import OrdersDAO
+
+ROWS = 100_000
+# EXPLAIN ANALYZE одной страницы на прогретом кэше; на PostgreSQL 18 худший случай
+# (make+model, поиск q по триграммам) ~2 мс, остальные меньше 0,3 мс
+LATENCY_BUDGET_MS = 10
+INDEX_NODES = {"Index Scan", "Index Only Scan", "Bitmap Index Scan"}
+
+
+def _cursor(row: int, sort_by: str | None = None, sort_dir: str = "desc") -> str:
+    """Курсор после строки `row` сида: значения ключей считаются так же, как в CATALOG_SQL (conftest)."""
+    values = {
+        "price": 1000 + (row * 37) % 150000,
+        "year": 1995 + row % 30,
+        "created_at": datetime.now() - timedelta(minutes=row),
+    }
+    item = SimpleNamespace(id=row, **({sort_by: values[sort_by]} if sort_by else {}))
+    return encode_cursor(item, sort_by, sort_dir)
+
+
+# (DAO, фильтры filtered_query, индекс, который должен быть в плане)
+CASES = (
+    (CarsDAO, {"status": "available", "sort_by": "price"}, "ix_cars_status_price_id"),
+    (CarsDAO, {"status": "available", "sort_by": "year"}, "ix_cars_status_year_id"),
+    (CarsDAO, {"status": "available", "sort_by": "created_at"}, "ix_cars_status_created_at_id"),
+    # engine_type без своего индекса: ~5% строк, индекс сортировки с фильтром
+    (CarsDAO, {"engine_type": "electric", "sort_by": "price"}, "ix_cars_price_id"),
+    (CarsDAO, {"make": "BMW", "model": "Model 11", "sort_by": "year"}, "ix_cars_make_model_year"),
+    (CarsDAO, {"sort_by": "price"}, "ix_cars_price_id"),
+    (CarsDAO, {"sort_by": "price", "sort_dir": "asc", "price_min": 5000}, "ix_cars_price_id"),
+    (CarsDAO, {"sort_by": "year"}, "ix_cars_year_id"),
+    (CarsDAO, {"sort_by": "created_at"}, "ix_cars_created_at_id"),
+    (OrdersDAO, {"status": "paid"}, "ix_orders_status_id"),
+    (OrdersDAO, {"payment_method": "lease"}, "ix_orders_payment_method_id"),
+    (OrdersDAO, {"q": "user4242@"}, "ix_orders_customer_email_trgm"),
+    # keyset: страница из середины стоит столько же, сколько первая
+    (CarsDAO, {"sort_by": "price", "cursor": _cursor(ROWS // 2, "price")}, "ix_cars_price_id"),
+    (
+        CarsDAO,
+        {"status": "available", "sort_by": "created_at", "cursor": _cursor(ROWS // 2, "created_at")},
+        "ix_cars_status_created_at_id",
+    ),
+    (
+        CarsDAO,
+        {"status": "available", "sort_by": "year", "sort_dir": "asc", "cursor": _cursor(ROWS // 2, "year", "asc")},
+        "ix_cars_status_year_id",
+    ),
+    # после курсора по id планировщик идёт по pkey с фильтром: 5% строк — ~400 строк на страницу
+    (OrdersDAO, {"status": "paid", "cursor": _cursor(ROWS // 2)}, "orders_pkey"),
+)
+
+
+async def _explain(engine: AsyncEngine, query: Select) -> dict[str, Any]:
+    sql = query.compile(dialect=asyncpg_dialect(), compile_kwargs={"literal_binds": True})
+    async with engine.connect() as conn:
+        # первый прогон прогревает shared buffers, время берётся со второго
+        for _ in range(2):
+            raw = (await conn.exec_driver_sql(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}")).scalar_one()
+    await engine.dispose()
+    return (json.loads(raw) if isinstance(raw, str) else raw)[0]
+
+
+def _scanned_indexes(node: dict[str, Any]) -> Iterator[str]:
+    if node["Node Type"] in INDEX_NODES:
+        yield node["Index Name"]
+    for child in node.get("Plans", ()):
+        yield from _scanned_indexes(child)
+
+
+@pytest.fixture(scope="module")
+def catalog_engine(
+    db_engine: AsyncEngine, truncate_tables: Callable[[], None], seed_catalog: Callable[[int], None]
+) -> Iterator[AsyncEngine]:
+    truncate_tables()
+    seed_catalog(ROWS)
+    yield db_engine
+    truncate_tables()
+
+
+@pytest.mark.parametrize(
+    ("dao", "filters", "index"),
+    CASES,
+    ids=[f"{index}{'-cursor' if 'cursor' in filters else ''}" for _, filters, index in CASES],
+)
+def test_filter_uses_index(catalog_engine: AsyncEngine, dao: Any, filters: dict[str, Any], index: str) -> None:
+    plan = asyncio.run(_explain(catalog_engine, dao.filtered_query(select(dao.model), **filters)))
+
+    assert index in set(_scanned_indexes(plan["Plan"])), json.dumps(plan["Plan"], indent=2)
+    assert plan["Execution Time"] < LATENCY_BUDGET_MS
@@ -0,0 +1,97 @@
+"""Кэш сущностей: поколения ключей не дают вернуть в кэш версию до коммита (нужна TEST_DATABASE_URL)."""
+
+import asyncio
+from collections.abc import Iterator
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from app.core.cache import EntityCache, InMemoryCache
+from app.models.cars import Car
+
+CAR_ID = 1
+
+
+@pytest.fixture
+def entity_cache(sample_data: None) -> Iterator[EntityCache]:
+    """Отдельный кэш в памяти; его слушатели Session снимаются после теста."""
+    cache = EntityCache(InMemoryCache(100), ttl=60)
+    yield cache
+    event.remove(Session, "after_flush", cache._after_flush)
+    event.remove(Session, "after_commit", cache._after_commit)
+    event.remove(Session, "after_rollback", cache._after_rollback)
+
+
+async def _load(session: AsyncSession) -> Car:
+    return (await session.execute(select(Car).where(Car.id == CAR_ID))).scalar_one()
+
+
+async def _read_through(cache: EntityCache, session_maker: async_sessionmaker[AsyncSession]) -> tuple[Car, bool]:
+    """Чтение как в BaseDAO.find_one_or_none_by_id: (сущность, попадание в кэш)."""
+    async with session_maker() as session:
+        record, generation = await cache.get(session, Car, CAR_ID)
+        if record is not None:
+            return record, True
+        record = await _load(session)
+        await cache.set(session, record, generation)
+        return record, False
+
+
+async def _update_price(cache: EntityCache, session_maker: async_sessionmaker[AsyncSession], price: int) -> None:
+    async with session_maker() as session:
+        car = await session.get(Car, CAR_ID)
+        car.price = price
+        await session.commit()
+    # инвалидация после коммита идёт фоновой задачей
+    await asyncio.gather(*cache._tasks)
+
+
+def test_read_through_hit_and_invalidation(
+    entity_cache: EntityCache, session_maker: async_sessionmaker[AsyncSession]
+) -> None:
+    async def run() -> None:
+        _, hit = await _read_through(entity_cache, session_maker)
+        assert not hit
+        car, hit = await _read_through(entity_cache, session_maker)
+        assert hit
+
+        await _update_price(entity_cache, session_maker, 12345)
+
+        car, hit = await _read_through(entity_cache, session_maker)
+        assert not hit
+        assert car.price == Decimal(12345)
+
+    asyncio.run(run())
+
+
+def test_stale_write_back_after_commit_is_ignored(
+    entity_cache: EntityCache, session_maker: async_sessionmaker[AsyncSession]
+) -> None:
+    async def run() -> None:
+        # читатель промахнулся и прочитал строку до коммита писателя
+        async with session_maker() as reader:
+            record, generation = await entity_cache.get(reader, Car, CAR_ID)
+            assert record is None
+            stale = await _load(reader)
+
+            await _update_price(entity_cache, session_maker, 54321)
+
+            # ...и пишет её уже после инвалидации по коммиту
+            await entity_cache.set(reader, stale, generation)
+
+        car, hit = await _read_through(entity_cache, session_maker)
+        assert not hit
+        assert car.price == Decimal(54321)
+
+        car, hit = await _read_through(entity_cache, session_maker)
+        assert hit
+        async with session_maker() as session:
+            fresh = await _load(session)
+        # updated_at из кэша совпадает с БД, а значит и ETag, посчитанный по нему
+        assert (car.price, car.updated_at) == (fresh.price, fresh.updated_at)
+        assert car.updated_at != stale.updated_at
+
+    asyncio.run(run())
@@ -0,0 +1,48 @@
+"""Проверки FK в update_order/create_review: ошибка без гонки с незавершёнными запросами (нужна TEST_DATABASE_URL)."""
+
+import asyncio
+import gc
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.api.orders.schemas import OrderUpdate
+from app.api.orders.services import update_order
+from app.api.reviews.schemas import ReviewCreate
+from app.api.reviews.services import create_review
+
+CASES = (
+    (lambda session: update_order(session, 1, OrderUpdate(user_id=1, car_id=1)), 404),
+    (lambda session: create_review(session, ReviewCreate(customer_name="Ivan", car_id=1, user_id=1, rating=5)), 404),
+)
+
+
+async def _fails_cleanly(
+    session_maker: async_sessionmaker[AsyncSession],
+    call: Callable[[AsyncSession], Awaitable[Any]],
+) -> tuple[HTTPException, list[dict[str, Any]]]:
+    errors: list[dict[str, Any]] = []
+    asyncio.get_running_loop().set_exception_handler(lambda loop, context: errors.append(context))
+    async with session_maker() as session:
+        with pytest.raises(HTTPException) as exc_info:
+            await call(session)
+        # откат, как в get_session_with_commit: на сессии не должно идти других запросов
+        await session.rollback()
+    gc.collect()
+    await asyncio.sleep(0)
+    return exc_info.value, errors
+
+
+@pytest.mark.parametrize(("call", "status_code"), CASES, ids=["update_order", "create_review"])
+def test_missing_reference_fails_cleanly(
+    session_maker: async_sessionmaker[AsyncSession],
+    call: Callable[[AsyncSession], Awaitable[Any]],
+    status_code: int,
+) -> None:
+    error, loop_errors = asyncio.run(_fails_cleanly(session_maker, call))
+
+    assert error.status_code == status_code
+    assert loop_errors == []
@@ -0,0 +1,96 @@
+import asyncio
+from typing import Any
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.settings import DbConfig
+
+# чтения с разными наборами запросов: одинаковый SQL в параллельных транзакциях
+# попадает на разные серверные соединения PgBouncer
+READ_PATHS = ("/v1/cars/1/details", "/v1/cars/?count=exact", "/v1/orders/1/details", "/v1/cars/search?q=toyota")
+CONCURRENCY = 20
+
+
+class _Connected(Exception):
+    """Прерывает подключение: параметры уже перехвачены, сеть не нужна."""
+
+
+def _connect_params(config: DbConfig) -> tuple[Any, dict[str, Any]]:
+    """Собрать engine как в lifespan и вернуть его пул и параметры вызова asyncpg.connect."""
+    engine = create_async_engine(str(config.sqlalchemy_db_uri), **config.engine_options())
+    captured: dict[str, Any] = {}
+
+    @event.listens_for(engine.sync_engine, "do_connect")
+    def capture(dialect: Any, conn_rec: Any, cargs: Any, cparams: dict[str, Any]) -> None:
+        captured.update(cparams)
+        raise _Connected
+
+    async def connect() -> None:
+        try:
+            async with engine.connect():
+                pass
+        finally:
+            await engine.dispose()
+
+    with pytest.raises(_Connected):
+        asyncio.run(connect())
+    return engine.sync_engine.pool, captured
+
+
+def test_pgbouncer_engine(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("DB__PGBOUNCER", "true")
+
+    pool, params = _connect_params(DbConfig())  # type: ignore[call-arg]
+
+    assert isinstance(pool, NullPool)
+    assert params["statement_cache_size"] == 0
+    assert params["prepared_statement_cache_size"] == 0
+    name_func = params["prepared_statement_name_func"]
+    assert name_func() != name_func()
+
+
+def test_direct_engine_keeps_statement_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("DB__PGBOUNCER", "false")
+    config = DbConfig()  # type: ignore[call-arg]
+
+    pool, params = _connect_params(config)
+
+    assert not isinstance(pool, NullPool)
+    assert params["statement_cache_size"] == config.statement_cache_size
+    assert "prepared_statement_name_func" not in params
+
+
+def test_app_through_pgbouncer(client: TestClient, sample_data: None, pgbouncer_url: str) -> None:
+    """Ручки на engine с настройками DB__PGBOUNCER через настоящий PgBouncer (нужны TEST_DATABASE_URL и PGBOUNCER_URL).
+
+    С кэшем prepared statements asyncpg параллельные транзакции падали бы на
+    `prepared statement "__asyncpg_stmt_1__" already exists` / `does not exist`.
+    """
+    config = DbConfig(pgbouncer=True)  # type: ignore[call-arg]
+
+    async def run() -> list[httpx.Response]:
+        engine = create_async_engine(pgbouncer_url, **config.engine_options())
+        client.app.state.session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        try:
+            transport = httpx.ASGITransport(app=client.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+                reads = await asyncio.gather(*(http.get(path) for path in READ_PATHS for _ in range(CONCURRENCY)))
+                writes = await asyncio.gather(
+                    *(
+                        http.put(f"/v1/cars/{car_id}", json={"mileage": i})
+                        for i in range(CONCURRENCY)
+                        for car_id in (1, 2)
+                    )
+                )
+                return [*reads, *writes]
+        finally:
+            await engine.dispose()
+
+    responses = asyncio.run(run())
+
+    assert [response.status_code for response in responses] == [200] * len(responses)
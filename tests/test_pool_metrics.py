@@ -0,0 +1,63 @@
+"""Метрики db_pool_* с меткой pool: primary и реплика пишутся раздельно."""
+
+import asyncio
+
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.application import _engine_options
+from app.core.settings import APP_CONFIG
+from app.metrics import PRIMARY_POOL, REPLICA_POOL, MeteredQueuePool, setup_db_pool_metrics
+
+
+def _sample(name: str, pool: str) -> float:
+    return REGISTRY.get_sample_value(name, {"pool": pool}) or 0.0
+
+
+@pytest.mark.parametrize("label", [PRIMARY_POOL, REPLICA_POOL])
+def test_engine_pool_is_labelled(label: str) -> None:
+    engine = create_async_engine(str(APP_CONFIG.db.sqlalchemy_db_uri), **_engine_options(label))
+    pool = engine.sync_engine.pool
+
+    assert isinstance(pool, MeteredQueuePool)
+    assert pool.metrics_label == label
+    # engine.dispose() пересоздаёт пул: метка должна сохраниться
+    assert pool.recreate().metrics_label == label
+
+    setup_db_pool_metrics(engine)
+    assert _sample("db_pool_size", label) == APP_CONFIG.db.pool_size
+
+
+def test_pgbouncer_engine_has_no_pool_metrics(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(APP_CONFIG.db, "pgbouncer", True)
+
+    options = _engine_options(REPLICA_POOL)
+
+    assert options["poolclass"] is NullPool
+    assert "metrics_label" not in options
+
+
+def test_replica_wait_and_timeout(db_engine: AsyncEngine) -> None:
+    """Ожидание и таймаут пула реплики попадают в ряды pool="replica" (нужна TEST_DATABASE_URL)."""
+    options = {**_engine_options(REPLICA_POOL), "pool_size": 1, "max_overflow": 0, "pool_timeout": 0.05}
+    timeouts = {label: _sample("db_pool_timeouts_total", label) for label in (PRIMARY_POOL, REPLICA_POOL)}
+    waits = _sample("db_pool_wait_seconds_count", REPLICA_POOL)
+
+    async def exhaust() -> None:
+        engine = create_async_engine(db_engine.url, **options)
+        try:
+            async with engine.connect():
+                with pytest.raises(PoolTimeoutError):
+                    async with engine.connect():
+                        pass
+        finally:
+            await engine.dispose()
+
+    asyncio.run(exhaust())
+
+    assert _sample("db_pool_timeouts_total", REPLICA_POOL) == timeouts[REPLICA_POOL] + 1
+    assert _sample("db_pool_timeouts_total", PRIMARY_POOL) == timeouts[PRIMARY_POOL]
+    assert _sample("db_pool_wait_seconds_count", REPLICA_POOL) == waits + 2
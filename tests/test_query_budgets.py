@@ -0,0 +1,62 @@
+"""Бюджеты SQL-запросов агрегирующих ручек: N+1 ловится в CI, а не на дашборде (нужна TEST_DATABASE_URL).
+
+Связи в sample_data содержат по несколько строк, поэтому ленивая загрузка на каждую
+связанную запись сразу выводит ручку за бюджет.
+"""
+
+import asyncio
+from collections.abc import Iterator
+
+import httpx
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.api.auth.services import get_current_user
+from app.api.conditional import ETAG_HEADER
+from app.metrics import QueryMetrics, assert_max_queries
+
+# ручка -> (запросов на полный ответ, запросов на 304 или None, если ручка без ETag)
+BUDGETS = {
+    "/v1/cars/1/details": (6, 1),
+    "/v1/orders/1/details": (6, 1),
+    "/v1/payments/1/details": (5, None),
+    "/v1/users/1/profile": (6, None),
+    "/v1/cars/1": (1, 1),
+    "/v1/orders/1": (1, 1),
+}
+
+
+@pytest.fixture(scope="module")
+def query_metrics(db_engine: AsyncEngine) -> Iterator[QueryMetrics]:
+    """Счётчик запросов на тестовом engine, как в lifespan; снимается после модуля."""
+    metrics = QueryMetrics(db_engine)
+    yield metrics
+    event.remove(db_engine.sync_engine, "before_cursor_execute", metrics._before_cursor_execute)
+    event.remove(db_engine.sync_engine, "after_cursor_execute", metrics._after_cursor_execute)
+
+
+async def _get_within_budget(
+    client: TestClient, path: str, limit: int, headers: dict[str, str] | None = None
+) -> httpx.Response:
+    # ASGI-приложение в том же event loop: запросы попадают в счётчик assert_max_queries
+    transport = httpx.ASGITransport(app=client.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+        with assert_max_queries(limit):
+            return await http.get(path, headers=headers)
+
+
+@pytest.mark.parametrize("path", list(BUDGETS))
+def test_query_budget(client: TestClient, sample_data: None, query_metrics: QueryMetrics, path: str) -> None:
+    full, not_modified = BUDGETS[path]
+    client.app.dependency_overrides[get_current_user] = lambda: None
+
+    response = asyncio.run(_get_within_budget(client, path, full))
+    assert response.status_code == status.HTTP_200_OK, response.text
+
+    if not_modified is not None:
+        etag = response.headers[ETAG_HEADER]
+        cached = asyncio.run(_get_within_budget(client, path, not_modified, {"If-None-Match": etag}))
+        assert cached.status_code == status.HTTP_304_NOT_MODIFIED
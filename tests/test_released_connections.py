@@ -0,0 +1,101 @@
+"""GET-ручки с release_connection: ответ собирается из отсоединённых объектов (нужна TEST_DATABASE_URL).
+
+После release_connection сессия закрыта, поэтому ленивая загрузка при сериализации
+упала бы DetachedInstanceError/MissingGreenlet. Тест проходит по каждой такой ручке
+на данных sample_data, включая ветку 304.
+"""
+
+import inspect
+
+import pytest
+from fastapi import APIRouter, status
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+
+from app.api.auth.services import get_current_user
+from app.api.car_photos.routers import router as car_photos_router
+from app.api.car_reports.routers import router as car_reports_router
+from app.api.cars.routers import router as cars_router
+from app.api.conditional import ETAG_HEADER
+from app.api.deliveries.routers import router as deliveries_router
+from app.api.orders.routers import router as orders_router
+from app.api.payments.routers import router as payments_router
+from app.api.reviews.routers import router as reviews_router
+from app.api.users.routers import router as users_router
+
+ROUTERS: list[APIRouter] = [
+    users_router,
+    cars_router,
+    orders_router,
+    payments_router,
+    deliveries_router,
+    reviews_router,
+    car_photos_router,
+    car_reports_router,
+]
+
+# шаблон пути -> запрос к засеянной записи
+PATHS = {
+    "/v1/users/{user_id}": "/v1/users/1",
+    "/v1/users/": "/v1/users/?count=exact",
+    "/v1/users/{user_id}/profile": "/v1/users/1/profile",
+    "/v1/cars/search": "/v1/cars/search?q=toyota",
+    "/v1/cars/cards": "/v1/cars/cards?count=exact",
+    "/v1/cars/facets": "/v1/cars/facets",
+    "/v1/cars/{car_id}": "/v1/cars/1",
+    "/v1/cars/": "/v1/cars/?count=exact",
+    "/v1/cars/{car_id}/details": "/v1/cars/1/details",
+    "/v1/orders/{order_id}": "/v1/orders/1",
+    "/v1/orders/": "/v1/orders/?count=exact",
+    "/v1/orders/{order_id}/details": "/v1/orders/1/details",
+    "/v1/payments/{payment_id}": "/v1/payments/1",
+    "/v1/payments/": "/v1/payments/",
+    "/v1/payments/{payment_id}/details": "/v1/payments/1/details",
+    "/v1/deliveries/{delivery_id}": "/v1/deliveries/1",
+    "/v1/deliveries/": "/v1/deliveries/",
+    "/v1/deliveries/{delivery_id}/details": "/v1/deliveries/1/details",
+    "/v1/reviews/{review_id}": "/v1/reviews/1",
+    "/v1/reviews/": "/v1/reviews/",
+    "/v1/reviews/{review_id}/details": "/v1/reviews/1/details",
+    "/v1/car-photos/{photo_id}": "/v1/car-photos/1",
+    "/v1/car-photos/": "/v1/car-photos/",
+    "/v1/car-photos/{photo_id}/details": "/v1/car-photos/1/details",
+    "/v1/car-reports/{report_id}": "/v1/car-reports/1",
+    "/v1/car-reports/": "/v1/car-reports/",
+    "/v1/car-reports/{report_id}/details": "/v1/car-reports/1/details",
+}
+
+def _releasing_routes() -> set[str]:
+    """GET-маршруты, обработчики которых отпускают соединение до сериализации."""
+    return {
+        route.path
+        for router in ROUTERS
+        for route in router.routes
+        if isinstance(route, APIRoute)
+        and "GET" in route.methods
+        and "release_connection" in inspect.getsource(inspect.unwrap(route.endpoint))
+    }
+
+
+@pytest.fixture
+def seeded_client(client: TestClient, sample_data: None) -> TestClient:
+    client.app.dependency_overrides[get_current_user] = lambda: None
+    return client
+
+
+def test_every_releasing_route_is_covered() -> None:
+    assert _releasing_routes() == set(PATHS)
+
+
+@pytest.mark.parametrize("path", list(PATHS.values()), ids=list(PATHS))
+def test_serializes_after_release(seeded_client: TestClient, path: str) -> None:
+    # TestClient пробрасывает исключения приложения: ленивая загрузка после close() уронила бы тест
+    response = seeded_client.get(path)
+
+    assert response.status_code == status.HTTP_200_OK, response.text
+    assert response.json()
+
+    if ETAG_HEADER in response.headers:
+        cached = seeded_client.get(path, headers={"If-None-Match": response.headers[ETAG_HEADER]})
+        assert cached.status_code == status.HTTP_304_NOT_MODIFIED
+        assert cached.content == b""
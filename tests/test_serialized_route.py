@@ -0,0 +1,165 @@
+"""SerializedRoute отдаёт те же байты, статусы и заголовки, что и стандартный путь FastAPI."""
+
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from fastapi import APIRouter, Depends, FastAPI, Request, Response, status
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.api.conditional import not_modified
+from app.api.responses import SerializedJSONResponse, SerializedRoute
+from app.dao.base import record_version
+
+UPDATED_AT = datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=UTC)
+
+
+class Item(BaseModel):
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
+
+    id: int
+    name: str
+    price: float
+    note: str | None = None
+    tags: list[str] = Field(default_factory=list)
+    display: str | None = Field(default=None, alias="displayName")
+    updated_at: datetime = UPDATED_AT
+
+
+ITEMS = [
+    Item(id=1, name="Лада", price=1.5, tags=["б/у"]),
+    Item(id=2, name="Camry", price=20000.0, note=None, display="Toyota Camry"),
+]
+
+
+def _set_tracking(response: Response) -> None:
+    response.headers["X-Dependency"] = "1"
+    response.set_cookie("dep", "value", httponly=True)
+
+
+def _router(route_class: type[APIRoute]) -> APIRouter:
+    router = APIRouter(route_class=route_class)
+
+    @router.get("/items", response_model=list[Item])
+    async def list_items() -> Any:
+        return ITEMS
+
+    @router.get("/orm", response_model=list[Item])
+    def list_orm() -> Any:
+        # синхронный эндпоинт с ORM-подобными объектами
+        return [SimpleNamespace(**item.model_dump()) for item in ITEMS]
+
+    @router.get("/headers", response_model=Item, dependencies=[Depends(_set_tracking)])
+    async def with_headers(response: Response) -> Any:
+        response.headers["Cache-Control"] = "no-cache"
+        response.set_cookie("session", "abc", max_age=60)
+        return ITEMS[0]
+
+    @router.post("/created", response_model=Item, status_code=status.HTTP_201_CREATED)
+    async def created() -> Any:
+        return ITEMS[1]
+
+    @router.get("/accepted", response_model=Item)
+    async def accepted(response: Response) -> Any:
+        response.status_code = status.HTTP_202_ACCEPTED
+        return ITEMS[1]
+
+    @router.get("/exclude-none", response_model=list[Item], response_model_exclude_none=True)
+    async def exclude_none() -> Any:
+        return ITEMS
+
+    @router.get("/exclude-unset", response_model=list[Item], response_model_exclude_unset=True)
+    async def exclude_unset() -> Any:
+        return ITEMS
+
+    @router.get("/exclude-defaults", response_model=list[Item], response_model_exclude_defaults=True)
+    async def exclude_defaults() -> Any:
+        return ITEMS
+
+    @router.get("/include", response_model=Item, response_model_include={"id", "name"})
+    async def include() -> Any:
+        return ITEMS[0]
+
+    @router.get("/exclude", response_model=Item, response_model_exclude={"tags", "updated_at"})
+    async def exclude() -> Any:
+        return ITEMS[0]
+
+    @router.get("/by-field-name", response_model=Item, response_model_by_alias=False)
+    async def by_field_name() -> Any:
+        return ITEMS[1]
+
+    @router.delete("/items/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
+    async def delete_item(item_id: int) -> None:
+        return None
+
+    @router.get("/no-content", response_model=Item)
+    async def no_content() -> Any:
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+    @router.get("/status-without-body", response_model=Item)
+    async def status_without_body(response: Response) -> Any:
+        # статус без тела, выставленный через Response: тело ответа отбрасывается
+        response.status_code = status.HTTP_304_NOT_MODIFIED
+        return ITEMS[0]
+
+    @router.get("/conditional", response_model=Item)
+    async def conditional(request: Request, response: Response) -> Any:
+        # как в get_car_details: при совпадении ETag эндпоинт возвращает готовый 304
+        if (cached := not_modified(request, response, record_version(1, UPDATED_AT))) is not None:
+            return cached
+        return ITEMS[0]
+
+    return router
+
+
+def _client(route_class: type[APIRoute], response_class: type[JSONResponse]) -> TestClient:
+    app = FastAPI(default_response_class=response_class)
+    app.include_router(_router(route_class))
+    return TestClient(app)
+
+
+DEFAULT = _client(APIRoute, JSONResponse)
+SERIALIZED = _client(SerializedRoute, SerializedJSONResponse)
+
+CASES = [
+    ("GET", "/items"),
+    ("GET", "/orm"),
+    ("GET", "/headers"),
+    ("POST", "/created"),
+    ("GET", "/accepted"),
+    ("GET", "/exclude-none"),
+    ("GET", "/exclude-unset"),
+    ("GET", "/exclude-defaults"),
+    ("GET", "/include"),
+    ("GET", "/exclude"),
+    ("GET", "/by-field-name"),
+    ("DELETE", "/items/1"),
+    ("GET", "/no-content"),
+    ("GET", "/status-without-body"),
+    ("GET", "/conditional"),
+]
+
+
+@pytest.mark.parametrize(("method", "path"), CASES, ids=[f"{method} {path}" for method, path in CASES])
+def test_matches_default_route(method: str, path: str) -> None:
+    expected = DEFAULT.request(method, path)
+    actual = SERIALIZED.request(method, path)
+
+    assert actual.status_code == expected.status_code
+    assert actual.content == expected.content
+    assert actual.headers.multi_items() == expected.headers.multi_items()
+
+
+def test_not_modified_passthrough() -> None:
+    etag = SERIALIZED.get("/conditional").headers["ETag"]
+
+    expected = DEFAULT.get("/conditional", headers={"If-None-Match": etag})
+    actual = SERIALIZED.get("/conditional", headers={"If-None-Match": etag})
+
+    assert actual.status_code == expected.status_code == status.HTTP_304_NOT_MODIFIED
+    assert actual.content == expected.content == b""
+    assert actual.headers.multi_items() == expected.headers.multi_items()